@@ -0,0 +1 @@
+# pytest 가 저장소 루트를 import 경로에 넣도록 두는 파일 (모듈이 루트에 평평하게 있음)
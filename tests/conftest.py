@@ -0,0 +1,53 @@
+import csv
+import os
+
+import numpy as np
+import pytest
+
+import 주차데이터
+from 주차데이터 import MORPH_CSVS, SENT_CSV, WEEKS, WORD_CSV
+
+BRANDS = ["KT", "KT Skylife", "LGU+", "SKB"]
+
+
+# 작은 합성 주차(원본 CSV 형식)를 만들어 WEEK_DATA_DIR 로 지정 (풀 자식 프로세스도 환경변수로 같은 폴더를 봄)
+def write_week(root, week, seed, sentences=60):
+    rng = np.random.default_rng(seed)
+    folder = os.path.join(root, week)
+    os.makedirs(folder, exist_ok=True)
+    words = [f"단어{i}" for i in range(12)]
+    sent_rows, morph_rows = [], []
+    for sid in range(1, sentences + 1):
+        brand = BRANDS[sid % len(BRANDS)]
+        day = f"2025-03-0{1 + sid % 7}"
+        picked = rng.choice(words, size=3, replace=False)
+        sent_rows.append([sid, brand, " ".join(picked) + " 고객 센터", f"https://blog.example/{week}/{sid}", day])
+        morph_rows += [[sid, word, rng.choice(["positive", "negative"]), brand, day] for word in picked]
+
+    def write(name, header, rows):
+        with open(os.path.join(folder, name), "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows([header, *rows])
+
+    write(SENT_CSV, ["문장ID", "그룹", "문장", "원본링크", "날짜"], sent_rows)
+    parts = np.array_split(np.arange(len(morph_rows)), len(MORPH_CSVS))
+    for name, part in zip(MORPH_CSVS, parts):
+        write(name, ["문장ID", "단어", "감정", "그룹", "날짜"], [morph_rows[i] for i in part])
+    counts = {}
+    for _, word, sentiment, brand, _ in morph_rows:
+        counts.setdefault((word, brand), {"positive": 0, "negative": 0})[sentiment] += 1
+    write(WORD_CSV, ["단어", "positive", "negative", "그룹"],
+          [[word, c["positive"], c["negative"], brand] for (word, brand), c in sorted(counts.items())])
+
+
+@pytest.fixture
+def week_dir(tmp_path, monkeypatch):
+    root = str(tmp_path / "weeks")
+    for seed, week in enumerate(WEEKS.values()):
+        write_week(root, week, seed)
+    monkeypatch.setenv("WEEK_DATA_DIR", root)
+    monkeypatch.setattr(주차데이터, "DATA_DIR", root)
+    with 주차데이터._lock:
+        주차데이터._weeks.clear()
+    yield root
+    with 주차데이터._lock:
+        주차데이터._weeks.clear()
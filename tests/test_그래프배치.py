@@ -0,0 +1,49 @@
+import numpy as np
+
+from 그래프배치 import BUBBLE_VIEW, NETWORK_VIEW, _bench_graph, bubble_layout, force_layout, network_layout
+
+
+def _inside(layout, view, radius):
+    pos = np.array(list(layout.values()))
+    r = np.asarray(radius)[:, None]
+    return bool(((pos - r >= -0.1) & (pos + r <= np.array(view) + 0.1)).all())
+
+
+# 같은 입력이면 같은 좌표, 노드는 반지름까지 viewBox 안
+def test_network_layout_is_deterministic_and_fits():
+    nodes, links = _bench_graph(120)
+    layout = network_layout(nodes, links)
+    assert layout == network_layout(nodes, links)
+    assert list(layout) == [node["id"] for node in nodes]
+    radius = [max(15, min(50, node["freq"] * 0.03)) if node.get("freq") else 30 for node in nodes]
+    assert _inside(layout, NETWORK_VIEW, radius)
+
+
+# 링크로 이어진 단어는 자기 브랜드 쪽에 모임
+def test_linked_words_sit_near_their_brand():
+    nodes, links = _bench_graph(80, brands=2, seed=1)
+    layout = network_layout(nodes, links)
+    pos = {key: np.array(value) for key, value in layout.items()}
+    for link in links:
+        other = "b1" if link["source"] == "b0" else "b0"
+        own = np.linalg.norm(pos[link["target"]] - pos[link["source"]])
+        assert own < np.linalg.norm(pos[link["target"]] - pos[other]) + 1e-6, link
+
+
+# 버블은 충돌 힘으로 거의 겹치지 않음 (화면 그리기와 같은 반지름)
+def test_bubbles_barely_overlap():
+    rng = np.random.default_rng(0)
+    nodes = [{"key": f"w{i}", "size": int(size)} for i, size in enumerate(rng.integers(1, 40, size=20))]
+    layout = bubble_layout(nodes)
+    radius = np.array([np.sqrt(node["size"]) * 4 for node in nodes])
+    assert _inside(layout, BUBBLE_VIEW, radius)
+    pos = np.array(list(layout.values()))
+    dist = np.linalg.norm(pos[:, None] - pos[None, :], axis=2)
+    gap = dist - (radius[:, None] + radius[None, :])
+    np.fill_diagonal(gap, np.inf)
+    assert gap.min() > -0.1 * radius.max()
+
+
+def test_empty_layout():
+    assert force_layout(0).shape == (0, 2)
+    assert network_layout([], []) == {}
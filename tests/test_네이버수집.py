@@ -0,0 +1,136 @@
+import threading
+from collections import Counter
+from datetime import date, timedelta
+
+import pytest
+
+import 네이버수집
+import 호출제한
+from 네이버수집 import (
+    DATALAB_MAX_GROUPS, PAGE_SIZE, SEARCH_ENDPOINTS, build_query, collect_mentions, fetch_datalab, fetch_datalab_chunk,
+    get_session, plan_queries, run_stub_server, search_page,
+)
+
+CREDENTIALS = ("stub", "stub")
+GROUPS = [
+    {"groupName": "A", "keywords": ["KT", "SKB"], "exclude": []},
+    {"groupName": "B", "keywords": ["SKB"], "exclude": []},
+]
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setattr(호출제한, "RATE_PER_SEC", 1e6)
+    monkeypatch.setattr(호출제한, "BURST", 10**6)
+    server, base_url = run_stub_server()
+    yield server, base_url
+    server.shutdown()
+
+
+# 페이징 한도 없이 최신순 스트림 전체를 훑어 날짜별 항목 수를 센 기준값
+def _full_scan(base_url, endpoint, keyword):
+    counts, start = Counter(), 1
+    while True:
+        page = search_page(get_session(), endpoint, build_query(keyword, []), CREDENTIALS, start=start, base_url=base_url)
+        counts.update(item["date"] for item in page["items"])
+        if len(page["items"]) < PAGE_SIZE or start + PAGE_SIZE > page["total"]:
+            return counts
+        start += PAGE_SIZE
+
+
+def test_plan_shares_overlapping_queries():
+    plans, group_plans = plan_queries(GROUPS)
+    assert len(plans) == 2 * len(SEARCH_ENDPOINTS)
+    assert [plans[i]["keyword"] for i in group_plans["B"]] == ["SKB"] * len(SEARCH_ENDPOINTS)
+    assert set(group_plans["B"]) <= set(group_plans["A"])
+
+
+# 페이징으로 센 날짜별 언급량 = 전체 스트림을 센 값 (페이징 한도 밖 날짜만 total 추정치, fallback 으로 표시)
+def test_paged_counts_match_full_scan(stub):
+    _, base_url = stub
+    today = date.today()
+    days = [(today - timedelta(days=n)).isoformat() for n in range(59, -1, -1)]
+    mention_data, group_mentions = collect_mentions(GROUPS, days, CREDENTIALS, max_workers=4, base_url=base_url)
+
+    scans = {
+        (endpoint, keyword): _full_scan(base_url, endpoint, keyword)
+        for keyword in ("KT", "SKB") for endpoint in SEARCH_ENDPOINTS
+    }
+    fallback = set(mention_data["fallback"])
+    assert mention_data["labels"] == days and not mention_data["failed"]
+    assert fallback != set(days)
+    for group, dataset in zip(GROUPS, mention_data["datasets"]):
+        assert dataset["label"] == group["groupName"]
+        for day, value in zip(days, dataset["data"]):
+            if day in fallback:
+                continue
+            assert value == sum(scans[(e, k)][day] for k in group["keywords"] for e in SEARCH_ENDPOINTS), (group, day)
+        assert all(item["date"] in days for item in group_mentions[group["groupName"]])
+
+
+# 병렬 수집 결과는 작업자 수와 무관 (그룹 → 날짜 → 키워드 → 엔드포인트 순서 고정), 진행 알림은 쿼리마다 한 번
+def test_result_does_not_depend_on_workers(stub):
+    _, base_url = stub
+    today = date.today()
+    days = [(today - timedelta(days=n)).isoformat() for n in range(20, -1, -1)]
+    results, progress = [], []
+    for workers in (1, 8):
+        results.append(collect_mentions(
+            GROUPS, days, CREDENTIALS, max_workers=workers, base_url=base_url,
+            on_progress=lambda done, total, partial: progress.append((workers, done, total)),
+        ))
+    assert results[0] == results[1]
+    plans, _ = plan_queries(GROUPS)
+    for workers in (1, 8):
+        assert [(done, total) for w, done, total in progress if w == workers] == [(i, len(plans)) for i in range(1, len(plans) + 1)]
+
+
+# 취소되면 다음 페이지부터 멈추고, 확정 못 한 날짜는 failed 로 남김 (다음 분석 때 다시 수집)
+def test_cancelled_collection_stops_paging(stub):
+    server, base_url = stub
+    cancel = threading.Event()
+    cancel.set()
+    days = [(date.today() - timedelta(days=n)).isoformat() for n in range(6, -1, -1)]
+    mention_data, _ = collect_mentions(GROUPS, days, CREDENTIALS, max_workers=4, base_url=base_url, cancel=cancel)
+    assert server.calls == 0
+    assert mention_data["failed"] == days
+
+
+# 호출 수는 날짜 수가 아니라 결과 페이지 수에 비례 (한도 밖 날짜의 보완 검색만 날짜별)
+def test_calls_scale_with_pages(stub):
+    server, base_url = stub
+    today = date.today()
+    days = [(today - timedelta(days=n)).isoformat() for n in range(6, -1, -1)]
+    mention_data, _ = collect_mentions(GROUPS, days, CREDENTIALS, max_workers=4, base_url=base_url)
+    plans, _ = plan_queries(GROUPS)
+    assert not mention_data["fallback"]
+    assert server.calls < len(plans) * len(days) / 2  # 날짜별 검색이면 plan × 날짜 수
+
+
+# 5그룹이 넘으면 기준 그룹을 넣은 묶음으로 나눠 요청 → 한 번에 요청해 최댓값=100 으로 맞춘 결과와 같음
+# - 실제 API 처럼 묶음마다 그 묶음 최댓값=100 으로 바꿔 돌려줌 (스텁은 묶음과 무관한 값)
+@pytest.mark.parametrize("n_groups", [DATALAB_MAX_GROUPS, DATALAB_MAX_GROUPS + 1, 13])
+def test_datalab_chunks_match_single_request(stub, monkeypatch, n_groups):
+    server, base_url = stub
+
+    def per_chunk_peak(*args, **kwargs):
+        status, payload = fetch_datalab_chunk(*args, **kwargs)
+        peak = max(d["ratio"] for g in payload["results"] for d in g["data"])
+        for group in payload["results"]:
+            group["data"] = [{**d, "ratio": d["ratio"] * 100 / peak} for d in group["data"]]
+        return status, payload
+
+    monkeypatch.setattr(네이버수집, "fetch_datalab_chunk", per_chunk_peak)
+    # 기준 그룹(G5)은 최댓값이 작음 → 묶음마다 최댓값을 가진 그룹·배율이 다름
+    groups = [{"groupName": f"G{(i + 5) % n_groups}", "keywords": [f"키워드{i}"]} for i in range(n_groups)]
+    start, end = date(2025, 3, 1), date(2025, 3, 14)
+    status, chunked = fetch_datalab(start, end, groups, CREDENTIALS, base_url=base_url)
+    calls = server.calls
+    _, single = per_chunk_peak(start, end, groups, CREDENTIALS, base_url=base_url)
+
+    assert status == 200
+    assert calls == max(1, -(-(n_groups - 1) // (DATALAB_MAX_GROUPS - 1)))
+    assert [g["title"] for g in chunked["results"]] == [g["groupName"] for g in groups]
+    for got, want in zip(chunked["results"], single["results"]):
+        assert [d["period"] for d in got["data"]] == [d["period"] for d in want["data"]]
+        assert [d["ratio"] for d in got["data"]] == pytest.approx([d["ratio"] for d in want["data"]], abs=1e-4)
@@ -0,0 +1,66 @@
+from collections import Counter
+
+from 단어순위 import network_tables, node_records, rank_morph_counts, rank_word_counts
+from 주차데이터 import WEEKS, load_week
+
+
+# 기존 iterrows + sorted() 루프 (브랜드 순서·같은 빈도 순서까지 기준)
+def _sorted_entries(word_df, k):
+    result = {}
+    for brand, df in word_df.groupby("그룹", observed=True):
+        entries = []
+        for word, positive, negative in zip(df["단어"].astype(str), df["positive"], df["negative"]):
+            if positive > 0:
+                entries.append((word, positive, "positive"))
+            if negative > 0:
+                entries.append((word, negative, "negative"))
+        result[str(brand)] = sorted(entries, key=lambda x: x[1], reverse=True)[:k]
+    return result
+
+
+def test_rank_word_counts_matches_sorted_loop(week_dir):
+    for week in WEEKS.values():
+        word_df = load_week(week)["word"]
+        for k in (1, 3, 10, 50):
+            top = rank_word_counts(word_df, k)
+            ranked = {
+                brand: list(zip(group["단어"], group["freq"], group["감정"]))
+                for brand, group in top.groupby("그룹", sort=True)
+            }
+            assert ranked == _sorted_entries(word_df, k)
+
+
+def test_network_tables_match_loop(week_dir):
+    word_df = load_week(list(WEEKS.values())[0])["word"]
+    top = rank_word_counts(word_df, 10)
+    nodes, links = network_tables(top)
+
+    expected_nodes, expected_links, added, link_counter = [], [], set(), Counter()
+    for brand, entries in _sorted_entries(word_df, 10).items():
+        expected_nodes.append({"id": brand, "group": "brand"})
+        for word, freq, sentiment in entries:
+            node_id = f"{word}_{sentiment}"
+            if node_id not in added:
+                expected_nodes.append({"id": node_id, "group": sentiment, "freq": int(freq)})
+                added.add(node_id)
+            expected_links.append((brand, node_id))
+            link_counter[node_id] += 1
+
+    assert node_records(nodes) == expected_nodes
+    assert list(zip(links["source"], links["target"])) == expected_links
+    assert links["link_count"].tolist() == [link_counter[target] for _, target in expected_links]
+
+
+# 같은 개수는 (그룹, 단어, 감정) 사전순
+def test_rank_morph_counts_matches_counter(week_dir):
+    morph = load_week(list(WEEKS.values())[0])["morph"]
+    counts = Counter(zip(morph["그룹"].astype(str), morph["단어"].astype(str), morph["감정"].astype(str)))
+    ordered = sorted(counts.items(), key=lambda item: (-item[1], *item[0]))
+    for k in (1, 3, 10):
+        expected, taken = [], Counter()
+        for (brand, word, sentiment), count in ordered:
+            if taken[(brand, sentiment)] < k:
+                taken[(brand, sentiment)] += 1
+                expected.append((brand, word, sentiment, count))
+        top = rank_morph_counts(morph, k)
+        assert sorted(zip(top["그룹"], top["단어"], top["감정"], top["count"]), key=lambda r: (-r[3], r[:3])) == expected
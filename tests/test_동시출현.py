@@ -0,0 +1,72 @@
+import math
+from collections import Counter
+from itertools import combinations
+
+from 단어순위 import rank_word_counts
+from 동시출현 import cooccurrence_links, cooccurrence_pairs
+from 주차데이터 import WEEKS, load_week
+
+
+# 브랜드별 문장마다 단어_감정 집합 → 모든 쌍을 직접 셈
+def _brute_force(morph):
+    sentences = {}
+    for brand, word, sentiment, sid in zip(
+        morph["그룹"].astype(str), morph["단어"].astype(str), morph["감정"].astype(str), morph["문장ID"]
+    ):
+        sentences.setdefault(brand, {}).setdefault(sid, set()).add(f"{word}_{sentiment}")
+    result = {}
+    for brand, by_id in sentences.items():
+        doc_freq = Counter(term for terms in by_id.values() for term in terms)
+        pairs = Counter(frozenset(pair) for terms in by_id.values() for pair in combinations(sorted(terms), 2))
+        result[brand] = (len(by_id), doc_freq, pairs)
+    return result
+
+
+def test_pairs_match_brute_force(week_dir):
+    for week in WEEKS.values():
+        morph = load_week(week)["morph"]
+        expected = _brute_force(morph)
+        for min_count in (1, 2, 3):
+            pairs = cooccurrence_pairs(morph, min_count=min_count)
+            got = {(brand, frozenset((s, t))): (c, p) for brand, s, t, c, p in pairs.itertuples(index=False)}
+            want = {
+                (brand, pair): count
+                for brand, (_, _, counts) in expected.items()
+                for pair, count in counts.items()
+                if count >= min_count
+            }
+            assert {key: count for key, (count, _) in got.items()} == want
+            for (brand, pair), (count, pmi) in got.items():
+                n, doc_freq, _ = expected[brand]
+                a, b = sorted(pair)
+                assert pmi == round(math.log(count * n / (doc_freq[a] * doc_freq[b])), 4)
+
+
+# 순위표로 자르면 두 단어의 낮은 순위가 높은 쌍부터 남음 → 상위 k 단어끼리의 쌍은 잘리지 않음
+def test_ranked_cut_keeps_top_word_pairs(week_dir):
+    entry = load_week(list(WEEKS.values())[0])
+    morph = entry["morph"]
+    ranked = rank_word_counts(entry["word"], 1000)
+    everything = cooccurrence_pairs(morph, min_count=1, ranked=ranked)
+    for keep in (1, 3, 5):
+        cut = cooccurrence_pairs(morph, min_count=1, keep=keep, ranked=ranked)
+        for brand, group in everything.groupby("그룹"):
+            rank = {node: i for i, node in enumerate(ranked.loc[ranked["그룹"] == brand, "node_id"])}
+
+            def keys(frame):
+                return sorted(
+                    (max(rank[s], rank[t]), -pmi) for s, t, pmi in zip(frame["source"], frame["target"], frame["pmi"])
+                )
+
+            assert keys(cut[cut["그룹"] == brand]) == keys(group)[:keep]
+
+
+def test_links_only_join_top_nodes(week_dir):
+    entry = load_week(list(WEEKS.values())[0])
+    top = rank_word_counts(entry["word"], 5)
+    pairs = cooccurrence_pairs(entry["morph"], min_count=1, ranked=rank_word_counts(entry["word"], 1000))
+    links = cooccurrence_links(pairs, top, n=3)
+    nodes = set(top["node_id"])
+    assert links
+    assert all(link["source"] in nodes and link["target"] in nodes for link in links)
+    assert len({(link["source"], link["target"]) for link in links}) == len(links)
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from 주차데이터 import WEEKS, load_week
+from 롤업저장소 import RollupStore
+
+WEEK_LIST = list(WEEKS.values())
+
+
+def exact_daily(week_list):
+    frames = [load_week(week)["sent"] for week in week_list]
+    sent = pd.concat([pd.DataFrame({"그룹": df["그룹"].astype(str), "날짜": df["날짜"].astype(str), "원본링크": df["원본링크"]}) for df in frames])
+    return sent.groupby(["날짜", "그룹"])["원본링크"].nunique().to_dict()
+
+
+# 한 번 반영한 주차는 입력 서명이 같으면 SQLite 를 다시 조회하지 않음
+def test_fold_weeks_is_memoized(week_dir, tmp_path, monkeypatch):
+    store = RollupStore(str(tmp_path / "rollups.sqlite"))
+    assert store.fold_weeks() == WEEK_LIST
+
+    def no_query(*args):
+        raise AssertionError("folded 표를 다시 조회함")
+
+    monkeypatch.setattr(store, "folded_signature", no_query)
+    assert store.fold_weeks() == []
+
+    reopened = RollupStore(str(tmp_path / "rollups.sqlite"))
+    assert reopened.fold_weeks() == []
+
+
+# hll 모드도 일 단위 언급량은 정확한 고유 링크 수, 주 단위는 추정치
+def test_day_grain_is_exact_with_hll(week_dir, tmp_path):
+    exact = RollupStore(str(tmp_path / "exact.sqlite"), distinct="exact")
+    hll = RollupStore(str(tmp_path / "hll.sqlite"), distinct="hll")
+    exact.fold_weeks()
+    hll.fold_weeks()
+
+    expected = exact_daily(WEEK_LIST)
+    for store in (exact, hll):
+        day = store.series("week", "day")
+        assert dict(zip(zip(day["기간"], day["그룹"]), day["언급량"])) == expected
+
+    exact_week = exact.series("week", "week").set_index(["기간", "그룹"])["언급량"]
+    hll_week = hll.series("week", "week").set_index(["기간", "그룹"])["언급량"]
+    assert ((hll_week - exact_week).abs() <= exact_week * 0.1 + 1).all()
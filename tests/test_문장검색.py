@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import 문장검색
+from 문장검색 import (
+    _lower_texts, build_search_index, query_terms, read_search_index, search_index_rows, search_sentences,
+    top_positions, write_search_index,
+)
+from 주차데이터 import WEEKS
+
+BRANDS = ["KT", "LGU+", "SKB"]
+
+
+# 작은 글자 집합으로 만든 문장 → 검색어가 여러 문장에 겹쳐 나옴 (대소문자·이모지·공백 종류 포함)
+def _entry(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    alphabet = list("가나다인터넷속도AaBb ") + ["😀", "\t", "　"]
+    texts = ["".join(rng.choice(alphabet, size=rng.integers(1, 40))) for _ in range(n)]
+    sent = pd.DataFrame({
+        "문장ID": np.arange(n),
+        "그룹": rng.choice(BRANDS, size=n),
+        "문장": texts,
+        "날짜": [f"2025-03-{1 + i % 7:02d}" for i in range(n)],
+    })
+    picked = rng.choice(n, size=n, replace=True)
+    morph = pd.DataFrame({
+        "문장ID": picked,
+        "그룹": sent["그룹"].to_numpy()[picked],
+        "단어": "w",
+        "감정": rng.choice(["positive", "negative"], size=n),
+    })
+    return {"sent": sent, "morph": morph}
+
+
+def _brute_force(entry, terms, brands=None, sentiments=None, dates=None):
+    sent, morph = entry["sent"], entry["morph"]
+    tagged = set(zip(morph["그룹"], morph["문장ID"], morph["감정"]))
+    rows = []
+    for pos, (sid, brand, text, day) in enumerate(zip(sent["문장ID"], sent["그룹"], sent["문장"], sent["날짜"])):
+        if not all(term in text.lower() for term in terms):
+            continue
+        if brands is not None and brand not in brands:
+            continue
+        if sentiments is not None and not any((brand, sid, s) in tagged for s in sentiments):
+            continue
+        if dates and not dates[0] <= day <= dates[-1]:
+            continue
+        rows.append(pos)
+    return rows
+
+
+QUERIES = ["가", "a", "😀", "인터", "ab", "인터넷", "넷속도", "a 가", "인터넷 속도 b", "없는말", "가나다인터넷속도"]
+
+
+# 색인 검색 결과 = 모든 문장을 부분 문자열로 직접 확인한 결과 (필터 조합 포함, 여러 묶음으로 나눠 만들어도 같음)
+@pytest.mark.parametrize("build_rows", [문장검색.BUILD_ROWS, 64])
+def test_search_matches_brute_force(monkeypatch, build_rows):
+    monkeypatch.setattr(문장검색, "BUILD_ROWS", build_rows)
+    entry = _entry()
+    index = build_search_index(entry)
+    texts = _lower_texts(entry["sent"])
+    filters = [
+        {},
+        {"brands": ["KT"]},
+        {"sentiments": ("positive",)},
+        {"sentiments": ("negative",), "brands": ["LGU+", "SKB"]},
+        {"dates": ("2025-03-02", "2025-03-04")},
+    ]
+    for query in QUERIES:
+        terms = query_terms(query)
+        for kwargs in filters:
+            rows, scores = search_index_rows(index, texts, terms, **kwargs)
+            assert sorted(rows.tolist()) == _brute_force(entry, terms, **kwargs), (query, kwargs)
+            assert len(scores) == len(rows) and (scores > 0).all()
+
+
+def test_top_positions_orders_by_score():
+    scores = np.random.default_rng(0).random(500).round(2)
+    expected = sorted(range(len(scores)), key=lambda i: (-scores[i], i))
+    assert top_positions(scores, 20).tolist() == expected[:20]
+    assert top_positions(scores[:10], 20).tolist() == sorted(range(10), key=lambda i: (-scores[i], i))
+
+
+def test_index_file_roundtrip(tmp_path):
+    index = build_search_index(_entry())
+    path = str(tmp_path / "artifacts" / "search_index.npz")
+    write_search_index(path, index, "sig-1")
+    assert read_search_index(path, "sig-2") is None
+    loaded = read_search_index(path, "sig-1")
+    assert loaded.keys() == index.keys()
+    for name, value in index.items():
+        if isinstance(value, np.ndarray):
+            assert np.array_equal(loaded[name], value), name
+        else:
+            assert loaded[name] == value, name
+
+
+# 주차 검색: 모든 주차에서 세고 점수 상위 limit 개만, 첫 검색어를 강조
+def test_search_sentences_over_weeks(week_dir):
+    weeks = list(WEEKS.values())
+    result, total = search_sentences(weeks, "고객 센터", limit=5)
+    assert total == 60 * len(weeks)
+    assert len(result) == 5
+    assert result["점수"].is_monotonic_decreasing
+    assert all("<b style='background:yellow'>고객</b>" in text for text in result["문장"])
+    assert search_sentences(weeks, "   ")[1] == 0
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from 문장스니펫 import highlight_snippets, truncate_snippets
+
+
+# 기존 문장별 함수 (열 단위 버전의 기준)
+def highlight_and_shorten(text, keyword, window=15, fallback=50):
+    if not keyword or keyword not in text:
+        return text[:fallback] + "..." if len(text) > fallback else text
+    idx = text.index(keyword)
+    start = max(0, idx - window)
+    end = min(len(text), idx + len(keyword) + window)
+    snippet = text[start:end]
+    if start > 0:
+        snippet = "..." + snippet
+    if end < len(text):
+        snippet += "..."
+    return snippet.replace(keyword, f"<b style='background:yellow'>{keyword}</b>")
+
+
+def _texts(n, seed):
+    rng = np.random.default_rng(seed)
+    alphabet = list("가나다라마 인터넷속도 abcXYZ ") + ["😀", "é", "𝄞"]
+    texts = ["".join(rng.choice(alphabet, size=rng.integers(0, 120))) for _ in range(n)]
+    return texts + ["", "인터넷", "인터넷" * 40, "속도 " + "가" * 80 + " 속도", float("nan")]
+
+
+@pytest.mark.parametrize("window,fallback", [(15, 50), (0, 10), (3, 0), (60, 200)])
+def test_highlight_matches_per_sentence(window, fallback):
+    texts = _texts(300, window)
+    for keyword in ("인터넷", "속도", "a", "😀", "없는말", ""):
+        expected = [highlight_and_shorten(str(text), keyword, window, fallback) for text in texts]
+        assert highlight_snippets(texts, keyword, window, fallback) == expected
+
+
+def test_per_row_keywords():
+    texts = _texts(200, 1)
+    keywords = [["인터넷", "속도", "", "𝄞", "ab"][i % 5] for i in range(len(texts))]
+    expected = [highlight_and_shorten(str(text), keyword) for text, keyword in zip(texts, keywords)]
+    assert highlight_snippets(texts, keywords) == expected
+
+
+def test_truncate_matches_slice():
+    texts = _texts(200, 2)
+    expected = [str(text)[:100] + "..." if len(str(text)) > 100 else str(text) for text in texts]
+    assert truncate_snippets(texts, 100) == expected
@@ -0,0 +1,30 @@
+import numpy as np
+
+from 문장인덱스 import build_sentence_index, sentence_positions, sentences_by_id
+from 주차데이터 import WEEKS, load_week
+
+
+# 역색인 조회 = 형태소 행을 직접 걸러 sent_df 순서대로 찾은 위치
+def test_sentence_positions_match_brute_force(week_dir):
+    for week in WEEKS.values():
+        entry = load_week(week)
+        morph, sent = entry["morph"], entry["sent"]
+        index = build_sentence_index(morph, sent)
+
+        morph_rows = list(zip(morph["그룹"].astype(str), morph["단어"].astype(str), morph["감정"].astype(str), morph["문장ID"]))
+        sent_rows = list(zip(sent["그룹"].astype(str), sent["문장ID"]))
+        for brand, word, sentiment in {row[:3] for row in morph_rows}:
+            ids = {sid for b, w, s, sid in morph_rows if (b, w, s) == (brand, word, sentiment)}
+            expected = [pos for pos, (b, sid) in enumerate(sent_rows) if b == brand and sid in ids]
+            assert sentence_positions(index, brand, word, sentiment).tolist() == expected
+        assert len(sentence_positions(index, "KT", "없는단어", "positive")) == 0
+
+
+def test_sentences_by_id_keeps_requested_order(week_dir):
+    entry = load_week(list(WEEKS.values())[0])
+    sent = entry["sent"]
+    index = build_sentence_index(entry["morph"], sent)
+    brand = str(sent["그룹"].iloc[0])
+    ids = sent.loc[sent["그룹"].astype(str) == brand, "문장ID"].to_numpy()[::-1][:5]
+    rows = sentences_by_id(index, sent, brand, list(ids) + [10**9])
+    assert np.array_equal(rows["문장ID"].to_numpy(), ids)
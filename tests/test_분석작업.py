@@ -0,0 +1,59 @@
+import threading
+import time
+
+from 분석작업 import cancel_job, get_job, start_job, update_job
+
+
+def _wait(job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = get_job(job_id)
+        if job["finished_at"]:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"작업 {job_id} 가 끝나지 않음")
+
+
+def test_job_reports_progress_and_result():
+    step = threading.Event()
+
+    def target(job, n):
+        update_job(job, progress=0.5, partial={"done": 1})
+        step.wait(5)
+        return n * 2
+
+    job_id = start_job(target, 21)
+    while get_job(job_id)["progress"] < 0.5:
+        time.sleep(0.01)
+    running = get_job(job_id)
+    assert running["status"] == "running" and running["partial"] == {"done": 1}
+    step.set()
+    job = _wait(job_id)
+    assert (job["status"], job["result"], job["progress"]) == ("done", 42, 1.0)
+
+
+# 취소하면 작업이 cancel 을 보고 멈추고, 그때까지의 결과를 남김
+def test_cancel_keeps_partial_result():
+    def target(job):
+        done = 0
+        while not job["cancel"].is_set():
+            done += 1
+            time.sleep(0.01)
+        return done
+
+    job_id = start_job(target)
+    time.sleep(0.05)
+    cancel_job(job_id)
+    job = _wait(job_id)
+    assert job["status"] == "cancelled" and job["result"] > 0
+
+
+def test_errors_are_recorded():
+    def target(job):
+        raise ValueError("응답 형식 오류")
+
+    job = _wait(start_job(target))
+    assert job["status"] == "error"
+    assert job["errors"] == ["ValueError: 응답 형식 오류"]
+    assert get_job("없는작업") is None
+    cancel_job("없는작업")
@@ -0,0 +1,46 @@
+import os
+
+import pandas as pd
+
+import 엑셀보고서
+from 엑셀보고서 import build_report, report_key
+
+TREND = {"results": [
+    {"title": "KT", "data": [{"period": "2025-03-01", "ratio": 100.0}, {"period": "2025-03-02", "ratio": 50.5}]},
+    {"title": "SKB", "data": [{"period": "2025-03-01", "ratio": 10.0}, {"period": "2025-03-02", "ratio": 20.0}]},
+]}
+MENTIONS = {"labels": ["2025-03-01", "2025-03-02"], "datasets": [{"label": "KT", "data": [3, 4]}, {"label": "SKB", "data": [0, 1]}]}
+ARTICLES = {"KT": [{"title": "KT 기사", "link": "https://a.example/1", "copies": 2}], "SKB": [{"title": "SKB 글", "link": "https://b.example/2"}]}
+
+
+def test_report_sheets_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.setattr(엑셀보고서, "REPORT_DIR", str(tmp_path))
+    sheets = pd.read_excel(build_report(report_key(TREND, MENTIONS, ARTICLES), TREND, MENTIONS, ARTICLES), sheet_name=None)
+    assert list(sheets) == ["검색량 데이터", "언급량 데이터", "뉴스_블로그_문장"]
+    assert sheets["검색량 데이터"].values.tolist() == [
+        [d["period"], d["ratio"], g["title"]] for g in TREND["results"] for d in g["data"]
+    ]
+    assert sheets["언급량 데이터"].values.tolist() == [["2025-03-01", 3, 0], ["2025-03-02", 4, 1]]
+    assert sheets["뉴스_블로그_문장"].values.tolist() == [
+        ["KT", "KT 기사", "https://a.example/1", 2], ["SKB", "SKB 글", "https://b.example/2", 1],
+    ]
+
+
+# 같은 결과(키 순서만 다른 dict 포함)는 같은 키 → 파일을 다시 만들지 않음, 오래된 보고서는 REPORT_KEEP 개만 남김
+def test_reports_are_cached_by_result_hash(tmp_path, monkeypatch):
+    monkeypatch.setattr(엑셀보고서, "REPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(엑셀보고서, "REPORT_KEEP", 2)
+    writes = []
+    write = 엑셀보고서.write_report
+    monkeypatch.setattr(엑셀보고서, "write_report", lambda path, *args: writes.append(path) or write(path, *args))
+
+    key = report_key(TREND, MENTIONS, ARTICLES)
+    assert report_key(TREND, dict(reversed(list(MENTIONS.items()))), ARTICLES) == key
+    assert build_report(key, TREND, MENTIONS, ARTICLES) == build_report(key, TREND, MENTIONS, ARTICLES)
+    assert len(writes) == 1
+
+    for i in range(3):
+        changed = {**MENTIONS, "datasets": [{"label": "KT", "data": [i, i]}]}
+        build_report(report_key(TREND, changed, ARTICLES), TREND, changed, ARTICLES)
+    assert len(writes) == 4
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".xlsx")]) == 2
@@ -0,0 +1,81 @@
+import threading
+import time
+from datetime import date, timedelta
+
+import 응답캐시
+import 호출제한
+from 네이버수집 import collect_mentions, run_stub_server
+from 응답캐시 import CacheCounter, ResponseCache, make_key
+
+
+def test_counters_are_per_job(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    cache.set("news.json:day", "KT", [], "2025-03-01", {"total": 1, "items": []})
+    job_a, job_b = CacheCounter(cache), CacheCounter(cache)
+
+    assert job_a.get("news.json:day", "KT", [], "2025-03-01") == {"total": 1, "items": []}
+    assert job_b.get("news.json:day", "KT", [], "2025-03-02") is None
+    assert job_b.get("news.json:day", "kt ", [], "2025-03-01") is not None
+
+    assert job_a.stats() == {"hits": 1, "misses": 0}
+    assert job_b.stats() == {"hits": 1, "misses": 1}
+    assert cache.stats() == {"hits": 2, "misses": 1}
+
+
+def test_concurrent_jobs_count_exactly(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    cache.set("blog.json:day", "KT", [], "2025-03-01", {"total": 0, "items": []})
+    jobs = [CacheCounter(cache) for _ in range(4)]
+
+    def run(job):
+        for i in range(200):
+            job.get("blog.json:day", "KT", [], "2025-03-01" if i % 2 else "2025-03-02")
+
+    threads = [threading.Thread(target=run, args=(job,)) for job in jobs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(job.stats() == {"hits": 100, "misses": 100} for job in jobs)
+    assert cache.stats() == {"hits": 400, "misses": 400}
+
+
+# 검색어 공백·대소문자, 제외어 순서·중복과 무관한 키 / 파일에 남아 다시 열어도 그대로
+def test_keys_are_normalized_and_persist(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    ResponseCache(path).set("news.json:day", " KT  인터넷 ", ["SKB", "lgu+"], "2025-03-01", {"total": 3})
+    cache = ResponseCache(path)
+    assert cache.get("news.json:day", "kt 인터넷", ["LGU+", "skb", "SKB"], "2025-03-01") == {"total": 3}
+    assert cache.get("blog.json:day", "kt 인터넷", ["LGU+", "skb"], "2025-03-01") is None
+    assert make_key("news.json", "A", ["b", ""], "d") == make_key("news.json", "a", ["B"], "d")
+
+
+# 지난 날짜는 만료 없음, 오늘·어제(또는 그 날짜로 끝나는 기간)는 recent_ttl 이 지나면 다시 조회
+def test_only_recent_days_expire(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), recent_ttl=60)
+    today, old = date.today().isoformat(), "2025-03-01"
+    for day in (today, old, f"{old}~{today}"):
+        cache.set("datalab/search", "q", [], day, {"day": day})
+    now = time.time()
+    monkeypatch.setattr(응답캐시.time, "time", lambda: now + 61)
+    assert cache.get("datalab/search", "q", [], today) is None
+    assert cache.get("datalab/search", "q", [], f"{old}~{today}") is None
+    assert cache.get("datalab/search", "q", [], old) == {"day": old}
+
+
+# 같은 분석을 다시 하면 API 를 부르지 않고 캐시만으로 같은 결과
+def test_repeat_collection_is_served_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(호출제한, "RATE_PER_SEC", 1e6)
+    monkeypatch.setattr(호출제한, "BURST", 10**6)
+    server, base_url = run_stub_server()
+    try:
+        cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+        groups = [{"groupName": "KT", "keywords": ["KT"], "exclude": []}]
+        days = [(date.today() - timedelta(days=n)).isoformat() for n in range(13, -1, -1)]
+        first = collect_mentions(groups, days, ("stub", "stub"), max_workers=2, base_url=base_url, cache=cache)
+        calls = server.calls
+        second = collect_mentions(groups, days, ("stub", "stub"), max_workers=2, base_url=base_url, cache=cache)
+        assert server.calls == calls
+        assert second == first
+    finally:
+        server.shutdown()
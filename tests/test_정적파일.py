@@ -0,0 +1,38 @@
+import os
+import threading
+
+import 정적파일
+
+
+# 화면 그리기 경로는 내려받기를 기다리지 않음: 번들이 없으면 바로 CDN, 내려받기는 백그라운드에서 한 번만
+def test_d3_src_does_not_block_on_download(tmp_path, monkeypatch):
+    release, calls = threading.Event(), []
+
+    def slow_fetch():
+        calls.append(threading.current_thread().name)
+        release.wait(5)
+        raise OSError("offline")
+
+    monkeypatch.setattr(정적파일, "STATIC_DIR", str(tmp_path))
+    monkeypatch.setattr(정적파일, "_d3_state", {"fetched": False, "warned": False})
+    monkeypatch.setattr(정적파일, "fetch_d3", slow_fetch)
+    monkeypatch.setattr(정적파일, "static_enabled", lambda: True)
+
+    assert 정적파일.d3_src() == 정적파일.D3_CDN
+    assert 정적파일.d3_src() == 정적파일.D3_CDN
+    release.set()
+    for thread in threading.enumerate():
+        if thread.name == "fetch-d3":
+            thread.join(5)
+    assert calls == ["fetch-d3"]
+
+
+def test_d3_src_serves_local_bundle(tmp_path, monkeypatch):
+    monkeypatch.setattr(정적파일, "STATIC_DIR", str(tmp_path))
+    monkeypatch.setattr(정적파일, "static_enabled", lambda: True)
+    monkeypatch.setattr(정적파일, "static_url", lambda relpath: f"/app/static/{relpath}")
+    path = os.path.join(tmp_path, 정적파일.D3_FILE)
+    os.makedirs(os.path.dirname(path))
+    with open(path, "wb") as f:
+        f.write(정적파일.D3_HEADER + b"0.0\n")
+    assert 정적파일.d3_src() == f"/app/static/{정적파일.D3_FILE}"
@@ -0,0 +1,104 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import 주차데이터
+from 주차데이터 import TABLES, WEEKS, compact_frames, convert_week, load_week, memory_report, read_table
+
+WEEK = list(WEEKS.values())[0]
+
+
+def _reload_week():
+    with 주차데이터._lock:
+        주차데이터._weeks.clear()
+
+
+def _as_text(df):
+    return df.reset_index(drop=True).astype(str)
+
+
+# Parquet 로 변환한 주차 = CSV 주차 (같은 행·같은 값, 형태소는 쓰는 컬럼만)
+def test_parquet_week_matches_csv(week_dir):
+    csv_entry = load_week(WEEK)
+    written, warnings = convert_week(WEEK)
+    assert not warnings and set(written) == set(TABLES)
+    _reload_week()
+    parquet_entry = load_week(WEEK)
+    for name in TABLES:
+        pd.testing.assert_frame_equal(_as_text(parquet_entry[name]), _as_text(csv_entry[name][parquet_entry[name].columns]))
+    assert list(parquet_entry["morph"].columns) == 주차데이터.MORPH_COLUMNS
+
+
+def test_read_table_projects_columns(week_dir):
+    assert read_table(WEEK, "sent") is None
+    convert_week(WEEK)
+    sent = read_table(WEEK, "sent", ["문장ID", "없는컬럼", "날짜"])
+    assert list(sent.columns) == ["문장ID", "날짜"]
+    assert sent["문장ID"].dtype == "int64"
+    assert isinstance(read_table(WEEK, "morph")["단어"].dtype, pd.CategoricalDtype)
+
+
+# 여러 세션이 같은 주차를 동시에 요청해도 한 번만 읽고 같은 항목을 공유
+def test_concurrent_loads_build_once(week_dir, monkeypatch):
+    builds = []
+    build = 주차데이터._build_week
+
+    def slow_build(week):
+        builds.append(week)
+        time.sleep(0.2)
+        return build(week)
+
+    monkeypatch.setattr(주차데이터, "_build_week", slow_build)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        entries = list(pool.map(lambda _: load_week(WEEK), range(8)))
+    assert builds == [WEEK]
+    assert all(entry is entries[0] for entry in entries)
+
+
+# 최근 사용 순 LRU: WEEK_CACHE_SIZE 를 넘으면 가장 오래 안 쓴 주차(와 그 파생 데이터)가 빠짐
+def test_week_cache_is_bounded(week_dir, monkeypatch):
+    monkeypatch.setattr(주차데이터, "WEEK_CACHE_SIZE", 2)
+    first, second, third = WEEKS.values()
+    built = []
+    주차데이터.week_artifact(first, "index", lambda entry: built.append(entry["week"]) or len(built))
+    load_week(second)
+    load_week(first)
+    load_week(third)
+    assert list(주차데이터._weeks) == [first, third]
+    assert 주차데이터.week_artifact(first, "index", lambda entry: built.append(entry["week"])) == 1
+    assert built == [first]
+    load_week(second)
+    load_week(third)
+    assert first not in 주차데이터._weeks
+    주차데이터.week_artifact(first, "index", lambda entry: built.append(entry["week"]))
+    assert built == [first, first]
+
+
+# 압축 표현은 값을 바꾸지 않음: 범주형·단어 사전 코드를 풀면 원래 문자열, 문장ID 는 정수(int32)
+def test_compact_frames_keep_values(week_dir):
+    word_df, morph_df, sent_df, _ = 주차데이터._read_frames(WEEK)
+    frames = compact_frames(word_df, morph_df, sent_df)
+    for name, original in {"word": word_df, "morph": morph_df, "sent": sent_df}.items():
+        pd.testing.assert_frame_equal(_as_text(frames[name]), _as_text(original))
+    assert frames["morph"]["문장ID"].dtype == frames["sent"]["문장ID"].dtype == "int32"
+    assert isinstance(frames["morph"]["감정"].dtype, pd.CategoricalDtype)
+    for row in memory_report(WEEK):
+        assert row["이후 바이트/행"] < row["이전 바이트/행"], row
+
+
+# 단어 코드는 전역 사전 기준 → 주차가 달라도 같은 단어는 같은 코드
+def test_word_codes_are_shared_across_weeks(week_dir):
+    first, second = (load_week(week)["morph"]["단어"] for week in list(WEEKS.values())[:2])
+    codes = dict(zip(first.astype(str), first.cat.codes))
+    assert all(codes.get(word, code) == code for word, code in zip(second.astype(str), second.cat.codes))
+    assert set(codes) & set(second.astype(str))
+
+
+# 문장ID 가 정수가 아닌 표가 하나라도 있으면 두 표 모두 문자열 (형태소·문장 조인 키 타입 일치)
+def test_non_numeric_sentence_ids_stay_strings(week_dir):
+    word_df, morph_df, sent_df, _ = 주차데이터._read_frames(WEEK)
+    sent_df = sent_df.assign(문장ID="s" + sent_df["문장ID"].astype(str))
+    frames = compact_frames(word_df, morph_df, sent_df)
+    assert all(pd.api.types.is_string_dtype(frames[name]["문장ID"]) for name in ("morph", "sent"))
+    assert frames["morph"]["문장ID"].tolist() == morph_df["문장ID"].astype(str).tolist()
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+import types
+
+import 주차비교
+from 주차데이터 import WEEKS
+
+
+# 풀 자식(spawn)은 주차비교만 새로 불러옴 → Streamlit 이 따라 올라오면 안 됨
+def test_summary_worker_imports_without_streamlit():
+    code = "import sys, 주차비교; assert 'streamlit' not in sys.modules, sorted(m for m in sys.modules if 'stream' in m)"
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(주차비교.__file__))
+
+
+def test_load_summaries_in_spawned_pool(week_dir, tmp_path, monkeypatch):
+    summary_dir = str(tmp_path / "summaries")
+    monkeypatch.setenv("WEEK_SUMMARY_DIR", summary_dir)
+    monkeypatch.setattr(주차비교, "SUMMARY_DIR", summary_dir)
+    monkeypatch.setattr(주차비교, "_summaries", {})
+    weeks = list(WEEKS.values())
+
+    summaries, computed = 주차비교.load_summaries(weeks, max_workers=2)
+    assert computed == weeks
+    assert set(summaries[weeks[0]]["brands"]["그룹"]) == {"KT", "KT Skylife", "LGU+", "SKB"}
+
+    monkeypatch.setattr(주차비교, "_summaries", {})
+    again, computed = 주차비교.load_summaries(weeks, max_workers=2)
+    assert computed == []
+    assert again[weeks[1]]["words"].equals(summaries[weeks[1]]["words"])
+
+
+# Streamlit 은 페이지 스크립트를 __main__ 으로 둠 → spawn 자식이 그 스크립트를 다시 실행하면 안 됨
+def test_pool_does_not_rerun_page_script(week_dir, tmp_path, monkeypatch):
+    marker = tmp_path / "page_ran"
+    page = tmp_path / "page.py"
+    page.write_text(f"open({str(marker)!r}, 'w').close()\n", encoding="utf-8")
+    fake_main = types.ModuleType("__main__")
+    fake_main.__file__ = str(page)
+    monkeypatch.setitem(sys.modules, "__main__", fake_main)
+    summary_dir = str(tmp_path / "summaries")
+    monkeypatch.setenv("WEEK_SUMMARY_DIR", summary_dir)
+    monkeypatch.setattr(주차비교, "SUMMARY_DIR", summary_dir)
+    monkeypatch.setattr(주차비교, "_summaries", {})
+
+    _, computed = 주차비교.load_summaries(list(WEEKS.values())[:2], max_workers=2)
+    assert len(computed) == 2
+    assert not marker.exists()
+    assert sys.modules["__main__"] is fake_main
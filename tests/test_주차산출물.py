@@ -0,0 +1,157 @@
+import os
+
+import pytest
+
+import 주차데이터
+import 주차산출물
+from 단어순위 import SENTIMENTS, rank_morph_counts, rank_word_counts
+from 주차데이터 import SENT_CSV, WEEKS, convert_week, week_path
+from 주차산출물 import RANK_LIMIT, SENTIMENT_FILTERS, _file_info, input_files, input_signature, inputs_unchanged, is_fresh, precompute_week
+
+WEEK = list(WEEKS.values())[0]
+
+
+def _reload_week():
+    with 주차데이터._lock:
+        주차데이터._weeks.clear()
+
+
+# 사전 계산 직후에는 CSV 주차·Parquet 주차 모두 최신이어야 하고, 다시 실행하면 건너뜀
+@pytest.mark.parametrize("columnar", [False, True])
+def test_precompute_then_fresh(week_dir, columnar):
+    if columnar:
+        convert_week(WEEK)
+        _reload_week()
+    manifest = precompute_week(WEEK)
+    assert sorted(manifest["inputs"]) == input_files(WEEK)
+    assert is_fresh(WEEK)
+    assert precompute_week(WEEK) is None
+
+
+def test_local_input_change_invalidates(week_dir):
+    precompute_week(WEEK)
+    with open(week_path(WEEK, SENT_CSV), "a", encoding="utf-8") as f:
+        f.write("999,KT,추가 문장,https://blog.example/extra,2025-03-01\n")
+    assert not is_fresh(WEEK)
+
+
+# GitHub raw 에서 읽는 입력도 ETag 로 서명·무효화
+def test_remote_inputs_are_signed(week_dir, monkeypatch):
+    etag = {"value": '"a"'}
+    monkeypatch.setattr(주차산출물, "remote_validator", lambda url: etag["value"])
+    os.remove(week_path(WEEK, SENT_CSV))
+
+    inputs = {name: _file_info(WEEK, name) for name in input_files(WEEK)}
+    assert SENT_CSV in inputs and inputs[SENT_CSV]["etag"] == '"a"'
+    manifest = {"inputs": inputs}
+    signature = input_signature(WEEK)
+    assert inputs_unchanged(WEEK, manifest)
+
+    etag["value"] = '"b"'
+    assert not inputs_unchanged(WEEK, manifest)
+    assert input_signature(WEEK) != signature
+
+    etag["value"] = None  # 확인할 수 없으면 기록을 그대로 쓰되, 새로 사전 계산하지는 않음
+    manifest["inputs"][SENT_CSV]["etag"] = '"b"'
+    assert inputs_unchanged(WEEK, manifest)
+    with pytest.raises(ValueError):
+        _file_info(WEEK, SENT_CSV)
+
+
+def test_remote_validator_is_memoized(monkeypatch):
+    calls = []
+
+    class Response:
+        headers = {"ETag": '"x"'}
+
+        def raise_for_status(self):
+            pass
+
+    def head(url, **kwargs):
+        calls.append(url)
+        return Response()
+
+    monkeypatch.setattr(주차산출물.requests, "head", head)
+    monkeypatch.setattr(주차산출물, "_remote", {})
+    url = "https://example.invalid/week.csv"
+    assert 주차산출물.remote_validator(url) == '"x"'
+    assert 주차산출물.remote_validator(url) == '"x"'
+    assert calls == [url]
+
+
+# 내보내기는 주차 문장 색인을 그대로 씀 (같은 캐시 항목, 다시 만들지 않음)
+def test_relation_export_reuses_sentence_index(week_dir, tmp_path):
+    entry = 주차데이터.load_week(WEEK)
+    index = 주차산출물.week_sentence_index(entry)
+    path = str(tmp_path / "relation.csv")
+    rows = 주차산출물.write_relation_export(entry, path)
+    assert entry["artifacts"]["sentence_index"] is index
+    with open(path, encoding="cp949") as f:
+        assert sum(1 for _ in f) == rows + 1
+
+
+# 순위표에서 잘라 만든 보기 = 그 k·감정 필터로 처음부터 다시 순위를 매긴 결과 (사전 계산분·실시간 계산분 모두)
+@pytest.mark.parametrize("precomputed", [False, True])
+def test_views_match_fresh_rankings(week_dir, monkeypatch, precomputed):
+    monkeypatch.setattr(주차산출물, "_loaded", {})  # 같은 초에 만든 다른 테스트의 산출물을 읽지 않도록
+    if precomputed:
+        precompute_week(WEEK)
+    artifacts = 주차산출물.week_artifacts(WEEK)
+    assert artifacts["source"] == ("precomputed" if precomputed else "live")
+    entry = 주차데이터.load_week(WEEK)
+    morph_counts = rank_morph_counts(entry["morph"], RANK_LIMIT)
+    for label, sentiments in SENTIMENT_FILTERS.items():
+        for k in (1, 2, 5, 10, 40):
+            expected = rank_word_counts(entry["word"][["그룹", "단어", *sentiments]], k)
+            top = 주차산출물.relation_top(artifacts, k, sentiments)
+            assert list(top.itertuples(index=False)) == list(expected[top.columns].itertuples(index=False))
+
+            bubbles = 주차산출물.sentiment_view(artifacts, k, sentiments)
+            for brand in 주차산출물.BRANDS:
+                rows = morph_counts[(morph_counts["그룹"] == brand) & morph_counts["감정"].isin(sentiments)]
+                rows = rows.groupby("감정", sort=False).head(k)
+                rows = sorted(zip(rows["단어"], rows["감정"], rows["count"]), key=lambda r: (-r[2], r[0], r[1]))
+                assert [(b["id"], b["group"], b["size"]) for b in bubbles[brand]] == rows
+
+
+def test_view_memo_is_bounded(week_dir, monkeypatch):
+    monkeypatch.setattr(주차산출물, "VIEW_CACHE_SIZE", 3)
+    artifacts = 주차산출물.week_artifacts(WEEK)
+    for k in range(1, 8):
+        주차산출물.relation_view(artifacts, k)
+    assert list(artifacts["views"]) == [주차산출물._view_key("relation_view", k, SENTIMENTS) for k in (5, 6, 7)]
+
+
+# 화면용 파생 데이터는 주차 산출물 dict 에 메모 → 재실행해도 같은 dict·같은 값, 입력이 바뀌면 새로 계산
+def test_derived_values_survive_reruns(week_dir, monkeypatch):
+    monkeypatch.setattr(주차산출물, "_loaded", {})
+    precompute_week(WEEK)
+    builds = []
+    artifacts = 주차산출물.week_artifacts(WEEK)
+    payload = 주차산출물.derived(artifacts, "network_json", lambda a: builds.append(1) or object())
+    rerun = 주차산출물.week_artifacts(WEEK)
+    assert rerun is artifacts
+    assert 주차산출물.derived(rerun, "network_json", lambda a: builds.append(1) or object()) is payload
+    assert builds == [1]
+
+    with open(week_path(WEEK, SENT_CSV), "a", encoding="utf-8") as f:
+        f.write("999,KT,새 문장,https://blog.example/new,2025-03-01\n")
+    changed = 주차산출물.week_artifacts(WEEK)
+    assert changed is not artifacts and "network_json" not in changed
+
+
+# 날짜별 언급량 = 브랜드·날짜별 고유 링크 수, 긍정 비율 = 긍정 / (긍정 + 부정)
+def test_daily_aggregates_match_brute_force(week_dir):
+    entry = 주차데이터.load_week(WEEK)
+    daily = 주차산출물.build_daily(entry)
+    sent, morph = entry["sent"].astype(str), entry["morph"].astype(str)
+    links = {}
+    for day, brand, link in zip(sent["날짜"], sent["그룹"], sent["원본링크"]):
+        links.setdefault((day, brand), set()).add(link)
+    assert {(r["날짜"], r["그룹"]): r["언급량"] for r in daily["mentions"]} == {key: len(v) for key, v in links.items()}
+    counts = morph.groupby(["날짜", "그룹", "감정"]).size()
+    for row in daily["positive_ratio"]:
+        positive = counts.get((row["날짜"], row["그룹"], "positive"), 0)
+        negative = counts.get((row["날짜"], row["그룹"], "negative"), 0)
+        assert (row["positive"], row["negative"]) == (positive, negative)
+        assert row["긍정비율"] == pytest.approx(positive / (positive + negative) * 100)
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from 중복제거 import _bench_items, _band_pairs, dedupe_items, minhash_signatures, normalize_link, normalize_title
+
+
+# 빈 제목·짧은 제목(3-gram 부족)만 있어도 링크 중복만으로 동작해야 함
+@pytest.mark.parametrize("items, expected", [
+    ([], 0),
+    ([{"title": "", "link": "a"}], 1),
+    ([{"title": "", "link": "a"}, {"title": "", "link": "a/"}], 1),
+    ([{"title": "k0 기사 0", "link": "https://stub.local/1/0"}, {"title": "k0 기사 1", "link": "https://stub.local/1/1"}], 2),
+    ([{"title": "짧음", "link": "x"}, {"title": "[속보] KT 요금제 가입자 증가", "link": "y"}], 2),
+])
+def test_edge_cases(items, expected):
+    kept = dedupe_items(items)
+    assert len(kept) == expected
+    assert sum(item["copies"] for item in kept) == len(items)
+
+
+def test_band_pairs_without_eligible_titles():
+    signatures, counts = minhash_signatures(["", "짧음"])
+    pairs = _band_pairs(signatures, counts >= 5)
+    assert pairs.shape == (0, 2) and pairs.dtype == np.int64
+
+
+def test_link_forms_of_the_same_post():
+    assert normalize_link("https://m.blog.naver.com/PostView.naver?blogId=kt&logNo=1") == normalize_link(
+        "http://blog.naver.com/kt/1/"
+    )
+    assert normalize_link("https://n.news.naver.com/mnews/article/001/123?sid=105") == normalize_link(
+        "https://news.naver.com/main/read.naver?oid=001&aid=123"
+    )
+    assert normalize_link("https://www.a.com/x/?utm_source=naver&id=3") == normalize_link("http://a.com/x?id=3")
+    assert normalize_link("https://a.com/x?id=3") != normalize_link("https://a.com/x?id=4")
+
+
+def test_near_duplicate_titles():
+    base = "KT 스카이라이프 새 요금제 출시 가입자 증가 기대"
+    items = [
+        {"title": base, "link": "https://a.com/1"},
+        {"title": f"[종합] {base} - 연합", "link": "https://b.com/2"},
+        {"title": base.replace("새", "신규"), "link": "https://c.com/3"},
+        {"title": "KT 1분기 가입자 증가 요금제 할인 이벤트", "link": "https://d.com/4"},
+        {"title": "KT 2분기 가입자 증가 요금제 할인 이벤트", "link": "https://e.com/5"},
+    ]
+    assert normalize_title(items[1]["title"]) == normalize_title(base)
+    kept = dedupe_items(items)
+    assert [item["link"] for item in kept] == ["https://a.com/1", "https://c.com/3", "https://d.com/4", "https://e.com/5"]
+    assert kept[0]["copies"] == 2
+
+
+# 이미 중복 제거된 목록을 다시 합쳐도 건수 합이 유지됨
+def test_copies_add_up_when_merged_again():
+    items = _bench_items(2_000)
+    once = dedupe_items(items)
+    twice = dedupe_items(once + once[:100])
+    assert len(twice) == len(once)
+    assert sum(item["copies"] for item in twice) == len(items) + sum(item["copies"] for item in once[:100])
+
+
+def test_synthetic_duplicates_are_found():
+    items = _bench_items(5_000, dup_rate=0.3)
+    kept = dedupe_items(items)
+    assert len(kept) == 3_500
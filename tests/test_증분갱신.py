@@ -0,0 +1,78 @@
+import threading
+from datetime import date, timedelta
+
+import pytest
+
+import 검색트렌드
+import 호출제한
+from 네이버수집 import run_stub_server
+from 응답캐시 import ResponseCache
+from 증분갱신 import held_mention_days, held_trend_periods
+
+GROUPS = [{"groupName": "KT", "keywords": ["KT"], "exclude": []}]
+
+
+def days_back(first, last):
+    today = date.today()
+    return [(today - timedelta(days=n)).isoformat() for n in range(first, last - 1, -1)]
+
+
+@pytest.fixture
+def stub(monkeypatch, tmp_path):
+    monkeypatch.setattr(호출제한, "RATE_PER_SEC", 1e6)
+    monkeypatch.setattr(호출제한, "BURST", 10**6)
+    monkeypatch.setattr(검색트렌드, "get_cache", lambda: ResponseCache(str(tmp_path / "cache.sqlite")))
+    server, base_url = run_stub_server()
+    yield base_url
+    server.shutdown()
+
+
+def run_job(base_url, date_range, held=None):
+    held = held or {}
+    params = {
+        "search_groups": GROUPS,
+        "date_range": date_range,
+        "periods": date_range + [(date.fromisoformat(date_range[-1]) + timedelta(days=1)).isoformat()],
+        "held_trend": held.get("trend_data", {}),
+        "held_periods": held.get("trend_periods", []),
+        "held_mention_data": held.get("mention_data", {}),
+        "held_group_mentions": held.get("group_mentions", {}),
+        "datalab_credentials": ("stub", "stub"),
+        "search_credentials": ("stub", "stub"),
+        "max_workers": 2,
+        "api_base": base_url,
+    }
+    job = {"cancel": threading.Event(), "errors": []}
+    return 검색트렌드.run_trend_job(job, params)
+
+
+def test_recent_days_are_not_held():
+    mention_data = {"labels": days_back(3, 0), "failed": [days_back(3, 3)[0]]}
+    assert held_mention_days(mention_data) == days_back(2, 2)
+    assert held_trend_periods(days_back(3, 0)) == days_back(3, 2)
+
+
+# 창이 하루 밀리면 어제(첫 실행 때는 부분 값)를 다시 수집하고, 데이터랩도 어제부터 다시 요청
+def test_sliding_window_refetches_yesterday(stub, monkeypatch):
+    fetched, spans = [], []
+    collect, datalab = 검색트렌드.collect_mentions, 검색트렌드.fetch_datalab
+
+    def spy_collect(groups, days, *args, **kwargs):
+        fetched.append(list(days))
+        return collect(groups, days, *args, **kwargs)
+
+    def spy_datalab(start, end, *args, **kwargs):
+        spans.append((str(start), str(end)))
+        return datalab(start, end, *args, **kwargs)
+
+    monkeypatch.setattr(검색트렌드, "collect_mentions", spy_collect)
+    monkeypatch.setattr(검색트렌드, "fetch_datalab", spy_datalab)
+
+    first = run_job(stub, days_back(7, 1))
+    second = run_job(stub, days_back(6, 0), held=first)
+
+    yesterday, today = days_back(1, 0)
+    assert fetched[1] == [yesterday, today]
+    assert spans[1][0] <= yesterday
+    assert second["mention_data"]["labels"] == days_back(6, 0)
+    assert [d["period"] for d in second["trend_data"]["results"][0]["data"]] == days_back(6, -1)
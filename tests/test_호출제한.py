@@ -0,0 +1,91 @@
+import time
+
+import pytest
+import requests
+
+import 호출제한
+from 호출제한 import QuotaExceeded, TokenBucket, metrics_snapshot, request_with_retry
+
+
+class Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+# 정해진 응답(또는 예외)을 차례로 돌려주는 세션
+class Session:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(호출제한, "RATE_PER_SEC", 1e6)
+    monkeypatch.setattr(호출제한, "BURST", 10**6)
+    monkeypatch.setattr(호출제한, "_buckets", {})
+    monkeypatch.setattr(호출제한, "_quota_used", {})
+    monkeypatch.setattr(호출제한, "_metrics", {})
+    monkeypatch.setattr(호출제한.random, "uniform", lambda low, high: high)
+    sleeps = []
+    monkeypatch.setattr(호출제한.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def test_bucket_allows_burst_then_rate():
+    bucket = TokenBucket(rate=200, capacity=5)
+    t0 = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - t0 < 0.05
+    for _ in range(20):
+        bucket.acquire()
+    assert time.monotonic() - t0 >= 20 / 200 * 0.9
+
+
+# 429/5xx 만 재시도, 지연은 지수 백오프 상한과 Retry-After 중 큰 값
+def test_retries_with_backoff_and_retry_after(limits):
+    session = Session(Response(503), Response(429, {"Retry-After": "2"}), Response(200))
+    response = request_with_retry(session, "GET", "https://stub.local", ("id", "secret"), "search")
+    assert response.status_code == 200 and session.calls == 3
+    assert limits == [호출제한.BACKOFF_BASE, 2.0]
+    row = {r["종류"]: r for r in metrics_snapshot()}["search"]
+    assert (row["호출"], row["재시도"], row["실패"], row["오늘 사용"]) == (3, 2, 0, 3)
+
+
+def test_client_errors_are_not_retried(limits):
+    session = Session(Response(404))
+    assert request_with_retry(session, "GET", "https://stub.local", ("id", "secret"), "search").status_code == 404
+    assert session.calls == 1 and limits == []
+
+
+def test_gives_up_after_max_retries(limits):
+    attempts = 호출제한.MAX_RETRIES + 1
+    session = Session(*[Response(500)] * attempts)
+    assert request_with_retry(session, "GET", "https://stub.local", ("id", "secret"), "datalab").status_code == 500
+    errors = Session(*[requests.ConnectionError("down")] * attempts)
+    with pytest.raises(requests.ConnectionError):
+        request_with_retry(errors, "GET", "https://stub.local", ("id", "secret"), "datalab")
+    assert session.calls == errors.calls == attempts
+    row = {r["종류"]: r for r in metrics_snapshot()}["datalab"]
+    assert row["실패"] == 2 and row["재시도"] == 2 * 호출제한.MAX_RETRIES
+
+
+# 일일 한도는 인증키별: 다 쓰면 요청하지 않고 QuotaExceeded
+def test_daily_quota_per_client(limits, monkeypatch):
+    monkeypatch.setitem(호출제한.DAILY_QUOTA, "search", 2)
+    session = Session(*[Response(200)] * 3)
+    for _ in range(2):
+        request_with_retry(session, "GET", "https://stub.local", ("a", "secret"), "search")
+    with pytest.raises(QuotaExceeded):
+        request_with_retry(session, "GET", "https://stub.local", ("a", "secret"), "search")
+    request_with_retry(session, "GET", "https://stub.local", ("b", "secret"), "search")
+    assert session.calls == 3
@@ -0,0 +1,50 @@
+import time
+
+import streamlit as st
+
+from 주차데이터 import WEEKS
+from 주차산출물 import BRANDS, SENTIMENT_FILTERS
+from 문장검색 import SEARCH_LIMIT, search_sentences
+
+
+# ✅ 문장 검색 상자 (연관어·긍부정 탭 공용, 부분 재실행 영역 → 검색해도 그래프는 다시 그리지 않음)
+# - 주차(여러 개)·브랜드·감정·기간으로 좁혀 문장 원문 전체에서 검색, 결과는 점수 상위 SEARCH_LIMIT 문장 스니펫
+@st.fragment
+def show_search_box(selected_week, key):
+    st.markdown("### 🔎 문장 검색")
+    labels = {week: label for label, week in WEEKS.items()}
+    query = st.text_input("검색어 (띄어 쓴 단어는 모두 포함)", key=f"{key}_search_query", placeholder="예: 고객 센터")
+
+    col1, col2, col3, col4 = st.columns([3, 3, 2, 2])
+    with col1:
+        weeks = st.multiselect("주차", list(labels), default=[selected_week], format_func=labels.get, key=f"{key}_search_weeks")
+    with col2:
+        brands = st.multiselect("브랜드", BRANDS, default=BRANDS, key=f"{key}_search_brands")
+    with col3:
+        sentiment = st.radio("감정", list(SENTIMENT_FILTERS), horizontal=True, key=f"{key}_search_sentiment")
+    with col4:
+        dates = st.date_input("기간", value=[], key=f"{key}_search_dates")
+
+    if not query.strip() or not weeks:
+        return
+    t0 = time.perf_counter()
+    try:
+        with st.spinner("검색 중... (주차 검색 색인이 없으면 처음 한 번 생성)"):
+            result, total = search_sentences(
+                weeks, query, brands=None if set(brands) == set(BRANDS) else brands, sentiment=sentiment,
+                dates=dates if len(dates) == 2 else None,
+            )
+    except Exception as e:
+        st.error(f"검색하지 못했습니다: {e}")
+        return
+    elapsed = (time.perf_counter() - t0) * 1000
+
+    if result.empty:
+        st.info(f"'{query}' 이(가) 들어간 문장이 없습니다.")
+        return
+    st.caption(f"{total:,}문장 일치 · 상위 {min(total, SEARCH_LIMIT)}개 · {elapsed:,.0f}ms")
+    lines = [
+        f"- **[{brand}]** {snippet} <span style='color:gray;font-size:12px'>{date} · {week}</span> [🔗]({link})"
+        for week, brand, date, snippet, link in zip(result["주차"], result["그룹"], result["날짜"], result["문장"], result["원본링크"])
+    ]
+    st.markdown("\n".join(lines), unsafe_allow_html=True)
@@ -1,8 +1,17 @@
 import streamlit as st
-import requests
+import pandas as pd
 from datetime import date, timedelta
 import plotly.graph_objects as go
 from streamlit_tags import st_tags
+from 분석작업 import add_job_error, cancel_job, get_job, start_job, update_job
+from 네이버수집 import MAX_WORKERS, NAVER_API_BASE, collect_mentions, fetch_datalab
+from 응답캐시 import CacheCounter, get_cache
+from 엑셀보고서 import report_bytes, report_key
+from 롤업저장소 import get_rollups
+from 증분갱신 import (
+    datalab_span, groups_key, held_mention_days, held_trend_periods, merge_mentions, merge_trend, missing_days, trim_trend
+)
+from 호출제한 import metrics_snapshot
 
 
 def show_trend_tab():
@@ -94,248 +103,259 @@ def show_trend_tab():
     with col2:
         end_date = st.date_input("종료일", value=default_end)
 
-    # ✅ 분석 시작 버튼 → rerun 없이 바로 실행
+    # ✅ 분석 시작 버튼 → 백그라운드 작업으로 실행
     with col3:
         st.markdown("<div style='padding-top: 28px;'>", unsafe_allow_html=True)
         run_analysis = st.button("🔍 분석 시작", key="run_button")
         st.markdown("</div>", unsafe_allow_html=True)
 
-    # ✅ Excel 저장 버튼 (스타일 유지 + 기능 연결)
-    import io
-    import pandas as pd
-    import base64
+    # ✅ run_analysis 클릭 시 백그라운드 분석 작업 시작 (재실행·페이지 이동과 무관하게 진행)
+    if run_analysis:
+        def get_date_range(start, end):
+            return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
 
+        # ✅ 그룹 설정이 그대로면 이미 가진 날짜는 재사용하고 빠진 날짜만 수집 (설정이 바뀌면 전체 재수집)
+        same_groups = st.session_state.get("trend_groups_key") == groups_key(search_groups)
+        has_trend = same_groups and "trend_data" in st.session_state
+        has_mentions = same_groups and "mention_data" in st.session_state
+        params = {
+            "search_groups": search_groups,
+            "date_range": get_date_range(start_date, end_date),
+            "periods": get_date_range(start_date, end_date + timedelta(days=1)),  # ✅ 하루 추가 (데이터랩 요청 구간)
+            "held_trend": st.session_state.trend_data if has_trend else {},
+            "held_periods": st.session_state.get("trend_periods", []) if has_trend else [],
+            "held_mention_data": st.session_state.mention_data if has_mentions else {},
+            "held_group_mentions": st.session_state.get("group_mentions", {}) if has_mentions else {},
+            "datalab_credentials": (st.secrets["NAVER_CLIENT_ID"], st.secrets["NAVER_CLIENT_SECRET"]),
+            "search_credentials": (st.secrets["NAVER_CLIENT_ID_2"], st.secrets["NAVER_CLIENT_SECRET_2"]),
+            "max_workers": int(st.secrets.get("NAVER_MAX_WORKERS", MAX_WORKERS)),
+            "api_base": st.secrets.get("NAVER_API_BASE", NAVER_API_BASE),  # 테스트 모드: 로컬 스텁 서버 주소
+        }
+        st.session_state.trend_job_id = start_job(run_trend_job, params)
+        st.query_params["job"] = st.session_state.trend_job_id
+
+    # ✅ 작업 ID는 주소(query)에도 남겨 두어 새로고침 후에도 다시 연결
+    job_id = st.session_state.get("trend_job_id") or st.query_params.get("job")
+    job = get_job(job_id) if job_id else None
+    if job is not None and job["status"] != "running" and st.session_state.get("applied_job_id") != job["id"]:
+        st.session_state.applied_job_id = job["id"]
+        if job["status"] == "done":
+            for key, value in job["result"].items():
+                st.session_state[key] = value
+            st.session_state.pop("report_key", None)  # 결과가 바뀌었으니 보고서 해시 다시 계산
+            if job["result"].get("mention_data"):
+                get_rollups().fold_live(job["result"]["mention_data"])  # 장기 추이(트렌드 변화 탭)에 일별 언급량 누적
+        elif job["status"] == "cancelled":
+            st.info("⏹ 분석을 취소했습니다. 이전 결과를 유지합니다.")
+        for message in job["errors"]:
+            st.error(message)
+
+    # ✅ Excel 저장 버튼: 누를 때만 보고서 생성 (결과 해시별로 한 번, 재실행마다 다시 만들지 않음)
     with col4:
+        st.markdown("<div style='padding-top: 28px;'></div>", unsafe_allow_html=True)
         if "trend_data" in st.session_state and "mention_data" in st.session_state and "group_mentions" in st.session_state:
             trend_data = st.session_state["trend_data"]
             mention_data = st.session_state["mention_data"]
             group_mentions = st.session_state["group_mentions"]
-
-            # 1. 검색량 데이터
-            trend_df = pd.DataFrame()
-            for group in trend_data.get("results", []):
-                df = pd.DataFrame(group["data"])
-                df["group"] = group["title"]
-                trend_df = pd.concat([trend_df, df])
-            trend_df = trend_df.rename(columns={"period": "날짜", "ratio": "검색비율"})
-
-            # 2. 언급량 데이터
-            mention_df = pd.DataFrame(mention_data["labels"], columns=["날짜"])
-            for dataset in mention_data["datasets"]:
-                mention_df[dataset["label"]] = dataset["data"]
-
-            # 3. 뉴스·블로그 문장 리스트
-            mention_list = []
-            for group, articles in group_mentions.items():
-                for item in articles:
-                    mention_list.append({
-                        "그룹명": group,
-                        "제목": item["title"],
-                        "링크": item["link"]
-                    })
-            mention_detail_df = pd.DataFrame(mention_list)
-
-            # 4. 엑셀 파일로 저장
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-                trend_df.to_excel(writer, index=False, sheet_name="검색량 데이터")
-                mention_df.to_excel(writer, index=False, sheet_name="언급량 데이터")
-                mention_detail_df.to_excel(writer, index=False, sheet_name="뉴스_블로그_문장")
-            output.seek(0)
-            b64 = base64.b64encode(output.read()).decode()
-            href = f"""
-                <div style='padding-top: 28px;'>
-                    <a href="data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64}"
-                       download="검색트렌드_분석결과.xlsx">
-                        <button class="pdf-btn">📄 Excel 저장</button>
-                    </a>
-                </div>
-            """
-            st.markdown(href, unsafe_allow_html=True)
-        else:
-            st.markdown("""
-                <div style='padding-top: 28px;'>
-                    <button class="pdf-btn" disabled>📄 Excel 저장</button>
-                </div>
-            """, unsafe_allow_html=True)
-
-
-
-    # ✅ run_analysis 클릭 시 분석 수행
-    if run_analysis:
-        def get_date_range(start, end):
-            return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
-
-        date_range = get_date_range(start_date, end_date)
-
-        trend_data = {}
-        try:
-            response = requests.post(
-                "https://openapi.naver.com/v1/datalab/search",
-                headers={
-                    "X-Naver-Client-Id": st.secrets["NAVER_CLIENT_ID"],
-                    "X-Naver-Client-Secret": st.secrets["NAVER_CLIENT_SECRET"],
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "startDate": str(start_date),
-                    "endDate": str(end_date + timedelta(days=1)),  # ✅ 하루 추가
-                    "timeUnit": "date",
-                    "keywordGroups": [
-                        {"groupName": g["groupName"], "keywords": g["keywords"]} for g in search_groups
-                    ],
-                },
-            )
-
-            if response.ok:
-                trend_data = response.json()
-                st.session_state.trend_data = trend_data
-            else:
-                st.error(f"검색 트렌드 오류: {response.status_code}")
-        except Exception as e:
-            st.error(f"API 요청 실패: {e}")
-
-        mention_data = {"labels": date_range, "datasets": []}
-        group_mentions = {g["groupName"]: [] for g in search_groups}
-
-        with st.spinner("📰 뉴스·블로그 언급량 수집 중..."):
-            for group in search_groups:
-                values = []
-                for d in date_range:
-                    exclude_query = " ".join([f"-{word}" for word in group.get("exclude", [])])
-                    total_mentions = 0
-                    for keyword in group["keywords"]:
-                        full_query = f"{keyword} {exclude_query} {d}"
-                        for endpoint in ["news.json", "blog.json"]:
-                            try:
-                                res = requests.get(
-                                    f"https://openapi.naver.com/v1/search/{endpoint}",
-                                    headers={
-                                        "X-Naver-Client-Id": st.secrets["NAVER_CLIENT_ID_2"],
-                                        "X-Naver-Client-Secret": st.secrets["NAVER_CLIENT_SECRET_2"],
-                                    },
-                                    params={"query": full_query, "display": 5, "start": 1, "sort": "date"},
-                                )
-                                if res.ok:
-                                    total_mentions += res.json().get("total", 0)
-                                    for item in res.json().get("items", []):
-                                        group_mentions[group["groupName"]].append({
-                                            "title": item["title"].replace("<b>", "").replace("</b>", ""),
-                                            "link": item["link"]
-                                        })
-                            except:
-                                pass
-                    values.append(total_mentions)
-                mention_data["datasets"].append({"label": group["groupName"], "data": values})
-
-        st.session_state.mention_data = mention_data
-        st.session_state.group_mentions = group_mentions
-        
-        
-        import io
-        import pandas as pd
-        
-        if download_excel:
-            # 1. 검색량 데이터 정리
-            trend_df = pd.DataFrame()
-            for group in trend_data.get("results", []):
-                df = pd.DataFrame(group["data"])
-                df["group"] = group["title"]
-                trend_df = pd.concat([trend_df, df])
-        
-            trend_df = trend_df.rename(columns={"period": "날짜", "ratio": "검색비율"})
-        
-            # 2. 언급량 데이터 정리
-            mention_df = pd.DataFrame(mention_data["labels"], columns=["날짜"])
-            for dataset in mention_data["datasets"]:
-                mention_df[dataset["label"]] = dataset["data"]
-        
-            # 3. 문장 데이터 정리
-            mention_list = []
-            for group, articles in group_mentions.items():
-                for item in articles:
-                    mention_list.append({
-                        "그룹명": group,
-                        "제목": item["title"],
-                        "링크": item["link"]
-                    })
-            mention_detail_df = pd.DataFrame(mention_list)
-        
-            # 4. 엑셀로 저장
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-                trend_df.to_excel(writer, index=False, sheet_name="검색량 데이터")
-                mention_df.to_excel(writer, index=False, sheet_name="언급량 데이터")
-                mention_detail_df.to_excel(writer, index=False, sheet_name="뉴스_블로그_문장")
-        
-            output.seek(0)
-            st.download_excel(
-                label="📥 엑셀 다운로드",
-                data=output,
+            if "report_key" not in st.session_state:
+                st.session_state.report_key = report_key(trend_data, mention_data, group_mentions)
+            key = st.session_state.report_key
+            st.download_button(
+                "📄 Excel 저장",
+                data=lambda: report_bytes(key, trend_data, mention_data, group_mentions),
                 file_name="검색트렌드_분석결과.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                on_click="ignore",
+                key="excel_download",
             )
+        else:
+            st.download_button("📄 Excel 저장", data=b"", disabled=True, key="excel_download")
+
+    # ✅ 작업 진행 중이면 진행률 + 부분 결과를 주기적으로 갱신, 끝나면 결과 표시
+    if job is not None and job["status"] == "running":
+        show_job_progress(job["id"], search_groups)
+        return
 
-    
-    # ✅ 시각화
     trend_data = st.session_state.get("trend_data", {})
     mention_data = st.session_state.get("mention_data", {})
     group_mentions = st.session_state.get("group_mentions", {})
 
     if trend_data and mention_data:
         st.subheader("검색량 및 언급량 그래프")
-        gcol1, gcol2 = st.columns(2)
-
-        layout = go.Layout(
-            plot_bgcolor="#ffffff",
-            paper_bgcolor="#ffffff",
-            title=dict(x=0.05, font=dict(size=18)),
-            margin=dict(l=40, r=40, t=60, b=100),
-            xaxis=dict(title="날짜", showgrid=True),
-            yaxis=dict(title="값", showgrid=True),
-            legend=dict(
-                orientation="h",
-                x=0.5,
-                y=-0.2,
-                xanchor="center",
-                yanchor="top"
+        if "cache_stats" in st.session_state:
+            cache_stats = st.session_state.cache_stats
+            st.caption(
+                f"💾 API 응답 캐시: 적중 {cache_stats['hits']}건 / 미스 {cache_stats['misses']}건"
+                f" · 🔁 새로 수집한 날짜: {st.session_state.get('fetched_days', 0)}일"
             )
+        if mention_data.get("failed"):
+            st.warning(
+                f"⚠️ 재시도 후에도 언급량을 받지 못한 날짜가 {len(mention_data['failed'])}일 있습니다 "
+                f"({', '.join(mention_data['failed'])}). 다음 분석 때 다시 수집합니다."
+            )
+        with st.expander("📡 API 호출 지표", expanded=False):
+            st.dataframe(pd.DataFrame(metrics_snapshot()), use_container_width=True, hide_index=True)
+        render_results(search_groups, trend_data, mention_data, group_mentions)
+
+
+# ✅ 백그라운드 작업 본문 (Streamlit 호출 없이 결과 dict 반환, 진행 상황은 update_job 으로 전달)
+def run_trend_job(job, params):
+    search_groups = params["search_groups"]
+    date_range, periods = params["date_range"], params["periods"]
+    held_periods = held_trend_periods(params["held_periods"])
+    held_trend = trim_trend(params["held_trend"], held_periods) if held_periods else {}  # 오늘·어제 비율은 배율 맞추기에서도 제외
+    held_days = held_mention_days(params["held_mention_data"]) if params["held_mention_data"] else []
+    api_base = params["api_base"]
+    cache = CacheCounter(get_cache())  # 이 작업의 적중·미스만 셈
+    result = {}
+
+    def request_trend(start, end):
+        status_code, payload = fetch_datalab(
+            start, end, search_groups, params["datalab_credentials"], base_url=api_base, cache=cache
+        )
+        if payload is None:
+            add_job_error(job, f"검색 트렌드 오류: {status_code}")
+        return payload
+
+    update_job(job, message="📈 검색량 조회 중...")
+    trend_data = {}
+    try:
+        span = datalab_span(periods, held_periods)
+        if span is None:
+            trend_data = trim_trend(held_trend, periods)
+        else:
+            payload = request_trend(*span)
+            if payload is not None and held_periods:
+                # 겹치는 날짜로 배율을 맞출 수 없으면 전체 구간 재요청
+                payload = merge_trend(held_trend, payload, periods) or request_trend(periods[0], periods[-1])
+            trend_data = payload or {}
+    except Exception as e:
+        add_job_error(job, f"API 요청 실패: {e}")
+    if trend_data:
+        result.update(trend_data=trend_data, trend_periods=periods)
+    update_job(job, partial={"trend_data": trend_data or held_trend}, progress=0.1)
+
+    def merge(new_data, new_mentions):
+        if held_days:
+            return merge_mentions(
+                params["held_mention_data"], params["held_group_mentions"], new_data, new_mentions, date_range
+            )
+        return new_data, new_mentions
+
+    def on_progress(done, total, partial):
+        mention_data, group_mentions = merge(*partial)
+        update_job(
+            job,
+            progress=0.1 + 0.9 * done / total,
+            message=f"📰 뉴스·블로그 언급량 수집 중... ({done}/{total} 쿼리)",
+            partial={"trend_data": trend_data or held_trend, "mention_data": mention_data, "group_mentions": group_mentions},
         )
 
-        with gcol1:
-            fig = go.Figure(layout=layout)
-            fig.update_layout(title="네이버 검색량")
-            for group in trend_data.get("results", []):
-                fig.add_trace(go.Scatter(
-                    x=[d["period"] for d in group["data"]],
-                    y=[d["ratio"] for d in group["data"]],
-                    mode="lines+markers",
-                    name=group["title"]
-                ))
-            st.plotly_chart(fig, use_container_width=True)
-
-        with gcol2:
-            fig2 = go.Figure(layout=layout)
-            fig2.update_layout(title="뉴스·블로그 언급량")
-            for ds in mention_data.get("datasets", []):
-                fig2.add_trace(go.Scatter(
-                    x=mention_data.get("labels", []),
-                    y=ds["data"],
-                    mode="lines+markers",
-                    name=ds["label"]
-                ))
-            st.plotly_chart(fig2, use_container_width=True)
-
-        st.subheader("실시간 뉴스·블로그 문장 리스트")
-        cols = st.columns(4)
-        for idx, group in enumerate(search_groups):
-            with cols[idx % 4]:
-                st.markdown(f"<h4 style='text-align:center; color:#0366d6'>{group['groupName']}</h4>", unsafe_allow_html=True)
-                for item in group_mentions.get(group['groupName'], [])[:10]:
-                    st.markdown(f'''
-                    <div style='border:1px solid #eee; padding:10px; margin-bottom:8px; border-radius:8px; background-color:#fafafa;'>
-                        <a href="{item['link']}" target="_blank" style="text-decoration:none; color:#333; font-weight:500;">
-                            🔗 {item['title']}
-                        </a>
-                    </div>
-                    ''', unsafe_allow_html=True)
+    fetch_days = missing_days(date_range, held_days)
+    new_data, new_mentions = collect_mentions(
+        search_groups,
+        fetch_days,
+        params["search_credentials"],
+        max_workers=params["max_workers"],
+        base_url=api_base,
+        cache=cache,
+        on_progress=on_progress,
+        cancel=job["cancel"],
+    )
+    mention_data, group_mentions = merge(new_data, new_mentions)
+
+    result.update(
+        cache_stats=cache.stats(),
+        fetched_days=len(fetch_days),
+        trend_groups_key=groups_key(search_groups),
+        mention_data=mention_data,
+        group_mentions=group_mentions,
+    )
+    return result
+
+
+# ✅ 진행 중 화면: 1초마다 이 영역만 다시 그림, 작업이 끝나면 전체 재실행으로 결과 반영
+@st.fragment(run_every=1)
+def show_job_progress(job_id, search_groups):
+    job = get_job(job_id)
+    if job is None or job["status"] != "running":
+        st.rerun()
+    pcol1, pcol2 = st.columns([5, 1])
+    with pcol1:
+        st.progress(job["progress"], text=job["message"] or "분석 준비 중...")
+    with pcol2:
+        if st.button("⏹ 분석 취소", key="cancel_job_button"):
+            cancel_job(job_id)
+    partial = job["partial"]
+    st.subheader("검색량 및 언급량 그래프")
+    render_results(
+        search_groups, partial.get("trend_data", {}), partial.get("mention_data", {}), partial.get("group_mentions", {})
+    )
+
+
+# ✅ 시각화 (완료 결과와 진행 중 부분 결과 공용)
+def render_results(search_groups, trend_data, mention_data, group_mentions):
+    gcol1, gcol2 = st.columns(2)
+
+    layout = go.Layout(
+        plot_bgcolor="#ffffff",
+        paper_bgcolor="#ffffff",
+        title=dict(x=0.05, font=dict(size=18)),
+        margin=dict(l=40, r=40, t=60, b=100),
+        xaxis=dict(title="날짜", showgrid=True),
+        yaxis=dict(title="값", showgrid=True),
+        legend=dict(
+            orientation="h",
+            x=0.5,
+            y=-0.2,
+            xanchor="center",
+            yanchor="top"
+        )
+    )
+
+    with gcol1:
+        fig = go.Figure(layout=layout)
+        fig.update_layout(title="네이버 검색량")
+        for group in trend_data.get("results", []):
+            fig.add_trace(go.Scatter(
+                x=[d["period"] for d in group["data"]],
+                y=[d["ratio"] for d in group["data"]],
+                mode="lines+markers",
+                name=group["title"]
+            ))
+        st.plotly_chart(fig, use_container_width=True)
+
+    with gcol2:
+        fig2 = go.Figure(layout=layout)
+        fig2.update_layout(title="뉴스·블로그 언급량")
+        # 페이징 한도로 API total 추정치를 쓴 날짜는 빈 마커 (다른 날짜는 수집한 항목 수)
+        fallback = set(mention_data.get("fallback", []))
+        for ds in mention_data.get("datasets", []):
+            fig2.add_trace(go.Scatter(
+                x=mention_data.get("labels", []),
+                y=ds["data"],
+                mode="lines+markers",
+                name=ds["label"],
+                marker=dict(
+                    symbol=["circle-open" if d in fallback else "circle" for d in mention_data.get("labels", [])],
+                    size=[10 if d in fallback else 6 for d in mention_data.get("labels", [])],
+                ),
+            ))
+        st.plotly_chart(fig2, use_container_width=True)
+        if fallback:
+            st.caption(f"○ 빈 마커: 하루 언급이 많아 API 추정치(total)로 채운 날짜 {len(fallback)}일 (다른 날짜는 수집한 글 수)")
+
+    st.subheader("실시간 뉴스·블로그 문장 리스트")
+    cols = st.columns(4)
+    for idx, group in enumerate(search_groups):
+        with cols[idx % 4]:
+            st.markdown(f"<h4 style='text-align:center; color:#0366d6'>{group['groupName']}</h4>", unsafe_allow_html=True)
+            for item in group_mentions.get(group['groupName'], [])[:10]:
+                copies = f" <span style='color:#888; font-size:12px'>×{item['copies']}</span>" if item.get("copies", 1) > 1 else ""
+                st.markdown(f'''
+                <div style='border:1px solid #eee; padding:10px; margin-bottom:8px; border-radius:8px; background-color:#fafafa;'>
+                    <a href="{item['link']}" target="_blank" style="text-decoration:none; color:#333; font-weight:500;">
+                        🔗 {item['title']}
+                    </a>{copies}
+                </div>
+                ''', unsafe_allow_html=True)
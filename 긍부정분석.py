@@ -3,63 +3,80 @@ import pandas as pd
 import json
 from streamlit.components.v1 import html
 import plotly.express as px
+from 주차데이터 import WEEKS, cached_weeks_report
+from 주차산출물 import (
+    BRANDS, RANK_LIMIT, SENTIMENT_FILTERS, TOP_K, derived, derived_view, graph_layout, sentiment_shards, sentiment_snippets,
+    sentiment_view, snippet_records, week_artifacts,
+)
+from 그래프배치 import BUBBLE_VIEW
+from 정적파일 import d3_src, static_enabled, static_url
+from 검색상자 import show_search_box
 
 def show_sentimental_tab():
     st.title("🙂 긍·부정 분석 (D3.js 버전)")
 
     # ✅ 주차 선택
-    weeks = {
-        "3월 1주차 ('25.3.1~3.7')": "2025_03w1",
-        "3월 2주차 ('25.3.8~3.14')": "2025_03w2",
-        "3월 3주차 ('25.3.15~3.21')": "2025_03w3"
-    }
-    selected_label = st.selectbox("📂 주차 선택", list(weeks.keys()), index=0)
-    selected_week = weeks[selected_label]
-
-    base_url = f"https://raw.githubusercontent.com/umne012/research_simple/main/{selected_week}"
-    morph_urls = [f"{base_url}/morpheme_analysis_part{i}.csv" for i in range(1, 4)]
-    sentiment_url = f"{base_url}/sentiment_analysis_merged.csv"
-
-    @st.cache_data
-    def load_data():
-        morph_frames = []
-        for url in morph_urls:
-            df = pd.read_csv(url)
-            df.columns = df.columns.str.strip()
-            morph_frames.append(df)
-        morph_df = pd.concat(morph_frames, ignore_index=True)
-        morph_df["문장ID"] = morph_df["문장ID"].astype(str)
-
-        sent_df = pd.read_csv(sentiment_url)
-        sent_df.columns = sent_df.columns.str.strip()
-        sent_df["문장ID"] = sent_df["문장ID"].astype(str)
-        return morph_df, sent_df
-
-    morph_df, sent_df = load_data()
-
-    # ✅ 버블차트 데이터 준비
-    brands = ["KT", "KT Skylife", "LGU+", "SKB"]
-    bubble_data, sentence_map = {}, {}
-
-    for brand in brands:
-        brand_df = morph_df[morph_df["그룹"] == brand]
-        word_counts = (
-            brand_df.groupby(["단어", "감정"])["문장ID"]
-            .count()
-            .reset_index(name="count")
-            .sort_values("count", ascending=False)
+    selected_label = st.selectbox("📂 주차 선택", list(WEEKS.keys()), index=0)
+    selected_week = WEEKS[selected_label]
+
+    # ✅ 버블차트·문장·일별 비율: 사전 계산 산출물 (없으면 주차 데이터로 바로 계산)
+    try:
+        artifacts = week_artifacts(selected_week)
+    except Exception as e:
+        st.error(str(e))
+        return
+
+    with st.expander("💾 주차 데이터 캐시", expanded=False):
+        st.caption("사전 계산 산출물 사용" if artifacts["source"] == "precomputed" else "산출물 없음 → 주차 데이터에서 계산")
+        st.dataframe(pd.DataFrame(cached_weeks_report()), use_container_width=True, hide_index=True)
+
+    # ✅ 버블차트(+문장 패널)와 선그래프는 각각 부분 재실행 영역(fragment) → 토글을 눌러도 탭 전체를 다시 돌리지 않음
+    show_bubbles(artifacts)
+    show_search_box(selected_week, "sentiment")
+    show_positive_chart(artifacts)
+
+
+# ✅ 브랜드별 iframe 에 넣을 JSON (주차·보기별로 한 번만 직렬화)
+# - 문장은 브랜드·단어별 정적 조각으로 게시 → iframe 에는 노드와 조각 경로만 넣음 (정적 서빙이 꺼져 있으면 인라인)
+def bubble_json(artifacts, bubble_data, inline_sentences):
+    sentence_map = sentiment_snippets(artifacts, bubble_data) if inline_sentences else None
+    shards = {} if inline_sentences else sentiment_shards(artifacts, bubble_data)
+    return {
+        brand: (
+            json.dumps(bubble_data[brand], ensure_ascii=False),
+            json.dumps(shards.get(brand, {}), ensure_ascii=False),
+            json.dumps({key: snippet_records(snippets) for key, snippets in sentence_map[brand].items()}, ensure_ascii=False)
+            if inline_sentences else "null",
         )
-        top_words = word_counts.groupby("감정").head(10)
-        nodes = []
-        for _, row in top_words.iterrows():
-            nodes.append({"id": row["단어"], "group": row["감정"], "size": row["count"]})
-            matched_ids = brand_df[(brand_df["단어"] == row["단어"]) & (brand_df["감정"] == row["감정"])]["문장ID"]
-            matched_sents = sent_df[(sent_df["문장ID"].isin(matched_ids)) & (sent_df["그룹"] == brand)]
-            sentence_map[row["단어"]] = [
-                {"문장": s["문장"][:100] + "..." if len(s["문장"]) > 100 else s["문장"], "링크": s["원본링크"]}
-                for _, s in matched_sents.iterrows()
-            ]
-        bubble_data[brand] = nodes
+        for brand in BRANDS
+    }
+
+
+@st.fragment
+def show_bubbles(artifacts):
+    brands = BRANDS
+
+    # ✅ 상위 단어 수·감정 필터: 주차별 순위표에서 잘라 씀 (다시 정렬하지 않음)
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        k = st.slider("브랜드·감정별 상위 단어 수", 5, RANK_LIMIT, TOP_K, step=5, key="sentiment_top_k")
+    with col2:
+        sentiments = SENTIMENT_FILTERS[st.radio("감정", list(SENTIMENT_FILTERS), horizontal=True, key="sentiment_filter")]
+    bubble_data = sentiment_view(artifacts, k, sentiments)
+
+    inline_sentences = not static_enabled()
+    view_key = f"{k}_{'+'.join(sentiments)}_{inline_sentences}"
+    payloads = derived_view(artifacts, f"bubble_json_{view_key}", lambda a: bubble_json(a, bubble_data, inline_sentences))
+    shard_base = static_url("")
+    d3_url = d3_src()
+
+    # ✅ 서버 배치: 주차별로 한 번 계산한 고정 좌표를 넘기고 브라우저는 그리기·드래그만
+    server_layout = st.toggle("⚡ 서버에서 버블 배치 계산", value=False, key="sentiment_server_layout",
+                              help="브라우저 시뮬레이션 대신 미리 계산한 좌표로 바로 그립니다.")
+    layouts = derived_view(artifacts, f"bubble_layout_json_{view_key}", lambda a: {
+        brand: json.dumps(layout, ensure_ascii=False) for brand, layout in graph_layout(a, "bubble", k, sentiments).items()
+    }) if server_layout else None
+    view_w, view_h = BUBBLE_VIEW
 
     # ✅ 2x2 버블차트 + 오른쪽 문장 패널 구성
     st.markdown("### 🧼 브랜드별 버블차트")
@@ -72,12 +89,12 @@ def show_sentimental_tab():
         col = all_rows[i]
         with col:
             st.markdown(f"**{brand}**")
-            nodes_json = json.dumps(bubble_data[brand], ensure_ascii=False)
-            sents_json = json.dumps(sentence_map, ensure_ascii=False)
+            nodes_json, shards_json, sents_json = payloads[brand]
+            layout_json = layouts[brand] if layouts else "null"
 
             html_code = f"""
             <html><head>
-            <script src="https://d3js.org/d3.v7.min.js"></script>
+            <script src="{d3_url}"></script>
             <style>
                 svg {{ width: 100%; height: 300px; }}
                 rect {{ stroke: black; stroke-width: 1.2px; }}
@@ -87,15 +104,22 @@ def show_sentimental_tab():
             <script>
                 const nodes = {nodes_json};
                 const sentenceData = {sents_json};
+                const fixedLayout = {layout_json};  // 서버 배치 좌표 (없으면 브라우저에서 시뮬레이션)
                 const svg = d3.select("svg");
-                const width = document.querySelector("svg").clientWidth;
-                const height = document.querySelector("svg").clientHeight;
 
-                const sim = d3.forceSimulation(nodes)
-                    .force("center", d3.forceCenter(width / 2, height / 2))
-                    .force("charge", d3.forceManyBody().strength(1))  // 💡 약한 힘으로 덜 밀려나게
-                    .force("collision", d3.forceCollide().radius(d => Math.sqrt(d.size) * 4))  // 💡 간격 조정
-                    .alphaDecay(0.06);
+                let sim = null;
+                if (fixedLayout) {{
+                    svg.attr("viewBox", "0 0 {view_w} {view_h}");
+                    nodes.forEach(d => {{ [d.x, d.y] = fixedLayout[d.key]; }});
+                }} else {{
+                    const width = document.querySelector("svg").clientWidth;
+                    const height = document.querySelector("svg").clientHeight;
+                    sim = d3.forceSimulation(nodes)
+                        .force("center", d3.forceCenter(width / 2, height / 2))
+                        .force("charge", d3.forceManyBody().strength(1))  // 💡 약한 힘으로 덜 밀려나게
+                        .force("collision", d3.forceCollide().radius(d => Math.sqrt(d.size) * 4))  // 💡 간격 조정
+                        .alphaDecay(0.06);
+                }}
 
                 const node = svg.selectAll("g")
                     .data(nodes).enter().append("g")
@@ -117,21 +141,36 @@ def show_sentimental_tab():
                     .attr("dy", "0.3em")
                     .text(d => d.id);
 
-                sim.on("tick", () => {{
+                function ticked() {{
                     node.attr("transform", d => `translate(${{d.x}},${{d.y}})`);
-                }});
+                }}
+                if (sim) sim.on("tick", ticked); else ticked();
 
-                node.on("click", (e, d) => {{
+                // 문장은 클릭한 단어의 조각만 받아 옴 (정적 서빙이 꺼져 있으면 sentenceData 에 인라인)
+                const shards = {shards_json};
+                const shardCache = {{}};
+                function showSentences(sents) {{
                     const box = parent.document.getElementById("sentence-panel");
-                    const sents = sentenceData[d.id] || [];
                     box.innerHTML = sents.length
                         ? sents.map(s => `<a href='${{s.링크}}' target='_blank'>📌 ${{s.문장}}</a>`).join("<br><br>")
                         : "<i>문장이 없습니다</i>";
+                }}
+
+                node.on("click", (e, d) => {{
+                    if (sentenceData) {{ showSentences(sentenceData[d.key] || []); return; }}
+                    const shard = shards[d.key];
+                    if (!shard) {{ showSentences([]); return; }}
+                    if (shardCache[shard]) {{ showSentences(shardCache[shard]); return; }}
+                    parent.document.getElementById("sentence-panel").innerHTML = "<i>불러오는 중...</i>";
+                    fetch("{shard_base}" + shard)
+                        .then(r => r.json())
+                        .then(sents => {{ shardCache[shard] = sents; showSentences(sents); }})
+                        .catch(() => {{ parent.document.getElementById("sentence-panel").innerHTML = "<i>문장을 불러오지 못했습니다</i>"; }});
                 }});
 
-                function dragstarted(event, d) {{ if (!event.active) sim.alphaTarget(0.3).restart(); d.fx = d.x; d.fy = d.y; }}
-                function dragged(event, d) {{ d.fx = event.x; d.fy = event.y; }}
-                function dragended(event, d) {{ if (!event.active) sim.alphaTarget(0); d.fx = null; d.fy = null; }}
+                function dragstarted(event, d) {{ if (!sim) return; if (!event.active) sim.alphaTarget(0.3).restart(); d.fx = d.x; d.fy = d.y; }}
+                function dragged(event, d) {{ if (!sim) {{ d.x = event.x; d.y = event.y; ticked(); return; }} d.fx = event.x; d.fy = event.y; }}
+                function dragended(event, d) {{ if (!sim) return; if (!event.active) sim.alphaTarget(0); d.fx = null; d.fy = null; }}
             </script></body></html>
             """
             html(html_code, height=320)
@@ -140,21 +179,25 @@ def show_sentimental_tab():
         st.markdown("#### 📄 관련 문장")
         html("<div id='sentence-panel' style='height:620px; overflow-y:auto; background:#f7f7f7; padding:10px;'>단어를 클릭하면 문장이 여기에 표시됩니다.</div>", height=650)
 
+
+
+# ✅ 긍정 비율 그림 (주차별로 한 번만 생성)
+def positive_figure(artifacts):
+    if not artifacts["daily"]["positive_ratio"]:
+        return None
+    trend_df = pd.DataFrame(artifacts["daily"]["positive_ratio"])
+    fig = px.line(trend_df, x="날짜", y="긍정비율", color="그룹", markers=True)
+    fig.update_layout(yaxis_title="긍정 비율 (%)", height=400)
+    return fig
+
+
+@st.fragment
+def show_positive_chart(artifacts):
     # ✅ 긍정 비율 변화 선그래프
     st.divider()
     st.markdown("### 📈 긍정 단어 비율 추이 (일별)")
-    if "날짜" in morph_df.columns:
-        trend_df = (
-            morph_df.groupby(["날짜", "그룹", "감정"])["단어"]
-            .count()
-            .reset_index(name="count")
-            .pivot_table(index=["날짜", "그룹"], columns="감정", values="count", fill_value=0)
-            .reset_index()
-        )
-        trend_df["긍정비율"] = trend_df["positive"] / (trend_df["positive"] + trend_df["negative"] + 1e-9) * 100
-
-        fig = px.line(trend_df, x="날짜", y="긍정비율", color="그룹", markers=True)
-        fig.update_layout(yaxis_title="긍정 비율 (%)", height=400)
+    fig = derived(artifacts, "positive_figure", positive_figure)
+    if fig is not None:
         st.plotly_chart(fig, use_container_width=True)
     else:
         st.warning("📌 '날짜' 컬럼이 필요합니다.")
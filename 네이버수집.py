@@ -0,0 +1,450 @@
+import os
+import json
+import time
+import zlib
+import threading
+from datetime import date, datetime, timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from 응답캐시 import make_key
+from 호출제한 import QuotaExceeded, request_with_retry
+from 증분갱신 import normalize_trend
+from 중복제거 import dedupe_items
+
+
+# ✅ 기본 설정 (환경변수로 덮어쓰기 → 테스트 모드에서는 로컬 스텁 서버 주소 지정)
+NAVER_API_BASE = os.environ.get("NAVER_API_BASE", "https://openapi.naver.com")
+MAX_WORKERS = int(os.environ.get("NAVER_MAX_WORKERS", "8"))
+REQUEST_TIMEOUT = 10
+SEARCH_ENDPOINTS = ["news.json", "blog.json"]
+PAGE_SIZE = 100  # 검색 API display 최댓값
+MAX_START = 1000  # 검색 API start 최댓값 → 쿼리당 최신 1,100건까지만 페이징 가능
+ITEMS_PER_DAY = 5  # 날짜별로 보관할 기사·글 수
+DATALAB_MAX_GROUPS = 5  # 데이터랩 keywordGroups 최대 개수
+
+_session_lock = threading.Lock()
+_sessions = {}
+
+
+# ✅ keep-alive 커넥션 풀을 공유하는 Session (풀 크기별로 하나씩, 프로세스 전역)
+def get_session(pool_size=MAX_WORKERS):
+    with _session_lock:
+        session = _sessions.get(pool_size)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[pool_size] = session
+        return session
+
+
+def auth_headers(credentials):
+    client_id, client_secret = credentials
+    return {"X-Naver-Client-Id": client_id, "X-Naver-Client-Secret": client_secret}
+
+
+# ✅ 데이터랩 검색어 트렌드 요청 1회 (최대 5그룹) → (상태코드, 응답 JSON)
+def fetch_datalab_chunk(start_date, end_date, search_groups, credentials, base_url=NAVER_API_BASE, cache=None):
+    keyword_groups = [{"groupName": g["groupName"], "keywords": g["keywords"]} for g in search_groups]
+    span = f"{start_date}~{end_date}"
+    cache_query = json.dumps(keyword_groups, ensure_ascii=False)
+    if cache is not None:
+        cached = cache.get("datalab/search", cache_query, [], span)
+        if cached is not None:
+            return 200, cached
+
+    response = request_with_retry(
+        get_session(),
+        "POST",
+        f"{base_url}/v1/datalab/search",
+        credentials,
+        "datalab",
+        headers={**auth_headers(credentials), "Content-Type": "application/json"},
+        json={
+            "startDate": str(start_date),
+            "endDate": str(end_date),
+            "timeUnit": "date",
+            "keywordGroups": keyword_groups,
+        },
+        timeout=REQUEST_TIMEOUT,
+    )
+    if not response.ok:
+        return response.status_code, None
+    payload = response.json()
+    if cache is not None:
+        cache.set("datalab/search", cache_query, [], span, payload)
+    return response.status_code, payload
+
+
+# ✅ 데이터랩 검색어 트렌드 요청 → (상태코드, 응답 JSON)
+# - 그룹이 5개를 넘으면 첫 그룹을 기준(anchor)으로 모든 묶음에 넣어 4개씩 나눠 병렬 요청
+# - 묶음마다 최댓값=100 기준이 다르므로 기준 그룹 합이 같아지도록 배율을 맞춘 뒤 전체를 최댓값=100 으로 재정규화
+def fetch_datalab(start_date, end_date, search_groups, credentials, base_url=NAVER_API_BASE, cache=None, max_workers=MAX_WORKERS):
+    if len(search_groups) <= DATALAB_MAX_GROUPS:
+        return fetch_datalab_chunk(start_date, end_date, search_groups, credentials, base_url, cache)
+
+    anchor, others = search_groups[0], search_groups[1:]
+    size = DATALAB_MAX_GROUPS - 1
+    chunks = [[anchor] + others[i:i + size] for i in range(0, len(others), size)]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+        responses = list(pool.map(
+            lambda chunk: fetch_datalab_chunk(start_date, end_date, chunk, credentials, base_url, cache), chunks
+        ))
+    for status_code, payload in responses:
+        if payload is None:
+            return status_code, None
+
+    def anchor_sum(payload):
+        return sum(d["ratio"] for d in payload["results"][0]["data"])
+
+    reference = anchor_sum(responses[0][1])
+    results, ratios = [], {}
+    for i, (_, payload) in enumerate(responses):
+        chunk_anchor = anchor_sum(payload)
+        if chunk_anchor <= 0 or reference <= 0:
+            raise ValueError(f"기준 그룹 '{anchor['groupName']}' 검색량이 0이라 묶음 간 비율을 맞출 수 없습니다.")
+        scale = reference / chunk_anchor
+        for group in payload["results"][(0 if i == 0 else 1):]:
+            results.append(group)
+            ratios[group["title"]] = {d["period"]: d["ratio"] * scale for d in group["data"]}
+
+    start, end = date.fromisoformat(str(start_date)), date.fromisoformat(str(end_date))
+    periods = [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+    return 200, normalize_trend({**responses[0][1], "results": results}, ratios, periods)
+
+
+def build_query(keyword, exclude, day=None):
+    exclude_query = " ".join([f"-{word}" for word in exclude])
+    return f"{keyword} {exclude_query} {day}" if day else f"{keyword} {exclude_query}"
+
+
+# ✅ 검색 결과 항목의 날짜 (뉴스: pubDate, 블로그: postdate)
+def item_date(item):
+    if item.get("postdate"):
+        raw = item["postdate"]
+        return f"{raw[:4]}-{raw[4:6]}-{raw[6:8]}"
+    if item.get("pubDate"):
+        return parsedate_to_datetime(item["pubDate"]).date().isoformat()
+    return None
+
+
+# ✅ 뉴스/블로그 검색 1페이지 → {"total", "items"} (실패 시 None)
+def search_page(session, endpoint, query, credentials, start=1, display=PAGE_SIZE, base_url=NAVER_API_BASE):
+    try:
+        res = request_with_retry(
+            session,
+            "GET",
+            f"{base_url}/v1/search/{endpoint}",
+            credentials,
+            "search",
+            headers=auth_headers(credentials),
+            params={"query": query, "display": display, "start": start, "sort": "date"},
+            timeout=REQUEST_TIMEOUT,
+        )
+        if not res.ok:
+            return None
+        body = res.json()
+        items = [
+            {
+                "title": item["title"].replace("<b>", "").replace("</b>", ""),
+                "link": item["link"],
+                "date": item_date(item),
+            }
+            for item in body.get("items", [])
+        ]
+    except (requests.RequestException, QuotaExceeded, ValueError, TypeError, KeyError):
+        return None
+    return {"total": body.get("total", 0), "items": items}
+
+
+# ✅ 쿼리 플래너: 그룹 간에 겹치는 (엔드포인트, 검색어, 제외어) 조합은 한 번만 조회
+# - plans: 중복 제거된 조회 목록, group_plans: 그룹별 plan 인덱스 (키워드 → 엔드포인트 순서)
+def plan_queries(search_groups):
+    plans, index, group_plans = [], {}, {}
+    for group in search_groups:
+        exclude = group.get("exclude", [])
+        for keyword in group["keywords"]:
+            for endpoint in SEARCH_ENDPOINTS:
+                key = make_key(endpoint, keyword, exclude, "")
+                if key not in index:
+                    index[key] = len(plans)
+                    plans.append({"endpoint": endpoint, "keyword": keyword, "exclude": exclude})
+                group_plans.setdefault(group["groupName"], []).append(index[key])
+    return plans, group_plans
+
+
+# ✅ sort=date 로 한 쿼리를 페이지 단위로 훑으며 날짜별로 분류 → ({날짜: 버킷}, 페이징 한도로 확정 못 한 날짜)
+# - 최신순 정렬이므로 어떤 날짜보다 오래된 항목이 보이면 그 날짜는 다 센 것
+# - 캐시에 있는 날짜는 건너뛰고, 확인이 필요한 가장 오래된 날짜를 지나면 중단
+def page_query(session, plan, days, credentials, base_url=NAVER_API_BASE, cache=None, cancel=None):
+    endpoint, keyword, exclude = plan["endpoint"], plan["keyword"], plan["exclude"]
+    bucket_key = f"{endpoint}:day"
+    buckets, wanted = {}, []
+    for d in days:
+        cached = cache.get(bucket_key, keyword, exclude, d) if cache is not None else None
+        if cached is not None:
+            buckets[d] = cached
+        else:
+            wanted.append(d)
+    if not wanted:
+        return buckets, []
+
+    oldest_wanted = min(wanted)
+    fresh = {d: {"total": 0, "items": []} for d in wanted}
+    query = build_query(keyword, exclude)
+    oldest_seen, exhausted, start = None, False, 1
+    while start <= MAX_START and not (cancel is not None and cancel.is_set()):
+        page = search_page(session, endpoint, query, credentials, start=start, base_url=base_url)
+        if page is None:
+            break
+        for item in page["items"]:
+            bucket = fresh.get(item["date"])
+            if bucket is not None:
+                bucket["total"] += 1
+                if len(bucket["items"]) < ITEMS_PER_DAY:
+                    bucket["items"].append(item)
+        dates = [item["date"] for item in page["items"] if item["date"]]
+        if dates:
+            oldest_seen = min(dates) if oldest_seen is None else min(oldest_seen, min(dates))
+        if len(page["items"]) < PAGE_SIZE or start + PAGE_SIZE > page["total"]:
+            exhausted = True
+            break
+        if oldest_seen is not None and oldest_seen < oldest_wanted:
+            break
+        start += PAGE_SIZE
+
+    unresolved = []
+    for d in wanted:
+        if exhausted or (oldest_seen is not None and oldest_seen < d):
+            buckets[d] = fresh[d]
+            if cache is not None:
+                cache.set(bucket_key, keyword, exclude, d, fresh[d])
+        else:
+            unresolved.append(d)
+    return buckets, unresolved
+
+
+# ✅ 페이징 한도(start ≤ 1000)로 닿지 못한 날짜만 기존 방식(날짜를 붙인 검색의 total)으로 보완 (실패 시 None)
+# - total 은 API 추정치라 페이징으로 센 항목 수와 기준이 다름 → 버킷에 fallback 표시 (캐시에서 다시 읽어도 유지)
+def fallback_day(session, plan, day, credentials, base_url=NAVER_API_BASE, cache=None):
+    endpoint, keyword, exclude = plan["endpoint"], plan["keyword"], plan["exclude"]
+    page = search_page(
+        session, endpoint, build_query(keyword, exclude, day), credentials, display=ITEMS_PER_DAY, base_url=base_url
+    )
+    if page is None:
+        return None
+    bucket = {"total": page["total"], "items": [{**item, "date": day} for item in page["items"]], "fallback": True}
+    if cache is not None:
+        cache.set(f"{endpoint}:day", keyword, exclude, day, bucket)
+    return bucket
+
+
+# ✅ 쿼리별 결과 → 그룹별 날짜 합산 (그룹 → 날짜 → 키워드 → 엔드포인트 순서 고정 → 결과 순서 결정적)
+# - 아직 쿼리가 다 끝나지 않은 그룹은 건너뜀 (진행 중 부분 결과용)
+# - 항목은 그룹별로 중복 제거 (같은 링크·유사 제목은 처음 나온 한 건만, 합쳐진 건수는 copies)
+# - 값이 API total 추정치(fallback_day)인 날짜는 mention_data["fallback"] 에 남김 → 그래프에서 따로 표시
+def assemble_mentions(search_groups, group_plans, paged, date_range, failed=()):
+    mention_data = {"labels": list(date_range), "datasets": [], "failed": sorted(failed)}
+    group_mentions, fallback = {}, set()
+    for group in search_groups:
+        name = group["groupName"]
+        indexes = group_plans.get(name, [])
+        if any(paged[i] is None for i in indexes):
+            continue
+        values, items = [], []
+        for d in date_range:
+            total_mentions = 0
+            for i in indexes:
+                bucket = paged[i][0].get(d, {"total": 0, "items": []})
+                total_mentions += bucket["total"]
+                if bucket.get("fallback"):
+                    fallback.add(d)
+                items.extend({**item, "date": d} for item in bucket["items"])
+            values.append(total_mentions)
+        mention_data["datasets"].append({"label": name, "data": values})
+        group_mentions[name] = dedupe_items(items)
+    mention_data["fallback"] = sorted(fallback)
+    return mention_data, group_mentions
+
+
+# ✅ 중복 제거된 쿼리를 스레드 풀로 병렬 페이징 → 그룹별 날짜 합산
+# - API 호출 수는 날짜 수가 아니라 결과 페이지 수에 비례
+# - on_progress(끝난 쿼리 수, 전체 쿼리 수, 부분 결과): 쿼리가 하나 끝날 때마다 호출
+# - cancel(threading.Event)이 켜지면 다음 페이지부터 멈추고 그때까지의 결과를 반환
+# - 재시도 후에도 못 받은 날짜는 0으로 채우되 mention_data["failed"] 에 남김 (다음 분석 때 다시 수집)
+def collect_mentions(search_groups, date_range, credentials, max_workers=MAX_WORKERS, base_url=NAVER_API_BASE,
+                     cache=None, on_progress=None, cancel=None):
+    plans, group_plans = plan_queries(search_groups)
+    session = get_session(max_workers)
+    paged = [None] * len(plans)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(page_query, session, plan, date_range, credentials, base_url, cache, cancel): i
+            for i, plan in enumerate(plans)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            paged[futures[future]] = future.result()
+            if on_progress is not None:
+                on_progress(done, len(plans), assemble_mentions(search_groups, group_plans, paged, date_range))
+
+        fallbacks = [(i, d) for i, (_, unresolved) in enumerate(paged) for d in unresolved]
+        if cancel is not None and cancel.is_set():
+            return assemble_mentions(search_groups, group_plans, paged, date_range, {d for _, d in fallbacks})
+        filled = list(pool.map(
+            lambda task: fallback_day(session, plans[task[0]], task[1], credentials, base_url, cache), fallbacks
+        ))
+
+    failed = set()
+    for (i, d), bucket in zip(fallbacks, filled):
+        if bucket is None:
+            failed.add(d)
+        else:
+            paged[i][0][d] = bucket
+    return assemble_mentions(search_groups, group_plans, paged, date_range, failed)
+
+
+# ✅ 테스트 모드: 네이버 API 흉내를 내는 로컬 스텁 HTTP 서버 (처리량 측정용)
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.0
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        self.server.count_call()
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        query = params.get("query", [""])[0]
+        display = int(params.get("display", ["10"])[0])
+        start = int(params.get("start", ["1"])[0])
+        words = query.split()
+
+        # 날짜를 붙인 보완 검색 → total 과 날짜 항목 몇 건
+        if words and len(words[-1]) == 10 and words[-1][4] == "-":
+            seed = zlib.crc32(f"{url.path}|{query}".encode("utf-8"))
+            day = date.fromisoformat(words[-1])
+            self._send_json({"total": seed % 1000, "items": [self._item(url.path, query, seed, i, day) for i in range(display)]})
+            return
+
+        # 날짜 최신순 스트림: 하루 per_day 건씩 total 건
+        seed = zlib.crc32(f"{url.path}|{' '.join(words)}".encode("utf-8"))
+        total, per_day = 300 + seed % 3000, 5 + seed % 60
+        today = date.today()
+        indexes = range(start - 1, min(total, start - 1 + display))
+        self._send_json({
+            "total": total,
+            "items": [self._item(url.path, query, seed, i, today - timedelta(days=i // per_day)) for i in indexes],
+        })
+
+    @staticmethod
+    def _item(path, query, seed, i, day):
+        item = {"title": f"<b>{query}</b> 기사 {i}", "link": f"https://stub.local/{seed}/{i}"}
+        if path.endswith("blog.json"):
+            item["postdate"] = day.strftime("%Y%m%d")
+        else:
+            item["pubDate"] = format_datetime(datetime(day.year, day.month, day.day, 9))
+        return item
+
+    def do_POST(self):
+        time.sleep(self.latency)
+        self.server.count_call()
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        start = date.fromisoformat(payload["startDate"])
+        end = date.fromisoformat(payload["endDate"])
+        days = [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+        self._send_json({
+            "startDate": payload["startDate"],
+            "endDate": payload["endDate"],
+            "timeUnit": "date",
+            "results": [
+                {
+                    "title": g["groupName"],
+                    "keywords": g["keywords"],
+                    "data": [{"period": d, "ratio": (zlib.crc32(f"{g['groupName']}{d}".encode()) % 10000) / 100} for d in days],
+                }
+                for g in payload.get("keywordGroups", [])
+            ],
+        })
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    calls = 0
+    _calls_lock = threading.Lock()
+
+    def count_call(self):
+        with self._calls_lock:
+            self.calls += 1
+
+
+def run_stub_server(port=0, latency=0.0):
+    handler = type("StubHandler", (_StubHandler,), {"latency": latency})
+    server = _StubServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="로컬 스텁 서버로 언급량 수집 처리량 측정")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--latency", type=float, default=0.05, help="스텁 응답 지연(초)")
+    parser.add_argument("--cache", action="store_true", help="임시 응답 캐시를 켜고 반복 수집 시간 측정")
+    parser.add_argument("--rate", type=float, default=1e6, help="초당 호출 제한 (스텁 측정 시 기본값은 사실상 무제한)")
+    args = parser.parse_args()
+
+    import 호출제한
+    호출제한.RATE_PER_SEC = args.rate
+    호출제한.BURST = max(1, int(min(args.rate, 1e6)))
+
+    server, base_url = run_stub_server(latency=args.latency)
+    groups = [
+        {"groupName": "Skylife", "keywords": ["스카이라이프", "skylife"], "exclude": []},
+        {"groupName": "KT", "keywords": ["KT", "케이티", "기가지니", "지니티비"], "exclude": ["SKT", "M 모바일"]},
+        {"groupName": "SKB", "keywords": ["skb", "브로드밴드", "btv", "비티비", "b티비"], "exclude": []},
+        {"groupName": "LGU", "keywords": ["LGU+", "유플러스", "유플"], "exclude": []},
+    ]
+    end = date.today() - timedelta(days=1)
+    date_range = [(end - timedelta(days=i)).isoformat() for i in range(args.days)][::-1]
+    per_day_calls = len(date_range) * sum(len(g["keywords"]) for g in groups) * len(SEARCH_ENDPOINTS)
+
+    cache = None
+    if args.cache:
+        import tempfile
+        from 응답캐시 import ResponseCache
+        cache = ResponseCache(os.path.join(tempfile.mkdtemp(), "bench.sqlite"))
+
+    baseline = None
+    for workers in args.workers:
+        server.calls = 0
+        t0 = time.perf_counter()
+        result = collect_mentions(groups, date_range, ("stub", "stub"), max_workers=workers, base_url=base_url, cache=cache)
+        elapsed = time.perf_counter() - t0
+        baseline = baseline or result
+        same = "OK" if result == baseline else "MISMATCH"
+        print(
+            f"workers={workers:>3}  calls={server.calls} (날짜별 호출 시 {per_day_calls})"
+            f"  {elapsed:6.2f}s  {server.calls / elapsed:8.1f} req/s  순서={same}"
+        )
+    server.shutdown()
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+
+SENTIMENTS = ["positive", "negative"]
+
+
+# ✅ 단어 빈도표(morpheme_word_count_merged) → (단어, 감정) 항목을 빈도 내림차순으로 정렬한 긴 표
+# - melt → 0 초과만 → 빈도 내림차순 정렬, 행 단위 파이썬 루프 없음
+# - 같은 빈도는 원래 행 순서, 같은 행이면 positive 먼저 (기존 sorted() 결과와 동일) → _order 가 그 순서
+def _ranked_word_items(word_df):
+    value_vars = [col for col in SENTIMENTS if col in word_df.columns]
+    long = word_df[["그룹", "단어"] + value_vars].reset_index(drop=True)
+    long = long.assign(_row=np.arange(len(long))).melt(
+        id_vars=["그룹", "단어", "_row"], value_vars=value_vars, var_name="감정", value_name="freq"
+    )
+    long = long[long["freq"] > 0]
+    long = long.assign(
+        그룹=long["그룹"].astype(str),
+        단어=long["단어"].astype(str),
+        _order=long["_row"] * len(value_vars) + long["감정"].map({s: i for i, s in enumerate(value_vars)}),
+    )
+    return long.sort_values(["freq", "_order"], ascending=[False, True], kind="stable")
+
+
+# ✅ 브랜드별 상위 k개 (단어, 감정) 항목
+def rank_word_counts(word_df, k=10):
+    top = _ranked_word_items(word_df).groupby("그룹", sort=True).head(k)
+    top = top.sort_values("그룹", kind="stable").drop(columns=["_row", "_order"]).reset_index(drop=True)
+    top["node_id"] = top["단어"] + "_" + top["감정"]
+    return top
+
+
+# ✅ 브랜드·감정별 상위 limit 개 (정렬 순서와 _order 유지)
+# - 브랜드별 상위 k개(k ≤ limit)는 두 감정 목록을 (빈도 내림차순, _order) 로 병합해 앞에서 k개 → rank_word_counts 와 같음
+def rank_word_counts_by_sentiment(word_df, limit):
+    ranked = _ranked_word_items(word_df).groupby(["그룹", "감정"], sort=False).head(limit)
+    return ranked.drop(columns=["_row"]).reset_index(drop=True)
+
+
+# ✅ 형태소 행 → 브랜드·감정별 상위 k개 단어 (문장ID 개수 기준)
+def rank_morph_counts(morph_df, k=10):
+    counts = (
+        morph_df.groupby(["그룹", "단어", "감정"], observed=True)["문장ID"]
+        .count()
+        .reset_index(name="count")
+    )
+    counts = counts.assign(그룹=counts["그룹"].astype(str), 단어=counts["단어"].astype(str), 감정=counts["감정"].astype(str))
+    # 같은 개수는 (그룹, 단어, 감정) 사전순 — 단어 범주 순서(전역 사전 등록 순)와 무관하게 고정
+    counts = counts.sort_values(["count", "그룹", "단어", "감정"], ascending=[False, True, True, True], kind="stable")
+    return counts.groupby(["그룹", "감정"], sort=False).head(k).reset_index(drop=True)
+
+
+# ✅ 상위 항목 → D3 네트워크용 노드·링크 표
+# - 노드: 브랜드 노드 뒤에 그 브랜드에서 처음 나온 단어 노드 (여러 브랜드에 걸친 단어는 한 번만)
+# - 링크: 브랜드 → 단어, link_count 는 그 단어에 연결된 브랜드 수
+def network_tables(top):
+    brands = pd.unique(top["그룹"])
+    brand_rank = {brand: i for i, brand in enumerate(brands)}
+    brand_nodes = pd.DataFrame({"id": brands, "group": "brand", "freq": np.nan, "_brand": range(len(brands)), "_pos": -1})
+    word_nodes = top.assign(_pos=np.arange(len(top))).drop_duplicates("node_id")
+    word_nodes = pd.DataFrame({
+        "id": word_nodes["node_id"],
+        "group": word_nodes["감정"],
+        "freq": word_nodes["freq"],
+        "_brand": word_nodes["그룹"].map(brand_rank),
+        "_pos": word_nodes["_pos"],
+    })
+    nodes = (
+        pd.concat([brand_nodes, word_nodes], ignore_index=True)
+        .sort_values(["_brand", "_pos"], kind="stable")
+        .drop(columns=["_brand", "_pos"])
+        .reset_index(drop=True)
+    )
+    links = pd.DataFrame({"source": top["그룹"], "target": top["node_id"]})
+    links["link_count"] = links.groupby("target")["target"].transform("size")
+    return nodes, links
+
+
+# ✅ 노드 표 → JSON 용 dict 목록 (브랜드 노드에는 freq 없음)
+def node_records(nodes):
+    records = []
+    for node_id, group, freq in zip(nodes["id"], nodes["group"], nodes["freq"]):
+        record = {"id": node_id, "group": group}
+        if not pd.isna(freq):
+            record["freq"] = int(freq)
+        records.append(record)
+    return records
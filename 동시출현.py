@@ -0,0 +1,146 @@
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+# ✅ 단어 동시 출현(co-occurrence) 엔진
+# - 브랜드마다 문장 × 단어(단어_감정) 희소 행렬 X 를 만들고 XᵀX 로 모든 단어 쌍의 동시 출현 문장 수를 한 번에 계산
+# - 쌍 점수는 PMI = log(N · n(a,b) / (n(a) · n(b))) (N: 브랜드 문장 수, n: 단어가 나온 문장 수)
+# - 파이썬 쌍 루프 없이 희소 행렬 곱 → 형태소 수백만 행도 몇 초 안에 계산
+MIN_PAIR_COUNT = 5  # 이보다 적게 함께 나온 쌍은 버림 (빈도가 작으면 PMI 가 크게 튐)
+MAX_PAIRS = 2000  # 브랜드별로 보관할 상위 쌍 수 (PMI 순)
+TOP_EDGES = 10  # 브랜드별로 네트워크에 그릴 단어 ↔ 단어 링크 수
+
+
+def _codes(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy().astype(np.int64), series.cat.categories.astype(str)
+    codes, uniques = pd.factorize(series.astype(str))
+    return codes.astype(np.int64), pd.Index(uniques, dtype=str)
+
+
+# ✅ 형태소 행 → 브랜드별 단어 쌍 표 (그룹, source, target, count, pmi)
+# - source/target 은 네트워크 노드 ID 와 같은 "단어_감정" (source < target 한 방향만)
+# - ranked: 쌍을 만들 단어 순위표 (그룹, 단어, 감정; 앞일수록 상위) — 주면 브랜드마다 그 단어 열만 남기고 곱한 뒤
+#   두 단어 중 낮은 순위(= 두 단어가 모두 그려지는 최소 상위 k)가 높은 쌍부터 keep 개 (같으면 PMI 순)
+#   (PMI 는 드문 단어일수록 커서, PMI 로만 자르면 그래프에 그릴 상위 단어끼리의 쌍이 밀려남)
+def cooccurrence_pairs(morph_df, min_count=MIN_PAIR_COUNT, keep=MAX_PAIRS, ranked=None):
+    columns = ["그룹", "source", "target", "count", "pmi"]
+    required = ["그룹", "단어", "감정", "문장ID"]
+    if morph_df is None or morph_df.empty or not all(col in morph_df.columns for col in required):
+        return pd.DataFrame(columns=columns)
+
+    # 단어 코드(전역 사전) × 감정 코드 → 단어_감정 항목 번호
+    word_codes, words = _codes(morph_df["단어"])
+    sentiment_codes, sentiments = _codes(morph_df["감정"])
+    terms, term_ids = np.unique(word_codes * len(sentiments) + sentiment_codes, return_inverse=True)
+    brand_codes, brands = _codes(morph_df["그룹"])
+    sentence_ids = morph_df["문장ID"].to_numpy()
+    names = words[terms // len(sentiments)] + "_" + sentiments[terms % len(sentiments)]
+    if ranked is not None:
+        ranked = pd.DataFrame({
+            "그룹": ranked["그룹"].astype(str).to_numpy(),
+            "node_id": (ranked["단어"].astype(str) + "_" + ranked["감정"].astype(str)).to_numpy(),
+        })
+        ranks = {
+            brand: pd.Series(np.arange(len(group)), index=group["node_id"].to_numpy())
+            for brand, group in ranked.groupby("그룹", sort=False)
+        }
+
+    frames = []
+    for b, brand in enumerate(brands):
+        mask = brand_codes == b
+        if not mask.any():
+            continue
+        rows, _ = pd.factorize(sentence_ids[mask])
+        x = sparse.csr_matrix(
+            (np.ones(int(mask.sum()), dtype=np.int32), (rows, term_ids[mask])), shape=(rows.max() + 1, len(terms))
+        )
+        x.sum_duplicates()
+        x.data[:] = 1  # 한 문장에 여러 번 나와도 1
+        n_sentences = x.shape[0]
+
+        # 문장 수가 min_count 미만인 단어는 어떤 쌍도 min_count 에 못 미침 → 곱하기 전에 제외 (순위 밖 단어도)
+        doc_freq = np.asarray(x.sum(axis=0)).ravel()
+        usable = doc_freq >= min_count
+        if ranked is not None:
+            rank = ranks.get(str(brand), pd.Series(dtype=np.int64)).reindex(names).to_numpy(dtype=np.float64)  # 순위 밖은 NaN
+            usable &= ~np.isnan(rank)
+        kept = np.flatnonzero(usable)
+        if len(kept) < 2:
+            continue
+        x = x[:, kept]
+        pairs = sparse.triu(x.T @ x, k=1).tocoo()
+        strong = pairs.data >= min_count
+        src, tgt, count = pairs.row[strong], pairs.col[strong], pairs.data[strong].astype(np.int64)
+        if not len(count):
+            continue
+        pmi = np.log(count * n_sentences / (doc_freq[kept][src] * doc_freq[kept][tgt]))
+        if len(pmi) > keep and ranked is not None:
+            priority = np.maximum(rank[kept][src], rank[kept][tgt])
+            top = np.lexsort((-pmi, priority))[:keep]
+            src, tgt, count, pmi = src[top], tgt[top], count[top], pmi[top]
+        elif len(pmi) > keep:
+            top = np.argpartition(-pmi, keep - 1)[:keep]
+            src, tgt, count, pmi = src[top], tgt[top], count[top], pmi[top]
+
+        frames.append(pd.DataFrame({
+            "그룹": str(brand),
+            "source": names[kept][src],
+            "target": names[kept][tgt],
+            "count": count,
+            "pmi": pmi.round(4),
+        }))
+
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    result = pd.concat(frames, ignore_index=True)
+    return result.sort_values(["그룹", "pmi", "count"], ascending=[True, False, False], kind="stable").reset_index(drop=True)
+
+
+# ✅ 네트워크에 그릴 단어 ↔ 단어 링크: 브랜드별로 그 브랜드 상위 단어 노드끼리의 쌍 중 PMI 상위 n개
+# - 같은 쌍이 여러 브랜드에서 나오면 PMI 가 가장 높은 것 하나만
+def cooccurrence_links(pairs, top, n=TOP_EDGES):
+    if pairs.empty or top.empty:
+        return []
+    node_sets = top.groupby("그룹")["node_id"].agg(set)
+    in_brand = [
+        source in node_sets.get(brand, ()) and target in node_sets.get(brand, ())
+        for brand, source, target in zip(pairs["그룹"], pairs["source"], pairs["target"])
+    ]
+    links = pairs[in_brand].groupby("그룹", sort=False).head(n)
+    links = links.sort_values("pmi", ascending=False, kind="stable").drop_duplicates(["source", "target"])
+    return [
+        {"source": source, "target": target, "kind": "cooccur", "count": int(count), "pmi": float(pmi)}
+        for source, target, count, pmi in zip(links["source"], links["target"], links["count"], links["pmi"])
+    ]
+
+
+def _bench_morph(n_rows, n_words=20000, n_sentences=None, brands=4, seed=0):
+    rng = np.random.default_rng(seed)
+    n_sentences = n_sentences or n_rows // 8
+    words = pd.Index([f"단어{i}" for i in range(n_words)], dtype=str)
+    # 단어 빈도는 지프 분포 (소수 단어가 대부분의 행을 차지)
+    word_codes = np.minimum(rng.zipf(1.3, n_rows) - 1, n_words - 1)
+    return pd.DataFrame({
+        "그룹": pd.Categorical.from_codes(rng.integers(brands, size=n_rows), pd.Index(["KT", "KT Skylife", "LGU+", "SKB"][:brands], dtype=str)),
+        "단어": pd.Categorical.from_codes(word_codes, words),
+        "감정": pd.Categorical.from_codes(rng.integers(2, size=n_rows), pd.Index(["negative", "positive"], dtype=str)),
+        "문장ID": rng.integers(n_sentences, size=n_rows).astype(np.int32),
+    })
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="동시 출현 계산 시간 측정 (합성 형태소 행)")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 3_000_000])
+    args = parser.parse_args()
+
+    for n_rows in args.rows:
+        morph_df = _bench_morph(n_rows)
+        t0 = time.perf_counter()
+        pairs = cooccurrence_pairs(morph_df)
+        print(f"형태소 {n_rows:,}행 → 쌍 {len(pairs):,}개 · {time.perf_counter() - t0:.2f}초")
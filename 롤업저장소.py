@@ -0,0 +1,283 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from 주차데이터 import WEEKS, load_week
+from 주차산출물 import input_signature
+
+
+# ✅ 일·주·월 단위 시계열 롤업 저장소 (SQLite, 추가 전용)
+# - source="week": 공개된 주차 데이터 (문장 고유 링크 수 = 언급량, 형태소 긍·부정 수)
+# - source="live": 검색트렌드 탭에서 수집한 일별 언급량 (mention_data)
+# - 새 주차·새 수집분이 들어오면 닿는 날짜의 일·주·월 행만 다시 계산 → 장기 추이는 롤업 표만 읽음
+# - 주·월 고유 링크 수: exact(링크 해시 보관, COUNT DISTINCT) 또는 hll(HyperLogLog 레지스터만 보관 → 추정치)
+#   일 단위는 두 방식 모두 정확한 일별 고유 링크 수 (주차끼리 날짜가 겹치지 않으므로 주차별 일별 값의 합)
+ROLLUP_PATH = os.environ.get(
+    "ROLLUP_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "rollups.sqlite"),
+)
+DISTINCT_MODE = os.environ.get("ROLLUP_DISTINCT", "exact")  # exact | hll
+HLL_P = 12  # 레지스터 2^12 = 4096개 (표준오차 약 1.6%)
+GRAINS = ["day", "week", "month"]
+
+
+def period_of(day, grain):
+    d = date.fromisoformat(str(day)[:10])
+    if grain == "week":
+        return (d - timedelta(days=d.weekday())).isoformat()  # 월요일 시작
+    if grain == "month":
+        return d.strftime("%Y-%m")
+    return d.isoformat()
+
+
+def period_days(period, grain):
+    if grain == "week":
+        start = date.fromisoformat(period)
+        return start.isoformat(), (start + timedelta(days=6)).isoformat()
+    if grain == "month":
+        start = date.fromisoformat(f"{period}-01")
+        end = (start.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        return start.isoformat(), end.isoformat()
+    return period, period
+
+
+# ✅ 링크 → 64비트 해시 (SQLite 정수 범위에 맞춰 부호 있는 int64)
+def link_hashes(links):
+    digests = b"".join(hashlib.blake2b(str(link).encode("utf-8"), digest_size=8).digest() for link in links)
+    return np.frombuffer(digests, dtype=">u8").astype(np.uint64).view(np.int64)
+
+
+# ✅ HyperLogLog: 해시 → 레지스터 (상위 p 비트 = 레지스터 번호, 나머지 비트의 선행 0 개수 + 1)
+def hll_registers(hashes, p=HLL_P):
+    registers = np.zeros(1 << p, dtype=np.uint8)
+    if len(hashes):
+        h = np.asarray(hashes).view(np.uint64)
+        index = (h >> np.uint64(64 - p)).astype(np.int64)
+        rest = (h & np.uint64((1 << (64 - p)) - 1)).astype(np.float64)  # 52비트 → float64 로 정확히 표현
+        bit_length = np.where(rest > 0, np.frexp(rest)[1], 0)
+        np.maximum.at(registers, index, (64 - p - bit_length + 1).astype(np.uint8))
+    return registers
+
+
+def hll_estimate(registers):
+    m = len(registers)
+    estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.sum(np.exp2(-registers.astype(np.float64)))
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * np.log(m / zeros)  # 작은 값 보정 (linear counting)
+    return int(round(estimate))
+
+
+class RollupStore:
+    def __init__(self, path=ROLLUP_PATH, distinct=DISTINCT_MODE):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.distinct = distinct
+        self._lock = threading.Lock()
+        self._folded = {}  # 주차 → 반영을 확인한 입력 서명 (탭 재실행마다 SQLite 를 다시 조회하지 않음)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS folded ("
+            " source TEXT, key TEXT, signature TEXT, days TEXT, folded_at REAL, PRIMARY KEY (source, key));"
+            "CREATE TABLE IF NOT EXISTS daily ("
+            " source TEXT, key TEXT, day TEXT, brand TEXT, mentions INTEGER, positive INTEGER, negative INTEGER,"
+            " PRIMARY KEY (source, key, day, brand));"
+            "CREATE TABLE IF NOT EXISTS links ("
+            " source TEXT, key TEXT, brand TEXT, day TEXT, link_hash INTEGER, PRIMARY KEY (source, key, brand, day, link_hash));"
+            "CREATE TABLE IF NOT EXISTS hll ("
+            " source TEXT, grain TEXT, period TEXT, brand TEXT, registers BLOB, PRIMARY KEY (source, grain, period, brand));"
+            "CREATE TABLE IF NOT EXISTS rollup ("
+            " source TEXT, grain TEXT, period TEXT, brand TEXT, mentions INTEGER, positive INTEGER, negative INTEGER,"
+            " PRIMARY KEY (source, grain, period, brand));"
+        )
+        self._conn.commit()
+
+    def folded_signature(self, source, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT signature FROM folded WHERE source = ? AND key = ?", (source, key)
+            ).fetchone()
+        return row[0] if row else None
+
+    # ✅ 주차 1개 반영 (입력 서명이 같으면 건너뜀, 바뀌었으면 그 주차 행만 교체)
+    # - 행은 주차(key)별로 보관 → 주차끼리 날짜가 겹쳐도 합계·고유 링크 수가 맞음
+    def fold_week(self, week, loader=load_week):
+        signature = input_signature(week)
+        with self._lock:
+            if self._folded.get(week) == signature:
+                return False
+        if self.folded_signature("week", week) == signature:
+            with self._lock:
+                self._folded[week] = signature
+            return False
+        entry = loader(week)
+        sent_df, morph_df = entry["sent"], entry["morph"]
+
+        daily = pd.DataFrame(columns=["day", "brand", "mentions", "positive", "negative"])
+        links = pd.DataFrame(columns=["brand", "day", "link"])
+        if all(col in sent_df.columns for col in ["날짜", "그룹", "원본링크"]):
+            links = pd.DataFrame({
+                "brand": sent_df["그룹"].astype(str),
+                "day": sent_df["날짜"].astype(str).str[:10],
+                "link": sent_df["원본링크"].astype(str),
+            }).drop_duplicates()
+            daily = links.groupby(["day", "brand"]).size().reset_index(name="mentions")
+        if all(col in morph_df.columns for col in ["날짜", "그룹", "감정"]):
+            sentiment = (
+                pd.DataFrame({
+                    "day": morph_df["날짜"].astype(str).str[:10],
+                    "brand": morph_df["그룹"].astype(str),
+                    "감정": morph_df["감정"].astype(str),
+                })
+                .groupby(["day", "brand", "감정"]).size().unstack("감정", fill_value=0)
+                .reindex(columns=["positive", "negative"], fill_value=0)
+                .reset_index()
+            )
+            daily = daily.drop(columns=["positive", "negative"], errors="ignore").merge(sentiment, on=["day", "brand"], how="outer")
+        daily = daily.fillna(0)
+
+        with self._lock:
+            row = self._conn.execute("SELECT days FROM folded WHERE source = 'week' AND key = ?", (week,)).fetchone()
+            old_days = json.loads(row[0]) if row else []
+            days = sorted(set(daily["day"]) | set(old_days))
+            self._conn.execute("DELETE FROM daily WHERE source = 'week' AND key = ?", (week,))
+            self._conn.execute("DELETE FROM links WHERE source = 'week' AND key = ?", (week,))
+            self._conn.executemany(
+                "INSERT INTO daily VALUES ('week', ?, ?, ?, ?, ?, ?)",
+                [(week, *row) for row in daily[["day", "brand", "mentions", "positive", "negative"]]
+                 .astype({"mentions": int, "positive": int, "negative": int}).itertuples(index=False)],
+            )
+            hashes = link_hashes(links["link"])
+            if self.distinct == "exact":
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO links VALUES ('week', ?, ?, ?, ?)",
+                    [(week, brand, day, h) for brand, day, h in zip(links["brand"], links["day"], hashes.tolist())],
+                )
+            else:
+                # HLL 은 빼기가 안 되므로 합집합으로만 누적 (입력이 바뀐 주차는 저장소를 지우고 다시 쌓아야 정확)
+                self._merge_hll("week", links.assign(hash=hashes))
+            self._refresh("week", days)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO folded VALUES ('week', ?, ?, ?, ?)",
+                (week, signature, json.dumps(sorted(set(daily["day"]))), time.time()),
+            )
+            self._conn.commit()
+            self._folded[week] = signature
+        return True
+
+    def fold_weeks(self, weeks=None):
+        return [week for week in (weeks or list(WEEKS.values())) if self.fold_week(week)]
+
+    # ✅ 검색트렌드 탭 수집분 반영 (일별 값은 최신 수집으로 교체, 수집 실패한 날짜는 제외)
+    def fold_live(self, mention_data):
+        failed = set(mention_data.get("failed", []))
+        rows = [
+            (day, ds["label"], int(value))
+            for ds in mention_data.get("datasets", [])
+            for day, value in zip(mention_data.get("labels", []), ds["data"])
+            if day not in failed
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO daily VALUES ('live', 'live', ?, ?, ?, 0, 0)", rows)
+            self._refresh("live", sorted({day for day, _, _ in rows}))
+            self._conn.commit()
+        return len(rows)
+
+    def _merge_hll(self, source, links):
+        for grain in GRAINS[1:]:  # 일 단위는 일별 합계(정확한 값)를 씀
+            periods = links["day"].map(lambda d: period_of(d, grain))
+            for (period, brand), group in links.groupby([periods, "brand"]):
+                row = self._conn.execute(
+                    "SELECT registers FROM hll WHERE source = ? AND grain = ? AND period = ? AND brand = ?",
+                    (source, grain, period, brand),
+                ).fetchone()
+                registers = hll_registers(group["hash"].to_numpy())
+                if row:
+                    registers = np.maximum(registers, np.frombuffer(row[0], dtype=np.uint8))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO hll VALUES (?, ?, ?, ?, ?)", (source, grain, period, brand, registers.tobytes())
+                )
+
+    # ✅ 닿은 날짜가 속한 일·주·월 롤업 행만 다시 계산
+    def _refresh(self, source, days):
+        for grain in GRAINS:
+            for period in sorted({period_of(d, grain) for d in days}):
+                start, end = period_days(period, grain)
+                self._conn.execute(
+                    "DELETE FROM rollup WHERE source = ? AND grain = ? AND period = ?", (source, grain, period)
+                )
+                sums = self._conn.execute(
+                    "SELECT brand, SUM(mentions), SUM(positive), SUM(negative) FROM daily"
+                    " WHERE source = ? AND day BETWEEN ? AND ? GROUP BY brand",
+                    (source, start, end),
+                ).fetchall()
+                distinct = self._distinct(source, grain, period, start, end)
+                self._conn.executemany(
+                    "INSERT INTO rollup VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(source, grain, period, brand, distinct.get(brand, mentions), pos, neg) for brand, mentions, pos, neg in sums],
+                )
+
+    # 기간별 고유 링크 수 (링크를 보관하지 않는 source·hll 의 일 단위는 일별 합계 사용)
+    def _distinct(self, source, grain, period, start, end):
+        if self.distinct == "hll" and grain == "day":
+            return {}
+        if self.distinct == "exact":
+            return dict(self._conn.execute(
+                "SELECT brand, COUNT(DISTINCT link_hash) FROM links WHERE source = ? AND day BETWEEN ? AND ? GROUP BY brand",
+                (source, start, end),
+            ).fetchall())
+        return {
+            brand: hll_estimate(np.frombuffer(registers, dtype=np.uint8))
+            for brand, registers in self._conn.execute(
+                "SELECT brand, registers FROM hll WHERE source = ? AND grain = ? AND period = ?", (source, grain, period)
+            ).fetchall()
+        }
+
+    # ✅ 장기 추이 조회: 롤업 표만 읽음 (원본 행 수와 무관)
+    def series(self, source, grain):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT period, brand, mentions, positive, negative FROM rollup"
+                " WHERE source = ? AND grain = ? ORDER BY period, brand",
+                (source, grain),
+            ).fetchall()
+        df = pd.DataFrame(rows, columns=["기간", "그룹", "언급량", "positive", "negative"])
+        total = df["positive"] + df["negative"]
+        df["긍정비율"] = (df["positive"] / total.where(total > 0) * 100).round(1)
+        return df
+
+
+_store_lock = threading.Lock()
+_store = None
+
+
+# ✅ 프로세스 전역 롤업 저장소 (Streamlit 세션끼리 공유)
+def get_rollups():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = RollupStore()
+        return _store
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="공개된 주차 데이터를 롤업 저장소에 반영")
+    parser.add_argument("weeks", nargs="*", help="예: 2025_03w1 (기본: 전체 주차)")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    folded = get_rollups().fold_weeks(args.weeks or None)
+    print(f"반영한 주차: {folded or '없음(변경 없음)'} · {time.perf_counter() - t0:.1f}초 · 고유 링크: {DISTINCT_MODE}")
+    for grain in GRAINS:
+        print(f"{grain}: {len(get_rollups().series('week', grain))}행")
@@ -0,0 +1,371 @@
+import os
+import time
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from 주차데이터 import WEEKS, load_week, week_artifact
+from 주차산출물 import ARTIFACT_DIR, SENTIMENT_FILTERS, artifact_path, input_signature
+from 문장스니펫 import highlight_snippets
+
+
+# ✅ 주차 문장 전문 검색 (형태소 분석기 없이 글자 2-gram 역색인)
+# - 문장을 소문자로 바꿔 글자마다 (그 글자, 다음 글자) 2-gram 의 문장 행 위치 목록(posting)과 문장 안 등장 횟수를 만듦
+#   (다음 글자가 공백·문장 끝이면 (그 글자, 0) → 모든 글자가 정확히 한 번씩 2-gram 의 앞 글자로 들어감)
+#   → 키(2-gram 코드) 정렬 배열 + 오프셋 + uint32 행 위치 + uint8 횟수 배열 (CSR 형태, 파이썬 객체 없음)
+# - 검색어는 띄어쓰기로 나눈 단어 모두 포함(AND): 2-gram 목록을 짧은 것부터 교집합
+#   · 한 글자 단어: 앞 글자가 그 글자인 키 구간(연속)의 합 / 두 글자 단어: 2-gram 목록 하나 → 색인만으로 정확 (문장을 읽지 않음)
+#   · 세 글자 이상: 교집합은 후보 → 후보 문장만 실제 부분 문자열로 확인
+# - 브랜드·감정·날짜 필터는 문장별 정수 배열로 후보에 바로 적용, 순위는 BM25 (단어 등장 횟수 · 문장 길이)
+# - 색인은 주차 폴더(artifacts/)에 입력 서명과 함께 저장 → 입력이 바뀌면 다시 만듦
+#   (행 위치는 간격(delta)으로 바꿔 압축 저장)
+SEARCH_INDEX = "search_index.npz"
+SEARCH_LIMIT = int(os.environ.get("SEARCH_LIMIT", "50"))  # 돌려줄 상위 문장 수
+BUILD_ROWS = 262_144  # 색인 생성을 나눠 할 문장 수 (2-gram × 문장 쌍 배열의 메모리 제한)
+BM25_K1, BM25_B = 1.2, 0.75
+SENTIMENT_FLAGS = {"positive": 1, "negative": 2}
+
+_CHAR_BITS = 21  # 유니코드 코드 포인트 비트 수 → 2-gram 코드 = 앞 글자 << 21 | 뒤 글자
+_CHAR_MASK = (1 << _CHAR_BITS) - 1
+_ROW_BITS = 64 - 2 * _CHAR_BITS  # 생성 중 (2-gram, 행) 을 uint64 하나로 묶을 때 행 비트 수 (BUILD_ROWS 이하)
+_BLANKS = np.array([0, 9, 10, 11, 12, 13, 32, 0xA0, 0x3000], dtype=np.uint32)  # 0: 문장 구분자
+
+_lock = threading.Lock()
+_indexes = {}  # (week, 서명) → 색인
+
+
+def _lower_texts(sent_df):
+    texts = pa.array(sent_df["문장"].astype(str), type=pa.large_string(), from_pandas=True)
+    texts = texts.combine_chunks() if isinstance(texts, pa.ChunkedArray) else texts
+    return pc.replace_substring(pc.utf8_lower(texts), "\0", " ")  # \0 은 색인 생성 때 문장 구분자
+
+
+def _bigram_codes(text):
+    chars = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    first, second = chars[:-1].astype(np.uint64), chars[1:].astype(np.uint64)
+    return np.unique((first << np.uint64(_CHAR_BITS)) | second)
+
+
+# 문장 묶음 → 정렬된 (2-gram 코드, 행 위치, 문장 안 등장 횟수)
+def _bigram_rows(texts, first_row):
+    chars = np.frombuffer(("\0".join(texts) + "\0").encode("utf-32-le"), dtype=np.uint32)
+    rows = np.cumsum(chars == 0, dtype=np.uint64)
+    blank = np.isin(chars, _BLANKS)
+    valid = ~blank[:-1]
+    following = np.where(blank[1:], 0, chars[1:])[valid].astype(np.uint64)
+    codes = (chars[:-1][valid].astype(np.uint64) << np.uint64(_CHAR_BITS)) | following
+    pairs, counts = np.unique((codes << np.uint64(_ROW_BITS)) | rows[:-1][valid], return_counts=True)
+    rows = (pairs & np.uint64((1 << _ROW_BITS) - 1)).astype(np.uint32) + np.uint32(first_row)
+    return pairs >> np.uint64(_ROW_BITS), rows, np.minimum(counts, 255).astype(np.uint8)
+
+
+# 문장별 감정 표시: 그 문장에 긍정/부정 형태소가 하나라도 있으면 비트 1/2
+def _sentence_flags(morph_df, sent_df):
+    flags = pd.DataFrame({
+        "그룹": morph_df["그룹"].astype(str).to_numpy(),
+        "문장ID": morph_df["문장ID"].to_numpy(),
+        "flag": morph_df["감정"].astype(str).map(SENTIMENT_FLAGS).fillna(0).astype(np.uint8).to_numpy(),
+    }).drop_duplicates().groupby(["그룹", "문장ID"])["flag"].sum()
+    keys = pd.DataFrame({"그룹": sent_df["그룹"].astype(str).to_numpy(), "문장ID": sent_df["문장ID"].to_numpy()})
+    joined = keys.merge(flags.reset_index(), on=["그룹", "문장ID"], how="left")
+    return joined["flag"].fillna(0).astype(np.uint8).to_numpy()
+
+
+def _days(dates):
+    days = pd.to_datetime(pd.Series(dates).astype(str), errors="coerce").to_numpy().astype("datetime64[D]")
+    return np.where(np.isnat(days), -1, days.astype(np.int64)).astype(np.int32)
+
+
+# ✅ 주차 1개 검색 색인 (문장 행 순서 = load_week 의 sent_df 순서)
+def build_search_index(entry):
+    sent_df = entry["sent"]
+    texts = _lower_texts(sent_df)
+    lowered = texts.to_pylist()
+    chunks = [_bigram_rows(lowered[start:start + BUILD_ROWS], start) for start in range(0, len(lowered), BUILD_ROWS)]
+    codes, rows, counts = [np.concatenate(parts) for parts in zip(*chunks)] if chunks else (
+        np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.uint8)
+    )
+    # 묶음마다 행 위치가 커지므로 안정 정렬이면 2-gram 별 행 위치도 오름차순
+    order = np.argsort(codes, kind="stable")
+    codes, postings, counts = codes[order], rows[order], counts[order]
+    keys, starts = np.unique(codes, return_index=True)
+
+    brands = sent_df["그룹"].astype(str).astype("category")
+    return {
+        "rows": len(sent_df),
+        "keys": keys,
+        "offsets": np.append(starts, len(postings)).astype(np.int64),
+        "postings": postings,
+        "counts": counts,
+        "brands": list(brands.cat.categories),
+        "brand_codes": brands.cat.codes.to_numpy().astype(np.int16),
+        "days": _days(sent_df["날짜"]) if "날짜" in sent_df.columns else np.full(len(sent_df), -1, dtype=np.int32),
+        "flags": _sentence_flags(entry["morph"], sent_df),
+        "lengths": np.asarray(pc.utf8_length(texts), dtype=np.int32),
+    }
+
+
+def index_bytes(index):
+    return sum(value.nbytes for value in index.values() if isinstance(value, np.ndarray))
+
+
+def write_search_index(path, index, signature):
+    postings = index["postings"].astype(np.int64)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(
+        tmp,
+        signature=np.array(signature),
+        rows=np.array(index["rows"]),
+        keys=index["keys"],
+        offsets=index["offsets"],
+        gaps=np.diff(postings, prepend=0).astype(np.int32),  # 목록 안에서는 작은 양수 → 압축이 잘 됨
+        counts=index["counts"],
+        brands=np.array(index["brands"], dtype=str),
+        brand_codes=index["brand_codes"],
+        days=index["days"],
+        flags=index["flags"],
+        lengths=index["lengths"],
+    )
+    os.replace(tmp, path)
+
+
+def read_search_index(path, signature):
+    with np.load(path) as data:
+        if str(data["signature"]) != signature:
+            return None
+        index = {name: data[name] for name in data.files if name not in ("signature", "gaps")}
+        index["postings"] = np.cumsum(data["gaps"], dtype=np.int64).astype(np.uint32)
+    index["rows"] = int(index["rows"])
+    index["brands"] = [str(brand) for brand in index["brands"]]
+    return index
+
+
+# ✅ 주차 검색 색인: 메모 → 주차 폴더 파일 → (없거나 입력이 바뀌었으면) 생성 후 저장
+def search_index(week):
+    signature = input_signature(week)
+    key = (week, signature)
+    with _lock:
+        cached = _indexes.get(key)
+    if cached is not None:
+        return cached
+
+    path = artifact_path(week, SEARCH_INDEX)
+    index = read_search_index(path, signature) if os.path.exists(path) else None
+    if index is None:
+        index = build_search_index(load_week(week))
+        write_search_index(path, index, signature)
+    with _lock:
+        for old in [k for k in _indexes if k[0] == week]:
+            del _indexes[old]
+        _indexes[key] = index
+    return index
+
+
+_EMPTY = np.zeros(0, dtype=np.uint32)
+
+
+# 검색 단어 1개 → (반드시 포함해야 하는 행 위치 목록들, 등장 횟수)
+# - 한두 글자 단어는 색인만으로 정확: 등장 횟수 = (행 위치 목록, 행별 횟수) / 세 글자 이상은 None (후보 문장에서 직접 셈)
+def _term_postings(index, term):
+    keys, offsets = index["keys"], index["offsets"]
+    if len(term) == 1:
+        # 앞 글자가 term 인 키는 정렬 배열에서 연속 구간 → 행 위치도 연속 구간
+        first = np.uint64(ord(term)) << np.uint64(_CHAR_BITS)
+        lo, hi = np.searchsorted(keys, [first, first + np.uint64(1 << _CHAR_BITS)])
+        span = slice(offsets[lo], offsets[hi])
+        totals = np.bincount(index["postings"][span], weights=index["counts"][span], minlength=index["rows"])
+        posting = np.flatnonzero(totals).astype(np.uint32)
+        return [posting], (posting, totals[posting])
+
+    codes = _bigram_codes(term)
+    found = np.searchsorted(keys, codes)
+    lists = []
+    for code, i in zip(codes, found):
+        if i >= len(keys) or keys[i] != code:
+            return [_EMPTY], (_EMPTY, np.zeros(0))
+        lists.append(index["postings"][offsets[i]:offsets[i + 1]])
+    if len(term) == 2:
+        return lists, (lists[0], index["counts"][offsets[found[0]]:offsets[found[0] + 1]])
+    return lists, None
+
+
+def _intersect(lists, rows):
+    lists = sorted(lists, key=len)
+    candidates = lists[0]
+    for posting in lists[1:]:
+        if not len(candidates):
+            break
+        mask = np.zeros(rows, dtype=bool)
+        mask[posting] = True
+        candidates = candidates[mask[candidates]]
+    return candidates
+
+
+def _day_number(value):
+    return int(np.datetime64(pd.Timestamp(value).date(), "D").astype(np.int64))
+
+
+# ✅ 색인 1개 검색: (행 위치, 점수) — texts: 색인과 같은 순서의 소문자 문장 열
+# - brands: 브랜드 목록 (None 이면 전체), sentiments: ("positive", "negative") 중 일부, dates: (시작일, 종료일)
+def search_index_rows(index, texts, terms, brands=None, sentiments=None, dates=None):
+    rows = index["rows"]
+    term_lists = [_term_postings(index, term) for term in terms]
+    lists = [posting for posting_lists, _ in term_lists for posting in posting_lists]
+    candidates = _intersect(lists, rows).astype(np.int64) if lists else np.zeros(0, dtype=np.int64)
+
+    if brands is not None and len(candidates):
+        brands = set(brands)
+        codes = [i for i, brand in enumerate(index["brands"]) if brand in brands]
+        candidates = candidates[np.isin(index["brand_codes"][candidates], codes)]
+    if sentiments is not None and set(sentiments) != set(SENTIMENT_FLAGS) and len(candidates):
+        bits = sum(SENTIMENT_FLAGS[sentiment] for sentiment in sentiments)
+        candidates = candidates[(index["flags"][candidates] & bits) != 0]
+    if dates and len(candidates):
+        days = index["days"][candidates]
+        candidates = candidates[(days >= _day_number(dates[0])) & (days <= _day_number(dates[-1]))]
+    if not len(candidates):
+        return candidates, np.zeros(0)
+
+    # 단어별 등장 횟수: 한두 글자는 색인의 횟수, 세 글자 이상은 후보 문장에서 직접 세고 없으면 제외
+    matched = None
+    lengths = index["lengths"][candidates]
+    average = max(1.0, float(index["lengths"].mean()))
+    scores = np.zeros(len(candidates))
+    for term, (posting_lists, exact) in sorted(zip(terms, term_lists), key=lambda item: item[1][1] is None):
+        if exact is not None:
+            by_row = np.zeros(rows, dtype=np.float64)
+            by_row[exact[0]] = exact[1]
+            counts = by_row[candidates]
+        else:
+            matched = texts.take(candidates) if matched is None else matched
+            counts = np.asarray(pc.count_substring(matched, term), dtype=np.float64)
+        df = min(len(posting) for posting in posting_lists)  # 2-gram 목록 중 가장 짧은 길이 ≈ 문서 빈도 상한
+        idf = np.log(1 + (rows - df + 0.5) / (df + 0.5))
+        scores += idf * counts * (BM25_K1 + 1) / (counts + BM25_K1 * (1 - BM25_B + BM25_B * lengths / average))
+        keep = counts > 0
+        if not keep.all():
+            candidates, scores, lengths = candidates[keep], scores[keep], lengths[keep]
+            matched = matched.filter(pa.array(keep)) if matched is not None else None
+    return candidates, scores
+
+
+# 점수 상위 limit 개 위치 (점수 내림차순)
+def top_positions(scores, limit=SEARCH_LIMIT):
+    if len(scores) > limit:
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        return top[np.lexsort((top, -scores[top]))]
+    return np.argsort(-scores, kind="stable")
+
+
+def search_week(week, terms, brands=None, sentiments=None, dates=None):
+    index = search_index(week)
+    texts = week_artifact(week, "search_texts", lambda e: _lower_texts(e["sent"]))
+    return search_index_rows(index, texts, terms, brands, sentiments, dates)
+
+
+def query_terms(query):
+    terms = list(dict.fromkeys(str(query).lower().split()))
+    return sorted(terms, key=len, reverse=True)
+
+
+# ✅ 여러 주차 검색 → 점수 상위 limit 문장 (스니펫 강조 포함), 전체 일치 수
+def search_sentences(weeks, query, brands=None, sentiment="전체", dates=None, limit=SEARCH_LIMIT):
+    columns = ["주차", "그룹", "날짜", "문장", "원본링크", "점수"]
+    terms = query_terms(query)
+    if not terms:
+        return pd.DataFrame(columns=columns), 0
+
+    labels = {week: label for label, week in WEEKS.items()}
+    frames, total = [], 0
+    for week in weeks:
+        rows, scores = search_week(week, terms, brands, SENTIMENT_FILTERS.get(sentiment), dates)
+        total += len(rows)
+        if not len(rows):
+            continue
+        top = top_positions(scores, limit)
+        sent_df = load_week(week)["sent"].iloc[rows[top]]
+        frames.append(pd.DataFrame({
+            "주차": labels.get(week, week),
+            "그룹": sent_df["그룹"].astype(str).to_numpy(),
+            "날짜": sent_df["날짜"].astype(str).to_numpy() if "날짜" in sent_df.columns else "",
+            "문장": sent_df["문장"].astype(str).to_numpy(),
+            "원본링크": sent_df["원본링크"].to_numpy() if "원본링크" in sent_df.columns else "",
+            "점수": scores[top],
+        }))
+    if not frames:
+        return pd.DataFrame(columns=columns), total
+
+    result = pd.concat(frames, ignore_index=True).sort_values("점수", ascending=False, kind="stable").head(limit)
+    keywords = [_keyword(text, terms) for text in result["문장"]]
+    result = result.assign(문장=highlight_snippets(result["문장"], keywords), 점수=result["점수"].round(4))
+    return result.reset_index(drop=True), total
+
+
+# 스니펫에서 강조할 단어: 긴 검색어부터, 소문자로 찾은 위치의 원문 글자 그대로 (대소문자 보존)
+def _keyword(text, terms):
+    lowered = text.lower()
+    for term in terms:
+        hit = lowered.find(term)
+        if hit >= 0:
+            return text[hit:hit + len(term)]
+    return ""
+
+
+def _bench_sentences(n_rows, n_words=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    syllables = np.array(list("가나다라마바사아자차카타파하고객센터문의요금인터넷속도설치기사친절불만해지약정"))
+    common = ["고객", "센터", "문의", "요금제", "인터넷", "속도", "설치", "기사", "친절", "불만"]  # 빈도 상위 단어
+    words = common + ["".join(rng.choice(syllables, size=rng.integers(2, 5))) for _ in range(n_words - len(common))]
+    word_codes = np.minimum(rng.zipf(1.3, n_rows * 12) - 1, n_words - 1).reshape(n_rows, 12)
+    texts = [" ".join(words[code] for code in row) for row in word_codes]
+    brands = pd.Index(["KT", "KT Skylife", "LGU+", "SKB"], dtype=str)
+    sent_df = pd.DataFrame({
+        "문장ID": np.arange(n_rows),
+        "그룹": pd.Categorical.from_codes(rng.integers(4, size=n_rows), brands),
+        "문장": texts,
+        "날짜": pd.Categorical.from_codes(rng.integers(7, size=n_rows), pd.Index([f"2025-03-0{d}" for d in range(1, 8)], dtype=str)),
+    })
+    morph_df = pd.DataFrame({
+        "그룹": sent_df["그룹"],
+        "문장ID": sent_df["문장ID"],
+        "감정": pd.Categorical.from_codes(rng.integers(2, size=n_rows), pd.Index(["negative", "positive"], dtype=str)),
+    })
+    return {"sent": sent_df, "morph": morph_df}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="주차 문장 검색 색인 생성 · 검색 · 시간 측정")
+    parser.add_argument("weeks", nargs="*", default=list(WEEKS.values()))
+    parser.add_argument("--query", help="색인 생성 후 검색해 볼 검색어")
+    parser.add_argument("--bench", type=int, nargs="*", help="합성 문장 수 (예: 1000000) — 색인 생성·검색 시간 측정")
+    args = parser.parse_args()
+
+    if args.bench:
+        for n_rows in args.bench:
+            entry = _bench_sentences(n_rows)
+            t0 = time.perf_counter()
+            index = build_search_index(entry)
+            print(f"문장 {n_rows:,}행 → 색인 {time.perf_counter() - t0:.1f}초 · 2-gram {len(index['keys']):,}개 · {index_bytes(index) / 1024 ** 2:,.0f} MB")
+            texts = _lower_texts(entry["sent"])
+            for query in ["고객", "센터 문의", "요금제 불만", "속", "설치 기사 친절", "터넷속"]:
+                t0 = time.perf_counter()
+                rows, scores = search_index_rows(index, texts, query_terms(query), brands=["KT", "SKB"], sentiments=("positive",))
+                top = rows[top_positions(scores)]
+                print(f"  '{query}': {len(rows):,}건 · {(time.perf_counter() - t0) * 1000:.0f}ms")
+    else:
+        for week in args.weeks:
+            t0 = time.perf_counter()
+            index = search_index(week)
+            path = artifact_path(week, SEARCH_INDEX)
+            print(f"{week}/{ARTIFACT_DIR}/{SEARCH_INDEX}: {os.path.getsize(path) / 1024:,.0f} KB (메모리 {index_bytes(index) / 1024 ** 2:,.1f} MB) · {time.perf_counter() - t0:.1f}초")
+        if args.query:
+            t0 = time.perf_counter()
+            result, total = search_sentences(args.weeks, args.query)
+            print(f"'{args.query}': {total:,}건 · {(time.perf_counter() - t0) * 1000:.0f}ms")
+            print(result[["주차", "그룹", "날짜", "점수"]].head(10).to_string(index=False))
@@ -0,0 +1,124 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+# ✅ 문장 스니펫 일괄 생성 (문장 열 전체를 한 번에, 문장마다 파이썬 루프 없음)
+# - 키워드 위치: Arrow 부분 문자열 검색 (바이트 위치)
+# - ±SNIPPET_WINDOW 글자 창: UTF-8 바이트 배열에서 글자 시작 바이트를 세어 창 경계를 NumPy 로 한 번에 계산 → 바이트 구간을 모아 새 Arrow 열 생성
+# - 말줄임표·강조 표시: Arrow 문자열 연산
+# - 창 크기는 환경 변수로 조정, 값은 사전 계산 manifest 에 기록 → 바뀌면 산출물 다시 계산
+SNIPPET_WINDOW = int(os.environ.get("SNIPPET_WINDOW", "15"))  # 키워드 앞뒤로 남길 글자 수
+SNIPPET_FALLBACK = int(os.environ.get("SNIPPET_FALLBACK", "50"))  # 키워드가 없을 때 앞에서 자를 길이
+SENTENCE_LIMIT = int(os.environ.get("SENTENCE_LIMIT", "100"))  # 긍부정 탭 문장 길이
+HIGHLIGHT = "<b style='background:yellow'>{}</b>"
+ELLIPSIS = "..."
+BATCH_ROWS = 32_768  # 창 경계 계산을 나눠 할 행 수 (행 × 창 바이트 크기 배열의 메모리 제한)
+_NO_SEPARATOR = pa.scalar("", type=pa.large_string())
+
+
+def snippet_settings():
+    return {"window": SNIPPET_WINDOW, "fallback": SNIPPET_FALLBACK, "limit": SENTENCE_LIMIT}
+
+
+# 문자열 열 → Arrow large_string 배열 (결측은 str() 과 같이 "nan")
+def _arrow_texts(texts):
+    texts = pd.Series(texts).reset_index(drop=True).astype(str).fillna("nan")
+    array = pa.array(texts, type=pa.large_string(), from_pandas=True)
+    return array.combine_chunks() if isinstance(array, pa.ChunkedArray) else array
+
+
+def _buffers(array):
+    offsets = np.frombuffer(array.buffers()[1], dtype=np.int64)[array.offset:array.offset + len(array) + 1]
+    data = array.buffers()[2]
+    return offsets, np.frombuffer(data, dtype=np.uint8) if data is not None else np.zeros(0, dtype=np.uint8)
+
+
+# ✅ UTF-8 창 경계: 키워드 앞쪽 window 번째 글자 시작 바이트, 뒤쪽 window + 1 번째 글자 시작 바이트 (없으면 행 끝)
+# - 글자 시작 바이트 = 0b10xxxxxx 가 아닌 바이트, 한 글자는 최대 4바이트 → 앞뒤 4·window 바이트만 보면 됨
+def _window_bounds(data, row_start, row_end, match_start, match_end, window):
+    if window == 0:
+        return match_start.copy(), match_end.copy()
+    width = 4 * window
+    starts, ends = row_start.copy(), row_end.copy()
+    for lo in range(0, len(row_start), BATCH_ROWS):
+        batch = slice(lo, lo + BATCH_ROWS)
+        rows = np.arange(len(row_start[batch]))
+
+        before = match_start[batch, None] - np.arange(1, width + 1)
+        is_start = (before >= row_start[batch, None]) & ((data[np.clip(before, 0, None)] & 0xC0) != 0x80)
+        hit = is_start & (np.cumsum(is_start, axis=1) == window)
+        starts[batch] = np.where(hit.any(axis=1), before[rows, hit.argmax(axis=1)], row_start[batch])
+
+        after = match_end[batch, None] + np.arange(0, width + 1)
+        is_start = (after < row_end[batch, None]) & ((data[np.clip(after, 0, len(data) - 1)] & 0xC0) != 0x80)
+        hit = is_start & (np.cumsum(is_start, axis=1) == window + 1)
+        ends[batch] = np.where(hit.any(axis=1), after[rows, hit.argmax(axis=1)], row_end[batch])
+    return starts, ends
+
+
+# 바이트 구간 [start, end) 들을 모아 새 문자열 배열 생성
+def _gather(data, starts, ends):
+    lengths = ends - starts
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    index = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+    return pa.LargeStringArray.from_buffers(len(lengths), pa.py_buffer(offsets), pa.py_buffer(data[index]))
+
+
+def _ellipsis_if(mask, array):
+    return pc.binary_join_element_wise(array, pa.array(np.where(mask, ELLIPSIS, ""), type=pa.large_string()), _NO_SEPARATOR)
+
+
+def _truncate(texts, limit):
+    cut = pc.utf8_slice_codeunits(texts, 0, limit)
+    return _ellipsis_if(pc.greater(pc.utf8_length(texts), limit).to_numpy(zero_copy_only=False), cut)
+
+
+# ✅ 앞에서 limit 글자로 자르고 잘렸으면 말줄임표
+def truncate_snippets(texts, limit=SENTENCE_LIMIT):
+    return _truncate(_arrow_texts(texts), limit).to_pylist()
+
+
+# ✅ 키워드 강조 스니펫: 첫 키워드 앞뒤 window 글자 + 잘린 쪽 말줄임표 + 스니펫 안의 키워드 전부 강조
+# - 키워드가 없는 문장은 앞 fallback 글자 + 말줄임표
+# - keywords: 모든 행에 같은 키워드(문자열) 또는 행마다 키워드(목록) → 여러 노드의 문장을 한 번에 처리
+#   (키워드 검색·강조만 키워드별, 창 계산·자르기·말줄임표는 전체 열 한 번)
+def highlight_snippets(texts, keywords, window=SNIPPET_WINDOW, fallback=SNIPPET_FALLBACK):
+    texts = _arrow_texts(texts)
+    shortened = _truncate(texts, fallback)
+    keywords = np.full(len(texts), keywords, dtype=object) if isinstance(keywords, str) else np.asarray(keywords, dtype=object)
+    groups = pd.Series(np.arange(len(texts))).groupby(keywords, sort=False).indices
+    groups = {keyword: rows for keyword, rows in groups.items() if keyword}
+
+    # 키워드별 첫 위치 (바이트)
+    position = np.full(len(texts), -1, dtype=np.int64)
+    keyword_bytes = np.zeros(len(texts), dtype=np.int64)
+    for keyword, rows in groups.items():
+        position[rows] = pc.find_substring(texts.take(rows), keyword).to_numpy(zero_copy_only=False)
+        keyword_bytes[rows] = len(keyword.encode("utf-8"))
+    found = np.flatnonzero(position >= 0)
+    if not len(found):
+        return shortened.to_pylist()
+
+    # 창 경계·자르기·말줄임표: 키워드가 있는 행 전체를 한 번에
+    offsets, data = _buffers(texts)
+    row_start, row_end = offsets[found], offsets[found + 1]
+    match_start = row_start + position[found]
+    starts, ends = _window_bounds(data, row_start, row_end, match_start, match_start + keyword_bytes[found], window)
+    snippets = _gather(data, starts, ends)
+    snippets = pc.binary_join_element_wise(
+        pa.array(np.where(starts > row_start, ELLIPSIS, ""), type=pa.large_string()), snippets, _NO_SEPARATOR
+    )
+    snippets = _ellipsis_if(ends < row_end, snippets)
+
+    # 강조: 키워드별로 그 키워드 행만 바꾼 뒤 원래 순서로 되돌림
+    found_keywords = pd.Series(keywords[found])
+    by_keyword = found_keywords.groupby(found_keywords, sort=False).indices
+    parts = [pc.replace_substring(snippets.take(rows), keyword, HIGHLIGHT.format(keyword)) for keyword, rows in by_keyword.items()]
+    order = np.concatenate(list(by_keyword.values()))
+    snippets = pa.concat_arrays(parts).take(np.argsort(order, kind="stable"))
+    return pc.replace_with_mask(shortened, pa.array(position >= 0), snippets).to_pylist()
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+
+# ✅ 주차별 역색인
+# - by_word: (그룹, 단어, 감정) → 그 단어가 나온 문장의 sent_df 행 위치 배열 (sent_df 순서 유지)
+# - by_id: (그룹, 문장ID) → sent_df 행 위치 배열
+# → 단어별 문장 조회가 주차 크기와 무관하게 결과 크기만큼만 걸림
+def build_sentence_index(morph_df, sent_df):
+    keys = morph_df[["그룹", "단어", "감정", "문장ID"]].drop_duplicates()
+    keys = keys.assign(그룹=keys["그룹"].astype(str), 단어=keys["단어"].astype(str), 감정=keys["감정"].astype(str))
+    sent_keys = pd.DataFrame({
+        "그룹": sent_df["그룹"].astype(str).to_numpy(),
+        "문장ID": sent_df["문장ID"].to_numpy(),
+        "pos": np.arange(len(sent_df)),
+    })
+
+    joined = keys.merge(sent_keys, on=["그룹", "문장ID"], how="inner").sort_values("pos", kind="stable")
+    positions = joined["pos"].to_numpy()
+    by_word = {
+        key: positions[rows]
+        for key, rows in joined.groupby(["그룹", "단어", "감정"], sort=False).indices.items()
+    }
+    by_id = sent_keys.groupby(["그룹", "문장ID"], sort=False).indices
+    return {"by_word": by_word, "by_id": by_id}
+
+
+_EMPTY = np.array([], dtype=np.int64)
+
+
+def sentence_positions(index, brand, word, sentiment):
+    return index["by_word"].get((brand, word, sentiment), _EMPTY)
+
+
+def sentence_rows(index, sent_df, brand, word, sentiment):
+    return sent_df.iloc[sentence_positions(index, brand, word, sentiment)]
+
+
+def sentences_by_id(index, sent_df, brand, sentence_ids):
+    lookup = index["by_id"]
+    parts = [lookup[(brand, sid)] for sid in sentence_ids if (brand, sid) in lookup]
+    return sent_df.iloc[np.concatenate(parts) if parts else _EMPTY]
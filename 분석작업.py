@@ -0,0 +1,76 @@
+import time
+import uuid
+import threading
+
+
+# ✅ 백그라운드 분석 작업 관리 (프로세스 전역)
+# - 작업은 별도 스레드에서 돌고, Streamlit 재실행(rerun)·페이지 이동과 무관하게 계속 진행
+# - 작업 ID만 알면 어느 실행에서든 진행률·부분 결과를 읽거나 취소할 수 있음
+JOB_TTL = 60 * 60  # 끝난 작업 보관 시간(초)
+
+_lock = threading.Lock()
+_jobs = {}
+
+
+def _cleanup():
+    now = time.time()
+    for job_id in [k for k, job in _jobs.items() if job["finished_at"] and now - job["finished_at"] > JOB_TTL]:
+        del _jobs[job_id]
+
+
+# ✅ target(job, *args) 를 백그라운드로 실행하고 작업 ID 반환
+# - target 은 update_job 으로 진행률·부분 결과를 알리고, job["cancel"] 을 확인해 중단
+def start_job(target, *args):
+    job = {
+        "id": uuid.uuid4().hex[:12],
+        "status": "running",  # running → done / cancelled / error
+        "progress": 0.0,
+        "message": "",
+        "partial": {},
+        "result": None,
+        "errors": [],
+        "cancel": threading.Event(),
+        "started_at": time.time(),
+        "finished_at": None,
+    }
+
+    def run():
+        try:
+            result = target(job, *args)
+            update_job(job, result=result, status="cancelled" if job["cancel"].is_set() else "done", progress=1.0)
+        except Exception as e:
+            with _lock:
+                job["errors"].append(f"{type(e).__name__}: {e}")
+            update_job(job, status="error")
+        finally:
+            update_job(job, finished_at=time.time())
+
+    with _lock:
+        _cleanup()
+        _jobs[job["id"]] = job
+    threading.Thread(target=run, name=f"analysis-{job['id']}", daemon=True).start()
+    return job["id"]
+
+
+def update_job(job, **fields):
+    with _lock:
+        job.update(fields)
+
+
+def add_job_error(job, message):
+    with _lock:
+        job["errors"].append(message)
+
+
+# ✅ 작업 상태 스냅샷 (없으면 None)
+def get_job(job_id):
+    with _lock:
+        job = _jobs.get(job_id)
+        return dict(job, errors=list(job["errors"])) if job else None
+
+
+def cancel_job(job_id):
+    with _lock:
+        job = _jobs.get(job_id)
+    if job is not None:
+        job["cancel"].set()
@@ -33,5 +33,5 @@ elif selected_tab == "긍·부정 분석":
     show_sentimental_tab()
 
 elif selected_tab == "트렌드 변화 분석":
-    st.title("🙂 트렌드 변화 분석 (개발 예정)")
-    st.info("이 탭은 준비 중입니다.")
+    from 트렌드변화분석 import show_trend_change_tab
+    show_trend_change_tab()
@@ -0,0 +1,78 @@
+import os
+import json
+import hashlib
+import threading
+
+import xlsxwriter
+
+
+# ✅ 검색트렌드 Excel 보고서
+# - 결과(검색량·언급량·기사 목록)의 해시로 메모 → 같은 결과면 다시 만들지 않음
+# - xlsxwriter constant_memory 모드: 행을 쓰는 즉시 임시 파일로 내보내 메모리는 한 행 분량만 사용
+REPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "reports")
+REPORT_KEEP = 20  # 보관할 최근 보고서 수
+HEADER_FORMAT = {"bold": True, "border": 1, "align": "center", "valign": "top"}
+
+_lock = threading.Lock()
+
+
+def report_key(trend_data, mention_data, group_mentions):
+    payload = json.dumps([trend_data, mention_data, group_mentions], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _write_sheet(workbook, name, header, rows):
+    sheet = workbook.add_worksheet(name)
+    sheet.write_row(0, 0, header, workbook.add_format(HEADER_FORMAT))
+    for r, row in enumerate(rows, start=1):
+        sheet.write_row(r, 0, row)
+
+
+def write_report(path, trend_data, mention_data, group_mentions):
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+
+    # 1. 검색량 데이터 (그룹별 행을 이어서 씀)
+    _write_sheet(workbook, "검색량 데이터", ["날짜", "검색비율", "group"], (
+        (d["period"], d["ratio"], group["title"])
+        for group in trend_data.get("results", [])
+        for d in group["data"]
+    ))
+
+    # 2. 언급량 데이터 (날짜 × 그룹)
+    datasets = mention_data.get("datasets", [])
+    _write_sheet(workbook, "언급량 데이터", ["날짜"] + [ds["label"] for ds in datasets], (
+        [day] + [ds["data"][i] for ds in datasets]
+        for i, day in enumerate(mention_data.get("labels", []))
+    ))
+
+    # 3. 뉴스·블로그 문장 리스트
+    _write_sheet(workbook, "뉴스_블로그_문장", ["그룹명", "제목", "링크", "중복 수"], (
+        (group, item["title"], item["link"], item.get("copies", 1))
+        for group, articles in group_mentions.items()
+        for item in articles
+    ))
+    workbook.close()
+
+
+# ✅ 보고서 파일 경로 (없으면 생성, 오래된 보고서는 정리)
+def build_report(key, trend_data, mention_data, group_mentions):
+    path = os.path.join(REPORT_DIR, f"{key}.xlsx")
+    with _lock:
+        if not os.path.exists(path):
+            os.makedirs(REPORT_DIR, exist_ok=True)
+            tmp = f"{path}.tmp.xlsx"
+            write_report(tmp, trend_data, mention_data, group_mentions)
+            os.replace(tmp, path)
+            reports = sorted(
+                (os.path.join(REPORT_DIR, name) for name in os.listdir(REPORT_DIR) if name.endswith(".xlsx")),
+                key=os.path.getmtime,
+                reverse=True,
+            )
+            for old in reports[REPORT_KEEP:]:
+                os.remove(old)
+    return path
+
+
+def report_bytes(key, trend_data, mention_data, group_mentions):
+    with open(build_report(key, trend_data, mention_data, group_mentions), "rb") as f:
+        return f.read()
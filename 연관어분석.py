@@ -1,180 +1,103 @@
+import streamlit as st
+
+
 def show_relation_tab():
-    import streamlit as st
     import pandas as pd
-    import requests
-    import plotly.graph_objects as go
-    from io import StringIO
-    import json
-    import base64
-    import csv
+    from 주차데이터 import WEEKS, cached_weeks_report
+    from 주차산출물 import week_artifacts
+    from 검색상자 import show_search_box
 
     st.title("📌 연관어 분석")
 
-    weeks = {
-        "3월 1주차 ('25.3.1~3.7)": "2025_03w1",
-        "3월 2주차 ('25.3.8~3.14)": "2025_03w2",
-        "3월 3주차 ('25.3.15~3.21)": "2025_03w3"
-    }
-    selected_label = st.selectbox("📂 주차 선택", list(weeks.keys()), index=0)
-    selected_week = weeks[selected_label]
-
-    base_url = f"https://raw.githubusercontent.com/umne012/research_simple/main/{selected_week}"
-    word_url = f"{base_url}/morpheme_word_count_merged.csv"
-    morph_urls = [f"{base_url}/morpheme_analysis_part{i}.csv" for i in range(1, 4)]
-    sentiment_url = f"{base_url}/sentiment_analysis_merged.csv"
-
-    @st.cache_data(show_spinner=False)
-    def load_data():
-        word_df = pd.read_csv(word_url)
-        word_df.columns = word_df.columns.str.strip()
-        word_data = {brand: df for brand, df in word_df.groupby("그룹")}
-
-        morph_frames = []
-        for url in morph_urls:
-            try:
-                df = pd.read_csv(url)
-                df.columns = df.columns.str.strip()
-                if not df.empty and all(col in df.columns for col in ["단어", "감정", "문장ID", "그룹"]):
-                    morph_frames.append(df)
-            except Exception as e:
-                st.warning(f"⚠️ {url} 불러오기 실패: {e}")
-        if not morph_frames:
-            st.error("❌ 형태소 분석 데이터가 없거나 비어 있습니다.")
-            return None, None, None
-
-        morph_df = pd.concat(morph_frames, ignore_index=True)
-        morph_df.columns = morph_df.columns.str.strip()
-
-        # 병합 에러 처리 (그룹_x, 그룹_y 정리)
-        if "그룹_x" in morph_df.columns:
-            morph_df["그룹"] = morph_df["그룹_x"]
-            morph_df.drop(columns=["그룹_x", "그룹_y"], inplace=True, errors="ignore")
-
-        try:
-            sent_df = pd.read_csv(sentiment_url)
-            sent_df.columns = sent_df.columns.str.strip()
-        except Exception as e:
-            st.error(f"sentiment_analysis_merged.csv 불러오기 오류: {e}")
-            return None, None, None
-
-        morph_df["문장ID"] = morph_df["문장ID"].astype(str)
-        sent_df["문장ID"] = sent_df["문장ID"].astype(str)
-
-        return word_data, morph_df, sent_df
-
-    word_data, morph_df, sent_df = load_data()
-    if word_data is None:
+    selected_label = st.selectbox("📂 주차 선택", list(WEEKS.keys()), index=0)
+    selected_week = WEEKS[selected_label]
+
+    # ✅ 사전 계산 산출물 (없으면 주차 데이터로 바로 계산)
+    try:
+        artifacts = week_artifacts(selected_week)
+    except Exception as e:
+        st.error(str(e))
         return
+    for message in artifacts["warnings"]:
+        st.warning(message)
 
-    # ✅ 다운로드용 데이터 구성
-    export_rows = []
-    for brand, df in word_data.items():
-        word_entries = []
-        for _, row in df.iterrows():
-            word = row["단어"]
-            if row.get("positive", 0) > 0:
-                word_entries.append((word, row["positive"], "positive"))
-            if row.get("negative", 0) > 0:
-                word_entries.append((word, row["negative"], "negative"))
-
-        top_entries = sorted(word_entries, key=lambda x: x[1], reverse=True)[:10]
-        for word, freq, sentiment in top_entries:
-            match = morph_df[
-                (morph_df["단어"] == word) & (morph_df["감정"] == sentiment) & (morph_df["그룹"] == brand)
-            ]
-            matched_ids = match["문장ID"].unique()
-            matched_sents = sent_df[
-                (sent_df["문장ID"].isin(matched_ids)) & (sent_df["그룹"] == brand)
-            ]
-            for _, row in matched_sents.iterrows():
-                export_rows.append({
-                    "브랜드": brand,
-                    "단어": word,
-                    "감정": sentiment,
-                    "언급횟수": freq,
-                    "문장": row["문장"],
-                    "링크": row["원본링크"]
-                })
+    with st.expander("💾 주차 데이터 캐시", expanded=False):
+        st.caption("사전 계산 산출물 사용" if artifacts["source"] == "precomputed" else "산출물 없음 → 주차 데이터에서 계산")
+        st.dataframe(pd.DataFrame(cached_weeks_report()), use_container_width=True, hide_index=True)
 
     col1, col2 = st.columns([5, 1])
     with col1:
         st.markdown(f"### 📂 {selected_label}")
     with col2:
-        if export_rows:
-            export_df = pd.DataFrame(export_rows)
-            from io import BytesIO
-            import csv
-    
-            # 🔧 텍스트 정리 (줄바꿈, 따옴표)
-            export_df["문장"] = export_df["문장"].astype(str).str.replace("\n", " ").str.replace("\r", " ").str.replace('"', "'")
-    
-            towrite = BytesIO()
-            export_df.to_csv(towrite, index=False, encoding="cp949", quoting=csv.QUOTE_ALL)
-            towrite.seek(0)
-            b64 = base64.b64encode(towrite.read()).decode()
-            href = f"<a href='data:file/csv;base64,{b64}' download='{selected_week}_연관어_문장.csv'>📥</a>"
-            st.markdown(f"<div style='text-align:right;font-size:24px;padding-top:25px'>{href}</div>", unsafe_allow_html=True)
+        show_export_button(selected_week)
     
     st.markdown("\n")
 
-    # ✅ 네트워크 그래프용 데이터 처리
-    nodes, links, added_words = [], [], set()
-    sentence_map = {}
-    link_counter = {}
-
-    def highlight_and_shorten(text, keyword):
-        if keyword not in text:
-            return text[:50] + "..." if len(text) > 50 else text
-        idx = text.index(keyword)
-        start = max(0, idx - 15)
-        end = min(len(text), idx + len(keyword) + 15)
-        snippet = text[start:end]
-        if start > 0:
-            snippet = "..." + snippet
-        if end < len(text):
-            snippet += "..."
-        return snippet.replace(keyword, f"<b style='background:yellow'>{keyword}</b>")
-
-    for brand, df in word_data.items():
-        nodes.append({"id": brand, "group": "brand"})
-        word_entries = []
-        for _, row in df.iterrows():
-            word = row["단어"]
-            if row.get("positive", 0) > 0:
-                word_entries.append((f"{word}_positive", row["positive"], "positive", word))
-            if row.get("negative", 0) > 0:
-                word_entries.append((f"{word}_negative", row["negative"], "negative", word))
-        top_entries = sorted(word_entries, key=lambda x: x[1], reverse=True)[:10]
-        for node_id, freq, sentiment, word in top_entries:
-            if node_id not in added_words:
-                nodes.append({"id": node_id, "group": sentiment, "freq": freq})
-                added_words.add(node_id)
-
-                match = morph_df[
-                    (morph_df["단어"] == word) & (morph_df["감정"] == sentiment) & (morph_df["그룹"] == brand)
-                ]
-                matched_ids = match["문장ID"].unique()
-                matched_sents = sent_df[
-                    (sent_df["문장ID"].isin(matched_ids)) & (sent_df["그룹"] == brand)
-                ]
-                shown = []
-                for _, row in matched_sents.iterrows():
-                    snippet = highlight_and_shorten(str(row["문장"]), word)
-                    shown.append({"문장": snippet, "원본링크": row["원본링크"], "count": freq})
-                sentence_map[node_id] = shown
-
-            links.append({"source": brand, "target": node_id})
-            link_counter[node_id] = link_counter.get(node_id, 0) + 1
-
-    # D3 네트워크 그래프 HTML 생성 및 렌더링 생략 (기존과 동일)
-    # Plotly 선그래프도 생략 (기존과 동일)
-
-
-
-
-    nodes_json = json.dumps(nodes)
-    links_json = json.dumps(links)
-    sentences_json = json.dumps(sentence_map, ensure_ascii=False)
+    # ✅ 그래프·차트는 각각 부분 재실행 영역(fragment) → 토글·버튼을 눌러도 탭 전체를 다시 돌리지 않음
+    show_network(artifacts)
+    show_search_box(selected_week, "relation")
+    show_mention_chart(artifacts)
+
+
+# 📥 을 누를 때만 CSV 생성 (주차·입력별로 한 번) → 이후엔 정적 파일 링크로 바로 다운로드
+@st.fragment
+def show_export_button(selected_week):
+    import os
+    from 주차산출물 import relation_export
+    from 정적파일 import STATIC_DIR, static_enabled, static_url
+
+    export_path = relation_export(selected_week, create=False)
+    if export_path is None and st.button("📥", key=f"relation_export_{selected_week}", help="관련 문장 CSV 만들기"):
+        with st.spinner("CSV 생성 중..."):
+            export_path = relation_export(selected_week)
+    if export_path is not None:
+        filename = f"{selected_week}_연관어_문장.csv"
+        if static_enabled():
+            href = f"<a href='{static_url(export_path)}' download='{filename}'>📥</a>"
+            st.markdown(f"<div style='text-align:right;font-size:24px;padding-top:25px'>{href}</div>", unsafe_allow_html=True)
+        else:
+            with open(os.path.join(STATIC_DIR, export_path), "rb") as f:
+                st.download_button("📥", f, file_name=filename, mime="text/csv")
+
+
+@st.fragment
+def show_network(artifacts):
+    import json
+    from 주차산출물 import (
+        RANK_LIMIT, SENTIMENT_FILTERS, TOP_K, derived_view, graph_layout, relation_shards, relation_snippets, relation_view,
+        snippet_records,
+    )
+    from 그래프배치 import NETWORK_VIEW
+    from 정적파일 import d3_src, static_enabled, static_url
+
+    # ✅ 상위 단어 수·감정 필터: 주차별 순위표에서 잘라 씀 (다시 정렬하지 않음)
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        k = st.slider("브랜드별 상위 단어 수", 5, RANK_LIMIT, TOP_K, step=5, key="relation_top_k")
+    with col2:
+        sentiments = SENTIMENT_FILTERS[st.radio("감정", list(SENTIMENT_FILTERS), horizontal=True, key="relation_sentiment")]
+    view = relation_view(artifacts, k, sentiments)
+
+    # ✅ 네트워크 그래프용 JSON (주차·보기별로 한 번만 직렬화)
+    # - 문장은 노드별 정적 조각으로 게시 → 클릭한 노드만 받음 (정적 서빙이 꺼져 있으면 인라인)
+    inline_sentences = not static_enabled()
+    view_key = f"{k}_{'+'.join(sentiments)}_{inline_sentences}"
+    nodes_json, links_json, shards_json, sentences_json = derived_view(artifacts, f"network_json_{view_key}", lambda a: (
+        json.dumps(view["nodes"]),
+        json.dumps(view["links"]),
+        "null" if inline_sentences else json.dumps(relation_shards(a, view), ensure_ascii=False),
+        json.dumps({node_id: snippet_records(snippets) for node_id, snippets in relation_snippets(a, view).items()}, ensure_ascii=False)
+        if inline_sentences else "null",
+    ))
+    shard_base = static_url("")
+
+    # ✅ 서버 배치: 주차별로 한 번 계산한 고정 좌표를 넘기고 브라우저는 그리기·드래그만
+    server_layout = st.toggle("⚡ 서버에서 그래프 배치 계산", value=False, key="relation_server_layout",
+                              help="노드가 많을 때 브라우저 시뮬레이션 대신 미리 계산한 좌표로 바로 그립니다.")
+    layout_json = derived_view(
+        artifacts, f"network_layout_json_{view_key}", lambda a: json.dumps(graph_layout(a, "network", k, sentiments), ensure_ascii=False)
+    ) if server_layout else "null"
+    view_w, view_h = NETWORK_VIEW
 
     # ✅ 네트워크 그래프 HTML 직접 생성 (중괄호 이스케이프 수정)
     html_code = f"""
@@ -189,7 +112,7 @@ def show_relation_tab():
     h3 {{ margin-top: 0; font-size: 16px; }}
     .text-link {{ margin-bottom: 8px; display: block; font-size: 13px; }}
     </style>
-    <script src=\"https://d3js.org/d3.v7.min.js\"></script>
+    <script src=\"{d3_src()}\"></script>
     </head>
     <body>
     <svg></svg>
@@ -201,28 +124,45 @@ def show_relation_tab():
     const nodes = {nodes_json};
     const links = {links_json};
     const sentenceData = {sentences_json};
+    const shards = {shards_json};
 
-    const width = document.querySelector("svg").clientWidth;
-    const height = document.querySelector("svg").clientHeight;
+    const fixedLayout = {layout_json};  // 서버 배치 좌표 (없으면 브라우저에서 시뮬레이션)
     const svg = d3.select("svg");
 
-    const simulation = d3.forceSimulation(nodes)
-        .force("link", d3.forceLink(links).id(d => d.id).distance(80))
-        .force("charge", d3.forceManyBody().strength(-100))
-        .force("center", d3.forceCenter(width / 2, height / 2));
-
+    // 브랜드 → 단어 링크 수 (동시 출현 링크는 제외)
     const linkCount = {{}};
     links.forEach(l => {{
-        linkCount[l.target] = (linkCount[l.target] || 0) + 1;
+        if (l.kind !== "cooccur") linkCount[l.target] = (linkCount[l.target] || 0) + 1;
     }});
+    const maxPmi = Math.max(1, ...links.filter(l => l.kind === "cooccur").map(l => l.pmi));
+
+    let simulation = null;
+    if (fixedLayout) {{
+        svg.attr("viewBox", "0 0 {view_w} {view_h}");
+        nodes.forEach(d => {{ [d.x, d.y] = fixedLayout[d.id]; }});
+        const byId = new Map(nodes.map(d => [d.id, d]));
+        links.forEach(l => {{ l.source = byId.get(l.source); l.target = byId.get(l.target); }});
+    }} else {{
+        const width = document.querySelector("svg").clientWidth;
+        const height = document.querySelector("svg").clientHeight;
+        simulation = d3.forceSimulation(nodes)
+            .force("link", d3.forceLink(links).id(d => d.id).distance(80))
+            .force("charge", d3.forceManyBody().strength(-100))
+            .force("center", d3.forceCenter(width / 2, height / 2));
+    }}
 
     const link = svg.append("g")
         .selectAll("line")
         .data(links)
         .enter().append("line")
-        .attr("stroke", "#aaa")
-        .attr("stroke-width", 2)
-        .attr("stroke-dasharray", d => linkCount[d.target] > 1 ? "0" : "4,4");
+        .attr("stroke", d => d.kind === "cooccur" ? "#7B68EE" : "#aaa")
+        .attr("stroke-opacity", d => d.kind === "cooccur" ? 0.7 : 1)
+        .attr("stroke-width", d => d.kind === "cooccur" ? 1 + 3 * Math.max(0, d.pmi) / maxPmi : 2)
+        .attr("stroke-dasharray", d => d.kind === "cooccur" || linkCount[d.target.id || d.target] > 1 ? "0" : "4,4");
+
+    // 동시 출현 링크: 마우스를 올리면 함께 나온 문장 수·PMI
+    link.filter(d => d.kind === "cooccur").append("title")
+        .text(d => `함께 나온 문장 ${{d.count}}개 · PMI ${{d.pmi.toFixed(2)}}`);
 
     const node = svg.append("g")
         .selectAll("g")
@@ -250,10 +190,9 @@ def show_relation_tab():
         .attr("font-size", "11px")
         .text(d => d.id.replace("_positive", "").replace("_negative", ""));
 
-    node.on("click", (event, d) => {{
+    function showSentences(data) {{
         const panel = document.getElementById("sentences");
         const counter = document.getElementById("count-label");
-        const data = sentenceData[d.id];
         if (!data || data.length === 0) {{
             panel.innerHTML = "<i>관련 문장이 없습니다.</i>";
             counter.innerHTML = "";
@@ -265,28 +204,46 @@ def show_relation_tab():
             </a>
         `).join("");
         counter.innerHTML = `(언급횟수: ${{data[0].count}}회)`;
+    }}
+
+    // 문장은 클릭한 노드의 조각만 받아 옴 (정적 서빙이 꺼져 있으면 sentenceData 에 인라인)
+    const shardCache = {{}};
+    node.on("click", (event, d) => {{
+        if (sentenceData) {{ showSentences(sentenceData[d.id]); return; }}
+        const shard = shards[d.id];
+        if (!shard) {{ showSentences([]); return; }}
+        if (shardCache[shard]) {{ showSentences(shardCache[shard]); return; }}
+        document.getElementById("sentences").innerHTML = "<i>불러오는 중...</i>";
+        fetch("{shard_base}" + shard)
+            .then(r => r.json())
+            .then(data => {{ shardCache[shard] = data; showSentences(data); }})
+            .catch(() => {{ document.getElementById("sentences").innerHTML = "<i>문장을 불러오지 못했습니다.</i>"; }});
     }});
 
-    simulation.on("tick", () => {{
+    function ticked() {{
         link.attr("x1", d => d.source.x)
             .attr("y1", d => d.source.y)
             .attr("x2", d => d.target.x)
             .attr("y2", d => d.target.y);
         node.attr("transform", d => `translate(${{d.x}},${{d.y}})`);
-    }});
+    }}
+    if (simulation) simulation.on("tick", ticked); else ticked();
 
     function dragstarted(event, d) {{
+        if (!simulation) return;
         if (!event.active) simulation.alphaTarget(0.3).restart();
         d.fx = d.x;
         d.fy = d.y;
     }}
 
     function dragged(event, d) {{
+        if (!simulation) {{ d.x = event.x; d.y = event.y; ticked(); return; }}
         d.fx = event.x;
         d.fy = event.y;
     }}
 
     function dragended(event, d) {{
+        if (!simulation) return;
         if (!event.active) simulation.alphaTarget(0);
         d.fx = null;
         d.fy = null;
@@ -298,30 +255,45 @@ def show_relation_tab():
 
     st.components.v1.html(html_code, height=650)
 
+
+# ✅ 일자별 언급량 그림 (주차별로 한 번만 생성)
+def mention_figure(artifacts):
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    if not artifacts["daily"]["mentions"]:
+        return None
+    mention_daily = pd.DataFrame(artifacts["daily"]["mentions"])
+
+    layout = go.Layout(
+        plot_bgcolor="#ffffff",
+        paper_bgcolor="#ffffff",
+        title=dict(text="일자별 브랜드 언급량 추이", x=0.05, font=dict(size=18)),
+        margin=dict(l=40, r=40, t=60, b=100),
+        xaxis=dict(title="날짜", showgrid=True, tickangle=-45),
+        yaxis=dict(title="언급량", showgrid=True),
+        legend=dict(orientation="h", x=0.5, y=-0.3, xanchor="center", yanchor="top")
+    )
+
+    fig = go.Figure(layout=layout)
+    for group, df in mention_daily.groupby("그룹", observed=True):
+        fig.add_trace(go.Scatter(
+            x=df["날짜"],
+            y=df["언급량"],
+            mode="lines+markers",
+            name=group
+        ))
+    return fig
+
+
+@st.fragment
+def show_mention_chart(artifacts):
+    from 주차산출물 import derived
+
     # ✅ 선그래프 (Plotly Graph Object 방식)
     st.markdown("### 📊 일자별 언급량 추이")
-    if sent_df is not None and "날짜" in sent_df.columns and "원본링크" in sent_df.columns and "그룹" in sent_df.columns:
-        mention_daily = sent_df.groupby(["날짜", "그룹"])["원본링크"].nunique().reset_index(name="언급량")
-
-        layout = go.Layout(
-            plot_bgcolor="#ffffff",
-            paper_bgcolor="#ffffff",
-            title=dict(text="일자별 브랜드 언급량 추이", x=0.05, font=dict(size=18)),
-            margin=dict(l=40, r=40, t=60, b=100),
-            xaxis=dict(title="날짜", showgrid=True, tickangle=-45),
-            yaxis=dict(title="언급량", showgrid=True),
-            legend=dict(orientation="h", x=0.5, y=-0.3, xanchor="center", yanchor="top")
-        )
-
-        fig = go.Figure(layout=layout)
-        for group, df in mention_daily.groupby("그룹"):
-            fig.add_trace(go.Scatter(
-                x=df["날짜"],
-                y=df["언급량"],
-                mode="lines+markers",
-                name=group
-            ))
-
+    fig = derived(artifacts, "mention_figure", mention_figure)
+    if fig is not None:
         st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("📌 일자별 언급량을 시각화하려면 sentiment_analysis.csv에 '날짜', '그룹' 컬럼이 있어야 합니다.")
@@ -0,0 +1,114 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+
+# ✅ 네이버 API 응답 영구 캐시 (SQLite)
+# - 키: 엔드포인트 + 정규화된 검색어 + 제외어 목록 + 날짜
+# - 지난 날짜는 값이 바뀌지 않으므로 만료 없음, 오늘/어제만 짧은 TTL 적용
+CACHE_PATH = os.environ.get(
+    "NAVER_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "naver_responses.sqlite"),
+)
+RECENT_TTL = int(os.environ.get("NAVER_CACHE_RECENT_TTL", "600"))  # 초
+
+
+def normalize_query(text):
+    return " ".join(str(text).split()).lower()
+
+
+def make_key(endpoint, query, exclude, day):
+    exclude_part = ",".join(sorted({normalize_query(w) for w in exclude if str(w).strip()}))
+    return f"{endpoint}|{normalize_query(query)}|{exclude_part}|{day}"
+
+
+# 기간 키("시작~종료")는 마지막 날짜 기준으로 최근 여부 판단
+def is_recent(day):
+    last = date.fromisoformat(str(day).split("~")[-1])
+    return last >= date.today() - timedelta(days=1)
+
+
+class ResponseCache:
+    def __init__(self, path=CACHE_PATH, recent_ttl=RECENT_TTL):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.recent_ttl = recent_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, day TEXT NOT NULL, fetched_at REAL NOT NULL, payload TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, endpoint, query, exclude, day):
+        key = make_key(endpoint, query, exclude, day)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at, payload FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and is_recent(day) and time.time() - row[0] > self.recent_ttl:
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[1])
+
+    def set(self, endpoint, query, exclude, day, payload):
+        key = make_key(endpoint, query, exclude, day)
+        data = json.dumps(payload, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, day, fetched_at, payload) VALUES (?, ?, ?, ?)",
+                (key, str(day), time.time(), data),
+            )
+            self._conn.commit()
+
+    # 프로세스 전체 합계 (모든 세션·작업, 작업별 수치는 CacheCounter)
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+# ✅ 작업별 적중·미스 집계: 공용 캐시를 감싸 이 작업의 조회만 셈 (동시에 도는 다른 세션의 수집과 섞이지 않음)
+class CacheCounter:
+    def __init__(self, cache):
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, endpoint, query, exclude, day):
+        payload = self.cache.get(endpoint, query, exclude, day)
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return payload
+
+    def set(self, endpoint, query, exclude, day, payload):
+        self.cache.set(endpoint, query, exclude, day, payload)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+_cache_lock = threading.Lock()
+_cache = None
+
+
+# ✅ 프로세스 전역 캐시 (Streamlit 세션끼리 공유)
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
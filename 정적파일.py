@@ -0,0 +1,96 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+
+import requests
+import streamlit as st
+
+
+# ✅ Streamlit 정적 파일 서빙 (.streamlit/config.toml 의 server.enableStaticServing)
+# - 앱 폴더의 static/ 아래 파일이 /app/static/... 로 제공됨 → iframe 에서 필요할 때 fetch
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+SHARD_DIR = "shards"
+EXPORT_DIR = "exports"
+D3_FILE = "vendor/d3.v7.min.js"
+D3_CDN = "https://d3js.org/d3.v7.min.js"
+D3_HEADER = b"// https://d3js.org v7."  # 번들 첫 줄 (버전·저작권 표기) → 받은 내용이 D3 인지 확인
+
+logger = logging.getLogger(__name__)
+_d3_lock = threading.Lock()
+_d3_state = {"fetched": False, "warned": False}
+
+
+def static_enabled():
+    return bool(st.get_option("server.enableStaticServing"))
+
+
+def static_url(relpath):
+    base = (st.get_option("server.baseUrlPath") or "").strip("/")
+    return f"/{base}/app/static/{relpath}" if base else f"/app/static/{relpath}"
+
+
+# ✅ D3: static/vendor 의 로컬 번들을 /app/static 으로 제공
+# - 배포 때 python 정적파일.py 로 내려받음 (.devcontainer updateContentCommand)
+# - 화면 그리기에서는 파일이 있는지만 봄 → 없으면 CDN (경고 로그 한 번) + 백그라운드 스레드로 한 번 내려받기 시도
+#   (외부 접속이 없는 서버에서도 첫 화면이 내려받기를 기다리지 않음)
+def d3_src():
+    if static_enabled() and ensure_d3():
+        return static_url(D3_FILE)
+    with _d3_lock:
+        warn, _d3_state["warned"] = not _d3_state["warned"], True
+    if warn:
+        reason = "로컬 번들 없음" if static_enabled() else "정적 서빙(server.enableStaticServing) 꺼짐"
+        logger.warning("D3 를 CDN 에서 불러옵니다 (%s): %s — 로컬 번들은 python 정적파일.py 로 내려받으세요.", reason, D3_CDN)
+    return D3_CDN
+
+
+def ensure_d3():
+    if os.path.exists(os.path.join(STATIC_DIR, D3_FILE)):
+        return True
+    with _d3_lock:
+        start, _d3_state["fetched"] = not _d3_state["fetched"], True
+    if start:
+        threading.Thread(target=_fetch_d3_quietly, name="fetch-d3", daemon=True).start()
+    return False
+
+
+def _fetch_d3_quietly():
+    try:
+        fetch_d3()
+    except (requests.RequestException, OSError, ValueError) as e:
+        logger.warning("D3 로컬 번들을 내려받지 못했습니다: %s", e)
+
+
+def fetch_d3():
+    path = os.path.join(STATIC_DIR, D3_FILE)
+    response = requests.get(D3_CDN, timeout=30)
+    response.raise_for_status()
+    if not response.content.startswith(D3_HEADER):
+        raise ValueError(f"{D3_CDN} 응답이 D3 번들이 아닙니다.")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(response.content)
+    os.replace(tmp, path)
+    return path, len(response.content)
+
+
+# ✅ 조각(shard) 파일 쓰기: 내용 해시를 파일 이름으로 사용 → 같은 내용은 한 번만 쓰고, 브라우저 캐시도 그대로 유효
+def write_shard(namespace, value):
+    data = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    relpath = f"{SHARD_DIR}/{namespace}/{hashlib.sha1(data).hexdigest()[:16]}.json"
+    path = os.path.join(STATIC_DIR, relpath)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    return relpath
+
+
+if __name__ == "__main__":
+    path, size = fetch_d3()
+    print(f"{path}: {size / 1024:,.0f} KB")
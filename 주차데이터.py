@@ -0,0 +1,327 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+# ✅ 주차 데이터 위치
+# - 로컬 주차 폴더(예: 2025_03w1/)에 변환된 Parquet 가 있으면 그것을 읽고, 없으면 GitHub 원본 CSV 를 읽음
+DATA_DIR = os.environ.get("WEEK_DATA_DIR", os.path.dirname(os.path.abspath(__file__)))
+BASE_URL = "https://raw.githubusercontent.com/umne012/research_simple/main"
+
+WORD_CSV = "morpheme_word_count_merged.csv"
+MORPH_CSVS = [f"morpheme_analysis_part{i}.csv" for i in range(1, 4)]
+SENT_CSV = "sentiment_analysis_merged.csv"
+
+# 변환 결과 파일 (테이블 이름 → 파일 이름)
+TABLES = {"word": "word_count.parquet", "morph": "morpheme.parquet", "sent": "sentiment.parquet"}
+DICT_COLUMNS = ["그룹", "감정", "단어"]  # 사전(dictionary) 인코딩할 반복 문자열 컬럼
+MORPH_REQUIRED = ["단어", "감정", "문장ID", "그룹"]
+
+# 탭에서 쓰는 컬럼만 읽음 (Parquet 컬럼 선택)
+MORPH_COLUMNS = ["단어", "감정", "문장ID", "그룹", "날짜"]
+SENT_COLUMNS = ["문장ID", "그룹", "문장", "원본링크", "날짜"]
+
+WEEKS = {
+    "3월 1주차 ('25.3.1~3.7)": "2025_03w1",
+    "3월 2주차 ('25.3.8~3.14)": "2025_03w2",
+    "3월 3주차 ('25.3.15~3.21)": "2025_03w3",
+}
+WEEK_CACHE_SIZE = int(os.environ.get("WEEK_CACHE_SIZE", "3"))  # 메모리에 올려 둘 최대 주차 수
+CATEGORY_COLUMNS = ["그룹", "감정", "날짜"]  # 메모리에서 범주형(정수 코드)으로 둘 컬럼 (단어는 전역 단어 사전)
+
+
+def week_path(week, filename):
+    return os.path.join(DATA_DIR, week, filename)
+
+
+# ✅ 원본 CSV 위치: 로컬 파일이 있으면 로컬, 없으면 GitHub raw URL
+def source_path(week, filename):
+    path = week_path(week, filename)
+    return path if os.path.exists(path) else f"{BASE_URL}/{week}/{filename}"
+
+
+def read_csv(week, filename):
+    df = pd.read_csv(source_path(week, filename))
+    df.columns = df.columns.str.strip()
+    return df
+
+
+# ✅ 형태소 분석 파트 병합 + 병합 에러 처리 (그룹_x, 그룹_y 정리)
+# - 비어 있거나 필수 컬럼이 없는 파트는 건너뛰고 경고 메시지로 돌려줌
+def read_morph_csv(week):
+    frames, warnings = [], []
+    for filename in MORPH_CSVS:
+        try:
+            df = read_csv(week, filename)
+            if "그룹_x" in df.columns:
+                df["그룹"] = df["그룹_x"]
+                df = df.drop(columns=["그룹_x", "그룹_y"], errors="ignore")
+            if not df.empty and all(col in df.columns for col in MORPH_REQUIRED):
+                frames.append(df)
+        except Exception as e:
+            warnings.append(f"⚠️ {source_path(week, filename)} 불러오기 실패: {e}")
+    morph_df = pd.concat(frames, ignore_index=True) if frames else None
+    return morph_df, warnings
+
+
+# ✅ 문장ID 타입 지정: 전부 정수면 int64, 아니면 문자열
+def typed_sentence_ids(series):
+    numeric = pd.to_numeric(series, errors="coerce")
+    if numeric.notna().all() and (numeric % 1 == 0).all():
+        return numeric.astype("int64")
+    return series.astype(str)
+
+
+def _to_columnar(df):
+    df = df.copy()
+    if "문장ID" in df.columns:
+        df["문장ID"] = typed_sentence_ids(df["문장ID"])
+    for col in DICT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(str).astype("category")
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+# ✅ 주차 폴더 → 압축 컬럼형(Parquet, zstd) 변환
+# - 그룹/감정/단어는 사전 인코딩, 문장ID는 정수형으로 저장 → 읽을 때 필요한 컬럼만 골라 메모리 맵으로 읽기
+def convert_week(week):
+    tables = {"word": read_csv(week, WORD_CSV), "sent": read_csv(week, SENT_CSV)}
+    tables["morph"], warnings = read_morph_csv(week)
+    if tables["morph"] is None:
+        raise ValueError(f"{week}: 형태소 분석 데이터가 없거나 비어 있습니다.")
+
+    os.makedirs(os.path.join(DATA_DIR, week), exist_ok=True)
+    written = {}
+    for name, df in tables.items():
+        path = week_path(week, TABLES[name])
+        pq.write_table(
+            _to_columnar(df), path, compression="zstd", use_dictionary=DICT_COLUMNS + ["날짜"], row_group_size=256_000
+        )
+        written[name] = (len(df), os.path.getsize(path))
+    return written, warnings
+
+
+def has_columnar(week, table):
+    return os.path.exists(week_path(week, TABLES[table]))
+
+
+# ✅ 변환된 테이블 읽기: 컬럼 선택(projection) + 메모리 맵 (없는 컬럼은 무시, 파일이 없으면 None)
+def read_table(week, table, columns=None):
+    path = week_path(week, TABLES[table])
+    if not os.path.exists(path):
+        return None
+    if columns is not None:
+        names = set(pq.read_schema(path).names)
+        columns = [col for col in columns if col in names]
+    return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+
+# ✅ 전역 단어 사전 (모든 주차·테이블 공용, 추가만 함)
+# - 단어 → 정수 ID 가 주차와 무관하게 고정 → 단어 컬럼은 이 사전을 범주로 쓰는 범주형(코드 배열)
+# - 주차가 LRU 에서 빠져도 사전은 유지 (크기는 어휘 수만큼)
+_vocab_lock = threading.Lock()
+_vocab_ids = {}
+_vocab_words = []
+_vocab_index = pd.Index([], dtype=str)
+
+
+def encode_words(series):
+    global _vocab_index
+    cat = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype(str).astype("category")
+    words = cat.cat.categories.astype(str)
+    with _vocab_lock:
+        for word in words:
+            if word not in _vocab_ids:
+                _vocab_ids[word] = len(_vocab_words)
+                _vocab_words.append(word)
+        if len(_vocab_index) != len(_vocab_words):
+            _vocab_index = pd.Index(_vocab_words, dtype=str)
+        ids = np.fromiter((_vocab_ids[word] for word in words), dtype=np.int64, count=len(words))
+        categories = _vocab_index
+    codes = cat.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, ids[codes] if len(ids) else codes, -1)
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(categories)), index=series.index, name=series.name)
+
+
+def vocabulary_size():
+    with _vocab_lock:
+        return len(_vocab_words), int(_vocab_index.memory_usage(deep=True))
+
+
+# ✅ 표 메모리 (전역 단어 사전은 주차끼리 공유하므로 빼고 셈)
+def frame_bytes(df):
+    total = int(df.memory_usage(deep=True).sum())
+    if "단어" in df.columns and isinstance(df["단어"].dtype, pd.CategoricalDtype):
+        categories = df["단어"].cat.categories
+        if categories is _vocab_index or categories.equals(_vocab_index[:len(categories)]):
+            total -= int(categories.memory_usage(deep=True))
+    return total
+
+
+# ✅ 읽은 표 → 메모리용 압축 표현
+# - 단어: 전역 단어 사전 코드 / 그룹·감정·날짜: 범주형 / 문장ID: 정수 (형태소·문장 표 모두 정수일 때만, 아니면 둘 다 문자열)
+def compact_frames(word_df, morph_df, sent_df):
+    morph_ids, sent_ids = typed_sentence_ids(morph_df["문장ID"]), typed_sentence_ids(sent_df["문장ID"])
+    if morph_ids.dtype.kind == "i" and sent_ids.dtype.kind == "i":
+        ids = np.concatenate([morph_ids.to_numpy(), sent_ids.to_numpy()])
+        if not len(ids) or (np.iinfo(np.int32).min <= ids.min() and ids.max() <= np.iinfo(np.int32).max):
+            morph_ids, sent_ids = morph_ids.astype("int32"), sent_ids.astype("int32")
+    else:
+        morph_ids, sent_ids = morph_df["문장ID"].astype(str), sent_df["문장ID"].astype(str)
+    morph_df = morph_df.assign(문장ID=morph_ids)
+    sent_df = sent_df.assign(문장ID=sent_ids)
+
+    frames = {"word": word_df, "morph": morph_df, "sent": sent_df}
+    for name, df in frames.items():
+        columns = {col: df[col].astype(str).astype("category") for col in CATEGORY_COLUMNS if col in df.columns}
+        if "단어" in df.columns:
+            columns["단어"] = encode_words(df["단어"])
+        frames[name] = df.assign(**columns)
+    return frames
+
+
+def _read_frames(week):
+    warnings = []
+    if all(has_columnar(week, table) for table in TABLES):
+        word_df = read_table(week, "word")
+        morph_df = read_table(week, "morph", MORPH_COLUMNS)
+        sent_df = read_table(week, "sent", SENT_COLUMNS)
+    else:
+        word_df = read_csv(week, WORD_CSV)
+        morph_df, warnings = read_morph_csv(week)
+        if morph_df is None:
+            raise ValueError("❌ 형태소 분석 데이터가 없거나 비어 있습니다.")
+        try:
+            sent_df = read_csv(week, SENT_CSV)
+        except Exception as e:
+            raise ValueError(f"{SENT_CSV} 불러오기 오류: {e}") from e
+    return word_df, morph_df, sent_df, warnings
+
+
+# ✅ 주차 1개 로드 + 압축 표현으로 정리 (주차마다 한 번만 수행)
+def _build_week(week):
+    word_df, morph_df, sent_df, warnings = _read_frames(week)
+    frames = compact_frames(word_df, morph_df, sent_df)
+    word_df = frames["word"]
+    return {
+        "week": week,
+        **frames,
+        "word_data": {brand: df for brand, df in word_df.groupby("그룹", observed=True)},
+        "warnings": warnings,
+        "bytes": sum(frame_bytes(df) for df in frames.values()),
+        "rows": {name: len(df) for name, df in frames.items()},
+        "loaded_at": time.time(),
+        "artifacts": {},
+    }
+
+
+# ✅ 프로세스 전역 주차 LRU (연관어·긍부정 탭 공용, 최대 WEEK_CACHE_SIZE 주차)
+_lock = threading.Lock()
+_weeks = OrderedDict()
+_loading = {}
+
+
+def load_week(week):
+    with _lock:
+        if week in _weeks:
+            _weeks.move_to_end(week)
+            return _weeks[week]
+        week_lock = _loading.setdefault(week, threading.Lock())
+
+    # 같은 주차를 여러 세션이 동시에 요청해도 한 번만 읽음
+    with week_lock:
+        with _lock:
+            if week in _weeks:
+                _weeks.move_to_end(week)
+                return _weeks[week]
+        entry = _build_week(week)
+        with _lock:
+            _weeks[week] = entry
+            while len(_weeks) > WEEK_CACHE_SIZE:
+                _weeks.popitem(last=False)
+            _loading.pop(week, None)
+        return entry
+
+
+# ✅ 주차별 파생 데이터(색인 등) 메모: 주차 캐시 항목에 함께 보관 → 주차가 LRU 에서 빠지면 같이 해제
+def week_artifact(week, name, builder):
+    entry = load_week(week)
+    artifacts = entry["artifacts"]
+    if name not in artifacts:
+        artifacts[name] = builder(entry)
+    return artifacts[name]
+
+
+# ✅ 캐시된 주차별 메모리 사용량 (최근 사용 순)
+def cached_weeks_report():
+    with _lock:
+        entries = list(_weeks.values())[::-1]
+    return [
+        {
+            "주차": entry["week"],
+            "형태소 행": entry["rows"]["morph"],
+            "문장 행": entry["rows"]["sent"],
+            "메모리(MB)": round(entry["bytes"] / 1024 ** 2, 1),
+            "바이트/행": round(entry["bytes"] / max(1, sum(entry["rows"].values()))),
+        }
+        for entry in entries
+    ]
+
+
+# ✅ 메모리 보고: 표별 행당 바이트 (이전 표현: 문자열 컬럼 그대로 + 문장ID 문자열 / 이후: 압축 표현)
+def memory_report(week):
+    word_df, morph_df, sent_df, _ = _read_frames(week)
+    before = {
+        "word": word_df,
+        "morph": morph_df.assign(문장ID=morph_df["문장ID"].astype(str)),
+        "sent": sent_df.assign(문장ID=sent_df["문장ID"].astype(str)),
+    }
+    after = compact_frames(word_df, morph_df, sent_df)
+    report = []
+    for name in TABLES:
+        rows = max(1, len(before[name]))
+        old = int(before[name].memory_usage(deep=True).sum())
+        new = frame_bytes(after[name])
+        report.append({
+            "표": name,
+            "행": len(before[name]),
+            "이전 바이트/행": round(old / rows, 1),
+            "이후 바이트/행": round(new / rows, 1),
+            "절감(%)": round((1 - new / old) * 100, 1) if old else 0.0,
+        })
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="주차 폴더의 CSV 를 Parquet 로 변환")
+    parser.add_argument("weeks", nargs="+", help="예: 2025_03w1 2025_03w2")
+    parser.add_argument("--memory", action="store_true", help="변환 대신 메모리 표현 전후 행당 바이트 보고")
+    args = parser.parse_args()
+
+    if args.memory:
+        for week in args.weeks:
+            for row in memory_report(week):
+                print(
+                    f"{week}/{row['표']}: {row['행']:,}행, {row['이전 바이트/행']} → {row['이후 바이트/행']} 바이트/행"
+                    f" ({row['절감(%)']}% 절감)"
+                )
+        words, size = vocabulary_size()
+        print(f"전역 단어 사전 (주차 공용): {words:,}개, {size / 1024:,.0f} KB")
+        raise SystemExit
+
+    for week in args.weeks:
+        t0 = time.perf_counter()
+        written, warnings = convert_week(week)
+        for message in warnings:
+            print(message)
+        for name, (rows, size) in written.items():
+            print(f"{week}/{TABLES[name]}: {rows:,}행, {size / 1024:,.0f} KB")
+        print(f"{week}: {time.perf_counter() - t0:.1f}초")
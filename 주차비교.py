@@ -0,0 +1,186 @@
+import os
+import sys
+import types
+import threading
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from 주차데이터 import WEEKS, load_week
+
+
+# ✅ 여러 주차 비교 엔진 (트렌드 변화 분석 탭)
+# - 주차마다 원본 행을 한 번만 읽어 작은 요약표(브랜드×단어 긍·부정 빈도, 브랜드별 합계)로 줄여 저장
+# - 요약은 주차 입력 서명별로 .cache 에 보관 → 새 주차가 추가되면 그 주차만 계산 (프로세스 풀에서 병렬)
+# - 주차 간 증감도 인접 주차 쌍마다 메모 → 새 주차는 마지막 쌍 하나만 추가로 계산
+# - 풀은 spawn 으로 시작: 멀티스레드 Streamlit 서버를 fork 하면 다른 스레드가 잡고 있던 락(주차 LRU·SQLite 캐시)을
+#   자식이 물려받아 멈출 수 있음. 자식은 이 모듈만 새로 불러오므로 Streamlit 을 끌어오는 import 는 함수 안에서
+#   (spawn 자식은 부모의 __main__ 파일을 다시 실행하는데 Streamlit 은 페이지 스크립트가 __main__ → 자식을 띄우는 동안 가림)
+SUMMARY_DIR = os.environ.get(
+    "WEEK_SUMMARY_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "week_summaries")
+)
+MAX_PROCESSES = int(os.environ.get("WEEK_COMPARE_PROCESSES", "4"))
+MIN_COUNT = 10  # 감정 변화 순위에 넣을 최소 빈도 (빈도가 작으면 비율이 크게 흔들림)
+
+_lock = threading.Lock()
+_summaries = {}  # (week, 서명) → 요약
+_deltas = {}  # (이전 주차, 서명, 주차, 서명) → 증감표
+
+
+def summary_path(week, signature, table):
+    return os.path.join(SUMMARY_DIR, f"{week}.{signature}.{table}.parquet")
+
+
+# ✅ 주차 1개 요약 (프로세스 풀 작업: 결과는 파일로 쓰고 경로만 돌려줌)
+def summarize_week(week, signature):
+    entry = load_week(week)
+    word_df = entry["word"]
+    words = (
+        word_df.assign(그룹=word_df["그룹"].astype(str), 단어=word_df["단어"].astype(str))
+        .groupby(["그룹", "단어"], sort=True)[["positive", "negative"]]
+        .sum()
+        .astype("int64")
+        .reset_index()
+    )
+    brands = words.groupby("그룹", sort=True)[["positive", "negative"]].sum().reset_index()
+    sent_df = entry["sent"]
+    if "원본링크" in sent_df.columns:
+        mentions = sent_df.groupby(sent_df["그룹"].astype(str))["원본링크"].nunique()
+        brands["언급량"] = brands["그룹"].map(mentions).fillna(0).astype("int64")
+
+    os.makedirs(SUMMARY_DIR, exist_ok=True)
+    for table, df in {"words": words, "brands": brands}.items():
+        path = summary_path(week, signature, table)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+    return week
+
+
+def _signature(week):
+    from 주차산출물 import input_signature  # 주차산출물 → 정적파일 → streamlit (풀 자식에서는 불러오지 않음)
+
+    return input_signature(week)
+
+
+def _read_summary(week, signature):
+    return {table: pd.read_parquet(summary_path(week, signature, table)) for table in ["words", "brands"]}
+
+
+_main_lock = threading.Lock()
+
+
+@contextmanager
+def _worker_main():
+    main = sys.modules["__main__"]
+    if getattr(main, "__file__", None) == os.path.abspath(__file__):  # python 주차비교.py: 자식이 다시 실행해도 안전
+        yield
+        return
+    with _main_lock:
+        sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            yield
+        finally:
+            sys.modules["__main__"] = main
+
+
+# ✅ 주차 요약 모으기: 메모 → 디스크 캐시 → (없는 주차만) 프로세스 풀 병렬 계산
+# - 반환: ({주차: 요약}, 새로 계산한 주차 목록)
+def load_summaries(weeks, max_workers=MAX_PROCESSES, on_progress=None):
+    signatures = {week: _signature(week) for week in weeks}
+    summaries, missing = {}, []
+    for week in weeks:
+        key = (week, signatures[week])
+        with _lock:
+            cached = _summaries.get(key)
+        if cached is not None:
+            summaries[week] = cached
+        elif all(os.path.exists(summary_path(week, signatures[week], table)) for table in ["words", "brands"]):
+            summaries[week] = _read_summary(*key)
+        else:
+            missing.append(week)
+
+    if missing:
+        workers = max(1, min(max_workers, len(missing)))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            with _worker_main():  # 자식 프로세스는 submit 에서 시작됨
+                futures = [pool.submit(summarize_week, week, signatures[week]) for week in missing]
+            for done, future in enumerate(as_completed(futures), start=1):
+                week = future.result()
+                summaries[week] = _read_summary(week, signatures[week])
+                if on_progress:
+                    on_progress(done, len(missing), week)
+
+    with _lock:
+        for week, summary in summaries.items():
+            _summaries[(week, signatures[week])] = summary
+    return {week: summaries[week] for week in weeks}, missing
+
+
+def _week_pair_delta(prev_words, words):
+    merged = prev_words.merge(words, on=["그룹", "단어"], how="outer", suffixes=("_이전", "_이번")).fillna(0)
+    for suffix in ["_이전", "_이번"]:
+        total = merged[f"positive{suffix}"] + merged[f"negative{suffix}"]
+        merged[f"빈도{suffix}"] = total.astype("int64")
+        merged[f"긍정비율{suffix}"] = (merged[f"positive{suffix}"] / total.where(total > 0) * 100).round(1)
+    merged["증감"] = merged["빈도_이번"] - merged["빈도_이전"]
+    merged["증감률"] = (merged["증감"] / merged["빈도_이전"].where(merged["빈도_이전"] > 0) * 100).round(1)
+    merged["감정변화"] = (merged["긍정비율_이번"] - merged["긍정비율_이전"]).round(1)
+    return merged[[
+        "그룹", "단어", "빈도_이전", "빈도_이번", "증감", "증감률", "긍정비율_이전", "긍정비율_이번", "감정변화",
+    ]]
+
+
+# ✅ 인접 주차 쌍별 단어 증감표 (쌍마다 메모)
+def week_deltas(summaries, weeks):
+    result = {}
+    for prev, week in zip(weeks, weeks[1:]):
+        key = (prev, _signature(prev), week, _signature(week))
+        with _lock:
+            delta = _deltas.get(key)
+        if delta is None:
+            delta = _week_pair_delta(summaries[prev]["words"], summaries[week]["words"])
+            with _lock:
+                _deltas[key] = delta
+        result[(prev, week)] = delta
+    return result
+
+
+# ✅ 급상승·급하락 단어, 감정 변화가 큰 단어 (브랜드 하나, 주차 쌍 하나)
+def top_movers(delta, brand, n=10):
+    brand_delta = delta[delta["그룹"] == brand]
+    rising = brand_delta[brand_delta["증감"] > 0].nlargest(n, "증감")
+    falling = brand_delta[brand_delta["증감"] < 0].nsmallest(n, "증감")
+    stable = brand_delta[(brand_delta["빈도_이전"] >= MIN_COUNT) & (brand_delta["빈도_이번"] >= MIN_COUNT)]
+    shifted = stable.reindex(stable["감정변화"].abs().sort_values(ascending=False).index).head(n)
+    return rising, falling, shifted
+
+
+# ✅ 주차별 브랜드 추이 (긍정 비율, 언급량)
+def brand_trend(summaries, weeks):
+    labels = {week: label for label, week in WEEKS.items()}
+    frames = []
+    for week in weeks:
+        brands = summaries[week]["brands"].copy()
+        brands["주차"] = labels.get(week, week)
+        brands["긍정비율"] = (brands["positive"] / (brands["positive"] + brands["negative"]).where(lambda s: s > 0) * 100).round(1)
+        frames.append(brands)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+if __name__ == "__main__":
+    import time
+    import argparse
+
+    parser = argparse.ArgumentParser(description="주차 요약 계산 (이미 계산된 주차는 건너뜀)")
+    parser.add_argument("weeks", nargs="*", default=list(WEEKS.values()))
+    parser.add_argument("--workers", type=int, default=MAX_PROCESSES)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    summaries, computed = load_summaries(args.weeks, max_workers=args.workers)
+    print(f"새로 계산: {computed or '없음'} · {time.perf_counter() - t0:.1f}초")
+    for (prev, week), delta in week_deltas(summaries, args.weeks).items():
+        print(f"{prev} → {week}: 단어 {len(delta):,}개, 증가 {(delta['증감'] > 0).sum():,} / 감소 {(delta['증감'] < 0).sum():,}")
@@ -0,0 +1,615 @@
+import os
+import csv
+import json
+import time
+import heapq
+import hashlib
+import threading
+from itertools import islice, repeat
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import requests
+
+from 주차데이터 import (
+    MORPH_CSVS, SENT_CSV, TABLES, WORD_CSV, has_columnar, load_week, source_path, week_artifact, week_path,
+)
+from 문장인덱스 import build_sentence_index, sentence_positions
+from 단어순위 import (
+    SENTIMENTS, network_tables, node_records, rank_morph_counts, rank_word_counts, rank_word_counts_by_sentiment,
+)
+from 정적파일 import EXPORT_DIR, STATIC_DIR, write_shard
+from 그래프배치 import bubble_layout, network_layout
+from 동시출현 import cooccurrence_links, cooccurrence_pairs
+from 문장스니펫 import highlight_snippets, snippet_settings, truncate_snippets
+
+
+# ✅ 주차별 사전 계산 산출물 (연관어·긍부정 탭이 그대로 그리는 데이터)
+# - 주차 데이터는 공개 후 바뀌지 않으므로 한 번만 계산해 <주차>/artifacts/ 에 저장
+# - manifest.json 에 입력 파일 체크섬을 기록 → 입력이 바뀌거나 ARTIFACT_VERSION 이 오르면 무효
+ARTIFACT_VERSION = 6  # 산출물 계산 방식이 바뀌면 올림
+ARTIFACT_DIR = "artifacts"
+MANIFEST = "manifest.json"
+ARTIFACT_FILES = {
+    "relation": "relation.json",
+    "sentiment": "sentiment.json",
+    "daily": "daily.json",
+    "rankings": "rankings.json",
+}
+TOP_K = 10
+RANK_LIMIT = 200  # 브랜드·감정별로 보관할 순위 길이 (상위 단어 수 슬라이더 최대값)
+SENTIMENT_FILTERS = {"전체": ("positive", "negative"), "긍정": ("positive",), "부정": ("negative",)}
+BRANDS = ["KT", "KT Skylife", "LGU+", "SKB"]
+VIEW_CACHE_SIZE = int(os.environ.get("VIEW_CACHE_SIZE", "32"))  # 주차마다 메모할 최대 보기 데이터 수 (상위 k·감정 필터 조합별)
+REMOTE_CHECK_TTL = int(os.environ.get("REMOTE_CHECK_TTL", "600"))  # 원격(GitHub raw) 입력 변경 확인 간격(초)
+REMOTE_TIMEOUT = 5
+
+
+def artifact_path(week, filename):
+    return week_path(week, os.path.join(ARTIFACT_DIR, filename))
+
+
+# ✅ 산출물 입력 파일: 주차데이터._build_week 이 실제로 읽는 파일 (Parquet 가 다 있으면 Parquet, 아니면 CSV)
+# - CSV 는 로컬에 없으면 GitHub raw 에서 읽으므로 원격 파일도 입력에 포함
+# - 항상 이름순 → manifest 기록(이름순)·입력 서명과 같은 순서
+def input_files(week):
+    if all(has_columnar(week, table) for table in TABLES):
+        return sorted(TABLES.values())
+    return sorted([WORD_CSV, *MORPH_CSVS, SENT_CSV])
+
+
+def is_local(week, name):
+    return os.path.exists(week_path(week, name))
+
+
+def file_checksum(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ✅ 원격 입력의 내용 식별값: HEAD 응답의 ETag (없으면 Last-Modified·길이), REMOTE_CHECK_TTL 동안 메모
+# - 확인하지 못하면 None (실패도 메모 → 오프라인에서 화면마다 기다리지 않음)
+_remote_lock = threading.Lock()
+_remote = {}  # url → (확인 시각, 식별값)
+
+
+def remote_validator(url):
+    now = time.time()
+    with _remote_lock:
+        cached = _remote.get(url)
+    if cached and now - cached[0] < REMOTE_CHECK_TTL:
+        return cached[1]
+    try:
+        response = requests.head(url, timeout=REMOTE_TIMEOUT, allow_redirects=True)
+        response.raise_for_status()
+        headers = response.headers
+        value = headers.get("ETag") or headers.get("Last-Modified") or headers.get("Content-Length")
+    except requests.RequestException:
+        value = None
+    with _remote_lock:
+        _remote[url] = (now, value)
+    return value
+
+
+def _file_info(week, name):
+    if not is_local(week, name):
+        url = source_path(week, name)
+        validator = remote_validator(url)
+        if validator is None:
+            raise ValueError(f"{week}: 원격 입력 {url} 의 변경 여부를 확인할 수 없습니다. (원본 CSV 를 내려받거나 Parquet 로 변환 후 실행)")
+        return {"url": url, "etag": validator}
+    path = week_path(week, name)
+    stat = os.stat(path)
+    return {"sha256": file_checksum(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+# ✅ 입력이 manifest 기록과 같은지 확인
+# - 로컬: 크기·수정시각이 같으면 체크섬 계산 생략, 다르면 체크섬으로 최종 판단 (파일 복사·touch 로 시각만 바뀐 경우)
+# - 원격: ETag 비교 (확인할 수 없으면 바뀌었는지 알 수 없으므로 기록을 그대로 씀)
+def inputs_unchanged(week, manifest):
+    recorded = manifest.get("inputs", {})
+    if set(recorded) != set(input_files(week)):
+        return False
+    for name, info in recorded.items():
+        if ("etag" in info) == is_local(week, name):  # 로컬 ↔ 원격이 바뀜
+            return False
+        if "etag" in info:
+            current = remote_validator(info["url"])
+            if current is not None and current != info["etag"]:
+                return False
+            continue
+        path = week_path(week, name)
+        stat = os.stat(path)
+        if stat.st_size == info["size"] and stat.st_mtime_ns == info["mtime_ns"]:
+            continue
+        if stat.st_size != info["size"] or file_checksum(path) != info["sha256"]:
+            return False
+    return True
+
+
+def read_manifest(week):
+    try:
+        with open(artifact_path(week, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_fresh(week, manifest=None):
+    manifest = manifest or read_manifest(week)
+    return (
+        manifest is not None
+        and manifest.get("version") == ARTIFACT_VERSION
+        and manifest.get("snippets") == snippet_settings()
+        and all(os.path.exists(artifact_path(week, filename)) for filename in ARTIFACT_FILES.values())
+        and inputs_unchanged(week, manifest)
+    )
+
+
+# ✅ 주차별 단어 쌍 표 (희소 행렬 곱, 주차 캐시에 메모)
+def week_cooccurrence(entry):
+    # 쌍은 순위표(브랜드·감정별 상위 RANK_LIMIT)에 든 단어끼리만 → 그래프에 그리는 단어 쌍이 상위 MAX_PAIRS 에서 밀리지 않음
+    return week_artifact(entry["week"], "cooccurrence", lambda e: cooccurrence_pairs(
+        e["morph"], ranked=rank_word_counts_by_sentiment(e["word"], RANK_LIMIT)
+    ))
+
+
+def week_sentence_index(entry):
+    return week_artifact(entry["week"], "sentence_index", lambda e: build_sentence_index(e["morph"], e["sent"]))
+
+
+# ✅ 여러 노드·버블의 문장 스니펫을 한 번에 (열 단위)
+# - 노드별 일치 문장 위치를 이어 붙여 문장 열 전체를 한 번에 스니펫으로 만든 뒤 노드별로 나눔
+# - items: [(브랜드, 단어, 감정), ...]
+def _matched_sentences(sent_df, index, items):
+    positions = [sentence_positions(index, brand, word, sentiment) for brand, word, sentiment in items]
+    sizes = [len(p) for p in positions]
+    rows = sent_df.iloc[np.concatenate(positions) if positions else []]
+    return rows, sizes, np.cumsum([0] + sizes)
+
+
+def relation_snippets_batch(sent_df, index, items, freqs):
+    rows, sizes, bounds = _matched_sentences(sent_df, index, items)
+    texts = highlight_snippets(rows["문장"], np.repeat(np.array([word for _, word, _ in items], dtype=object), sizes))
+    links = rows["원본링크"].tolist()
+    return [
+        {"문장": texts[lo:hi], "원본링크": links[lo:hi], "count": int(freq)}
+        for freq, lo, hi in zip(freqs, bounds[:-1], bounds[1:])
+    ]
+
+
+def sentiment_snippets_batch(sent_df, index, items):
+    rows, sizes, bounds = _matched_sentences(sent_df, index, items)
+    texts = truncate_snippets(rows["문장"])
+    links = rows["원본링크"].tolist()
+    return [{"문장": texts[lo:hi], "링크": links[lo:hi]} for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+# ✅ 연관어 탭: 브랜드별 상위 단어 → 네트워크 노드·링크 + 노드별 문장 스니펫
+# - 링크: 브랜드 → 단어 + 같은 브랜드 상위 단어끼리의 동시 출현 링크 (kind="cooccur", PMI 상위)
+def build_relation(entry, index):
+    top = rank_word_counts(entry["word"], TOP_K)
+    sent_df = entry["sent"]
+
+    node_table, link_table = network_tables(top)
+    # 단어 노드마다 처음 나온 브랜드 기준으로 관련 문장 구성
+    words = top.drop_duplicates("node_id")
+    sentences = dict(zip(words["node_id"], relation_snippets_batch(
+        sent_df, index, list(zip(words["그룹"], words["단어"], words["감정"])), words["freq"]
+    )))
+
+    return {
+        "nodes": node_records(node_table),
+        "links": link_table[["source", "target"]].to_dict("records") + cooccurrence_links(week_cooccurrence(entry), top),
+        "sentences": sentences,
+    }
+
+
+# ✅ 긍부정 탭: 브랜드별 버블 노드 + (단어_감정) 키별 문장
+def build_sentiment(entry, index):
+    top_words = rank_morph_counts(entry["morph"], TOP_K)
+    sent_df = entry["sent"]
+    bubbles, sentences, items = {}, {}, []
+    for brand in BRANDS:
+        brand_top = top_words[top_words["그룹"] == brand]
+        keys = brand_top["단어"] + "_" + brand_top["감정"]
+        bubbles[brand] = [
+            {"id": word, "key": key, "group": sentiment, "size": int(count)}
+            for word, key, sentiment, count in zip(brand_top["단어"], keys, brand_top["감정"], brand_top["count"])
+        ]
+        sentences[brand] = {}
+        items += [(brand, key, word, sentiment) for word, key, sentiment in zip(brand_top["단어"], keys, brand_top["감정"])]
+    snippets = sentiment_snippets_batch(sent_df, index, [(brand, word, sentiment) for brand, _, word, sentiment in items])
+    for (brand, key, _, _), snippet in zip(items, snippets):
+        sentences[brand][key] = snippet
+    return {"bubbles": bubbles, "sentences": sentences}
+
+
+# ✅ 일별 집계: 브랜드별 언급량(고유 링크 수), 긍정 단어 비율 (필요한 컬럼이 없으면 None)
+def build_daily(entry):
+    morph_df, sent_df = entry["morph"], entry["sent"]
+    mentions = None
+    if all(col in sent_df.columns for col in ["날짜", "그룹", "원본링크"]):
+        mention_daily = sent_df.groupby(["날짜", "그룹"], observed=True)["원본링크"].nunique().reset_index(name="언급량")
+        mentions = mention_daily.astype({"날짜": str, "그룹": str}).to_dict("records")
+
+    positive_ratio = None
+    if "날짜" in morph_df.columns:
+        trend_df = (
+            morph_df.groupby(["날짜", "그룹", "감정"], observed=True)["단어"]
+            .count()
+            .reset_index(name="count")
+            .pivot_table(index=["날짜", "그룹"], columns="감정", values="count", fill_value=0, observed=True)
+            .reset_index()
+        )
+        trend_df.columns = [str(col) for col in trend_df.columns]
+        for sentiment in ["positive", "negative"]:
+            if sentiment not in trend_df.columns:
+                trend_df[sentiment] = 0
+        trend_df["긍정비율"] = trend_df["positive"] / (trend_df["positive"] + trend_df["negative"] + 1e-9) * 100
+        positive_ratio = trend_df[["날짜", "그룹", "positive", "negative", "긍정비율"]].astype({"날짜": str, "그룹": str}).to_dict("records")
+    return {"mentions": mentions, "positive_ratio": positive_ratio}
+
+
+# ✅ 상위 단어 순위표: 주차마다 한 번 정렬해 브랜드·감정별로 RANK_LIMIT 개까지 보관 (열 단위)
+# - relation: 단어 빈도표 순위 (freq, 동순위용 order) / sentiment: 형태소 문장 수 순위
+# - pairs: 순위표 단어끼리의 동시 출현 쌍 → 어떤 k 든 다시 정렬하지 않고 앞에서 잘라 씀
+def build_rankings(entry):
+    relation, sentiment = {}, {}
+    words = rank_word_counts_by_sentiment(entry["word"], RANK_LIMIT)
+    for (brand, sent), ranks in words.groupby(["그룹", "감정"], sort=True):
+        relation.setdefault(brand, {})[sent] = {
+            "단어": ranks["단어"].tolist(),
+            "freq": ranks["freq"].astype(int).tolist(),
+            "order": ranks["_order"].astype(int).tolist(),
+        }
+    morphs = rank_morph_counts(entry["morph"], RANK_LIMIT)
+    for (brand, sent), ranks in morphs.groupby(["그룹", "감정"], sort=True):
+        sentiment.setdefault(brand, {})[sent] = {"단어": ranks["단어"].tolist(), "count": ranks["count"].astype(int).tolist()}
+
+    pairs = week_cooccurrence(entry)  # 이미 순위표 단어끼리의 쌍만
+    return {
+        "relation": relation,
+        "sentiment": sentiment,
+        "pairs": {col: pairs[col].tolist() for col in ["그룹", "source", "target", "count", "pmi"]},
+    }
+
+
+def build_artifacts(entry):
+    index = week_sentence_index(entry)
+    return {
+        "week": entry["week"],
+        "relation": build_relation(entry, index),
+        "sentiment": build_sentiment(entry, index),
+        "daily": build_daily(entry),
+        "rankings": build_rankings(entry),
+        "warnings": list(entry["warnings"]),
+        "source": "live",
+    }
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+# ✅ 산출물 저장: 산출물 파일을 먼저 쓰고 manifest 를 마지막에 씀 → 중간에 끊기면 manifest 가 옛 것이라 무효 처리
+def write_artifacts(week, artifacts, inputs):
+    os.makedirs(artifact_path(week, ""), exist_ok=True)
+    written = {}
+    for name, filename in ARTIFACT_FILES.items():
+        data = json.dumps(artifacts[name], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        _write_atomic(artifact_path(week, filename), data)
+        written[filename] = {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+    manifest = {
+        "version": ARTIFACT_VERSION,
+        "snippets": snippet_settings(),
+        "week": week,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "inputs": inputs,
+        "artifacts": written,
+        "warnings": artifacts["warnings"],
+    }
+    _write_atomic(artifact_path(week, MANIFEST), json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+    return manifest
+
+
+# ✅ 주차 1개 사전 계산 (입력이 그대로면 건너뜀)
+def precompute_week(week, force=False):
+    if not force and is_fresh(week):
+        return None
+    inputs = {name: _file_info(week, name) for name in input_files(week)}
+    manifest = write_artifacts(week, build_artifacts(load_week(week)), inputs)
+    # 방금 쓴 산출물이 바로 최신으로 인정되지 않으면 탭이 매번 다시 계산함 → 여기서 바로 알림
+    if not is_fresh(week, manifest):
+        raise RuntimeError(f"{week}: 사전 계산 직후 산출물이 최신으로 인정되지 않습니다. (입력 파일 목록·manifest 확인)")
+    return manifest
+
+
+def read_artifacts(week, manifest):
+    artifacts = {"week": week, "warnings": manifest.get("warnings", []), "source": "precomputed"}
+    for name, filename in ARTIFACT_FILES.items():
+        with open(artifact_path(week, filename), encoding="utf-8") as f:
+            artifacts[name] = json.load(f)
+    return artifacts
+
+
+# ✅ 탭에서 쓰는 진입점: 최신 사전 계산 산출물이 있으면 그것만 읽고(원본 행 수와 무관),
+#    없거나 무효면 주차 데이터를 올려 같은 함수로 계산 (주차 캐시에 메모)
+_lock = threading.Lock()
+_loaded = {}  # week → (manifest built_at, artifacts)
+
+
+def week_artifacts(week):
+    manifest = read_manifest(week)
+    if manifest is not None and is_fresh(week, manifest):
+        with _lock:
+            cached = _loaded.get(week)
+        if cached and cached[0] == manifest["built_at"]:
+            return cached[1]
+        artifacts = read_artifacts(week, manifest)
+        with _lock:
+            _loaded[week] = (manifest["built_at"], artifacts)
+        return artifacts
+    return week_artifact(week, "precomputed", build_artifacts)
+
+
+# ✅ 산출물에서 파생되는 화면용 데이터(그림·JSON·배치 좌표) 메모
+# - 산출물 dict 가 주차별로 메모되므로 같은 주차로 돌아오거나 재실행해도 다시 계산하지 않음
+def derived(artifacts, name, builder):
+    if name not in artifacts:
+        artifacts[name] = builder(artifacts)
+    return artifacts[name]
+
+
+# ✅ 보기(상위 k·감정 필터)별 파생 데이터는 주차마다 최근 VIEW_CACHE_SIZE 개만 LRU 로 메모
+# - 슬라이더를 움직일 때마다 조합이 새로 생기므로 다 쌓아 두지 않음 (밀려난 보기는 순위표에서 O(k) 로 다시 만듦)
+_views_lock = threading.Lock()
+
+
+def derived_view(artifacts, name, builder):
+    with _views_lock:
+        views = artifacts.setdefault("views", OrderedDict())
+        if name in views:
+            views.move_to_end(name)
+            return views[name]
+    value = builder(artifacts)
+    with _views_lock:
+        views[name] = value
+        views.move_to_end(name)
+        while len(views) > VIEW_CACHE_SIZE:
+            views.popitem(last=False)
+    return value
+
+
+# ✅ 문장 스니펫은 열 단위({"문장": [...], "링크": [...]})로 보관 → 행마다 dict 를 두지 않음
+# - 화면(JSON)으로 보낼 때만 행 목록으로 펼침 (목록이 아닌 값은 모든 행에 반복)
+def snippet_records(snippets):
+    columns = {name: values for name, values in snippets.items() if isinstance(values, list)}
+    scalars = {name: value for name, value in snippets.items() if not isinstance(value, list)}
+    return [dict(zip(columns, values), **scalars) for values in zip(*columns.values())]
+
+
+# ✅ 보기(브랜드별 상위 k, 감정 필터): 순위표 앞에서 O(k) 로 잘라 만듦 (최근 보기만 메모)
+def _view_key(name, k, sentiments):
+    return f"{name}_{k}_{'+'.join(sentiments)}"
+
+
+# 연관어: 브랜드마다 감정별 목록을 (빈도 내림차순, order) 로 병합해 앞에서 k개 → rank_word_counts(word_df, k) 와 같음
+def relation_top(artifacts, k, sentiments=SENTIMENTS):
+    rows = []
+    for brand, by_sentiment in artifacts["rankings"]["relation"].items():
+        lists = [
+            zip(repeat(sentiment), ranks["단어"][:k], ranks["freq"][:k], ranks["order"][:k])
+            for sentiment, ranks in by_sentiment.items()
+            if sentiment in sentiments
+        ]
+        merged = heapq.merge(*lists, key=lambda item: (-item[2], item[3]))
+        rows += [(brand, word, sentiment, freq) for sentiment, word, freq, _ in islice(merged, k)]
+    top = pd.DataFrame(rows, columns=["그룹", "단어", "감정", "freq"])
+    top["node_id"] = top["단어"] + "_" + top["감정"]
+    return top
+
+
+def relation_view(artifacts, k=TOP_K, sentiments=SENTIMENTS):
+    def build(a):
+        top = relation_top(a, k, sentiments)
+        node_table, link_table = network_tables(top)
+        return {
+            "nodes": node_records(node_table),
+            "links": link_table[["source", "target"]].to_dict("records")
+            + cooccurrence_links(pd.DataFrame(a["rankings"]["pairs"]), top),
+            # 노드별 문장 기준 (처음 나온 브랜드)
+            "words": list(top.drop_duplicates("node_id")[["node_id", "그룹", "단어", "감정", "freq"]].itertuples(index=False, name=None)),
+        }
+    return derived_view(artifacts, _view_key("relation_view", k, sentiments), build)
+
+
+# 긍부정: 브랜드마다 감정별 상위 k개를 (개수 내림차순, 단어, 감정) 순으로 병합 → build_sentiment 와 같은 순서
+def sentiment_view(artifacts, k=TOP_K, sentiments=SENTIMENTS):
+    def build(a):
+        bubbles = {}
+        for brand in BRANDS:
+            lists = [
+                zip(repeat(sentiment), ranks["단어"][:k], ranks["count"][:k])
+                for sentiment, ranks in a["rankings"]["sentiment"].get(brand, {}).items()
+                if sentiment in sentiments
+            ]
+            merged = heapq.merge(*lists, key=lambda item: (-item[2], item[1], item[0]))
+            bubbles[brand] = [
+                {"id": word, "key": f"{word}_{sentiment}", "group": sentiment, "size": count}
+                for sentiment, word, count in merged
+            ]
+        return bubbles
+    return derived_view(artifacts, _view_key("sentiment_view", k, sentiments), build)
+
+
+# ✅ 보기에 든 단어의 문장 스니펫: 사전 계산분(기본 상위 TOP_K)은 그대로 쓰고,
+#    새로 든 단어만 그때 주차 데이터(문장 색인)에서 만들어 메모 → k 를 올렸다 내려도 다시 만들지 않음
+def relation_snippets(artifacts, view):
+    default = {node_id: brand for node_id, brand, *_ in relation_view(artifacts)["words"]}
+    stored = artifacts["relation"]["sentences"]
+    extra = derived(artifacts, "relation_snippets", lambda a: {})
+    snippets, missing = {}, []
+    for node_id, brand, word, sentiment, freq in view["words"]:
+        if default.get(node_id) == brand and node_id in stored:
+            snippets[node_id] = stored[node_id]
+        elif (brand, node_id) in extra:
+            snippets[node_id] = extra[(brand, node_id)]
+        else:
+            missing.append((node_id, brand, word, sentiment, freq))
+    if missing:
+        entry = load_week(artifacts["week"])
+        index = week_sentence_index(entry)
+        built = relation_snippets_batch(
+            entry["sent"], index, [(brand, word, sentiment) for _, brand, word, sentiment, _ in missing], [item[4] for item in missing]
+        )
+        for (node_id, brand, *_), snippet in zip(missing, built):
+            snippets[node_id] = extra[(brand, node_id)] = snippet
+    return snippets
+
+
+def sentiment_snippets(artifacts, bubbles):
+    stored = artifacts["sentiment"]["sentences"]
+    extra = derived(artifacts, "sentiment_snippets", lambda a: {})
+    snippets = {brand: {} for brand in bubbles}
+    missing = []
+    for brand, nodes in bubbles.items():
+        for node in nodes:
+            key = node["key"]
+            if key in stored.get(brand, {}):
+                snippets[brand][key] = stored[brand][key]
+            elif (brand, key) in extra:
+                snippets[brand][key] = extra[(brand, key)]
+            else:
+                missing.append((brand, key, node["id"], node["group"]))
+    if missing:
+        entry = load_week(artifacts["week"])
+        index = week_sentence_index(entry)
+        built = sentiment_snippets_batch(entry["sent"], index, [(brand, word, sentiment) for brand, _, word, sentiment in missing])
+        for (brand, key, _, _), snippet in zip(missing, built):
+            snippets[brand][key] = extra[(brand, key)] = snippet
+    return snippets
+
+
+# ✅ 문장을 노드 단위 정적 조각으로 게시 → 노드·버블을 클릭할 때 그 조각만 받음
+# - (브랜드, 키)별로 한 번만 씀 (산출물 dict 에 메모)
+def relation_shards(artifacts, view):
+    written = derived(artifacts, "relation_shards", lambda a: {})
+    snippets = None
+    for node_id, brand, *_ in view["words"]:
+        if (brand, node_id) not in written:
+            snippets = snippets or relation_snippets(artifacts, view)
+            written[(brand, node_id)] = write_shard(artifacts["week"], snippet_records(snippets[node_id]))
+    return {node_id: written[(brand, node_id)] for node_id, brand, *_ in view["words"]}
+
+
+def sentiment_shards(artifacts, bubbles):
+    written = derived(artifacts, "sentiment_shards", lambda a: {})
+    snippets = None
+    for brand, nodes in bubbles.items():
+        for node in nodes:
+            if (brand, node["key"]) not in written:
+                snippets = snippets or sentiment_snippets(artifacts, bubbles)
+                written[(brand, node["key"])] = write_shard(artifacts["week"], snippet_records(snippets[brand][node["key"]]))
+    return {brand: {node["key"]: written[(brand, node["key"])] for node in nodes} for brand, nodes in bubbles.items()}
+
+
+# ✅ 서버 측 그래프 배치 좌표 (주차마다 최근 보기만 메모)
+def graph_layout(artifacts, kind, k=TOP_K, sentiments=SENTIMENTS):
+    if kind == "network":
+        return derived_view(artifacts, _view_key("layout_network", k, sentiments), lambda a: network_layout(
+            relation_view(a, k, sentiments)["nodes"], relation_view(a, k, sentiments)["links"]
+        ))
+    return derived_view(artifacts, _view_key("layout_bubble", k, sentiments), lambda a: {
+        brand: bubble_layout(nodes) for brand, nodes in sentiment_view(a, k, sentiments).items()
+    })
+
+
+# ✅ 연관어 문장 CSV 내보내기 (다운로드를 요청할 때만 생성)
+# - 단어별 일치 문장을 EXPORT_CHUNK 행씩 잘라 파일에 이어 씀 → 메모리는 조각 크기로 제한
+# - 정적 폴더에 입력 서명별로 저장 → 같은 주차는 한 번만 만들고, 파일은 서버가 조각 단위로 전송
+EXPORT_COLUMNS = ["브랜드", "단어", "감정", "언급횟수", "문장", "링크"]
+EXPORT_CHUNK = 50_000
+
+
+# ✅ 입력 서명 (내보내기 파일 이름·검색 색인·주차 요약·롤업 키): 로컬은 크기·수정시각, 원격은 ETag
+def input_signature(week):
+    parts = []
+    for name in input_files(week):
+        if not is_local(week, name):
+            parts.append(f"{name}:{remote_validator(source_path(week, name))}")
+            continue
+        stat = os.stat(week_path(week, name))
+        parts.append(f"{name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return hashlib.sha1(f"{ARTIFACT_VERSION}|{week}|{'|'.join(parts)}".encode()).hexdigest()[:12]
+
+
+def export_relpath(week):
+    return f"{EXPORT_DIR}/{week}/relation_{input_signature(week)}.csv"
+
+
+def write_relation_export(entry, path):
+    index = week_sentence_index(entry)
+    top = rank_word_counts(entry["word"], TOP_K)
+    sent_df = entry["sent"]
+    tmp = f"{path}.{os.getpid()}.tmp"
+    rows = 0
+    with open(tmp, "w", encoding="cp949", errors="replace", newline="") as f:
+        csv.writer(f, quoting=csv.QUOTE_ALL, lineterminator="\n").writerow(EXPORT_COLUMNS)
+        for brand, word, sentiment, freq in zip(top["그룹"], top["단어"], top["감정"], top["freq"]):
+            positions = sentence_positions(index, brand, word, sentiment)
+            for start in range(0, len(positions), EXPORT_CHUNK):
+                matched_sents = sent_df.iloc[positions[start:start + EXPORT_CHUNK]]
+                chunk = pd.DataFrame({
+                    "브랜드": brand,
+                    "단어": word,
+                    "감정": sentiment,
+                    "언급횟수": freq,
+                    # 🔧 텍스트 정리 (줄바꿈, 따옴표)
+                    "문장": matched_sents["문장"].astype(str).str.replace("\n", " ").str.replace("\r", " ").str.replace('"', "'").to_numpy(),
+                    "링크": matched_sents["원본링크"].to_numpy(),
+                })
+                chunk.to_csv(f, index=False, header=False, quoting=csv.QUOTE_ALL)
+                rows += len(chunk)
+    os.replace(tmp, path)
+    return rows
+
+
+# ✅ 내보내기 파일 경로 (static/ 기준 상대 경로) — 없으면 만들고, 이미 있으면 그대로
+def relation_export(week, create=True):
+    relpath = export_relpath(week)
+    path = os.path.join(STATIC_DIR, relpath)
+    if not os.path.exists(path):
+        if not create:
+            return None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_relation_export(load_week(week), path)
+    return relpath
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="주차 폴더의 탭 산출물(상위 단어·문장·네트워크·일별 집계) 사전 계산")
+    parser.add_argument("weeks", nargs="+", help="예: 2025_03w1 2025_03w2")
+    parser.add_argument("--force", action="store_true", help="입력이 그대로여도 다시 계산")
+    args = parser.parse_args()
+
+    for week in args.weeks:
+        t0 = time.perf_counter()
+        manifest = precompute_week(week, force=args.force)
+        if manifest is None:
+            print(f"{week}: 입력 변경 없음, 건너뜀")
+            continue
+        for message in manifest["warnings"]:
+            print(message)
+        for filename, info in manifest["artifacts"].items():
+            print(f"{week}/{ARTIFACT_DIR}/{filename}: {info['size'] / 1024:,.0f} KB")
+        print(f"{week}: {time.perf_counter() - t0:.1f}초")
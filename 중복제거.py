@@ -0,0 +1,182 @@
+import re
+import html
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+
+# ✅ 수집한 뉴스·블로그 항목 중복 제거 (검색트렌드 탭)
+# - 같은 글이 날짜·검색어·엔드포인트마다 반복해서 들어옴 → 그룹별로 한 건만 남기고 합쳐진 건수를 item["copies"] 에 기록
+# - 정확한 중복: 정규화한 링크가 같음 (scheme·www/m.·추적 파라미터·끝 / 무시, 네이버 블로그·뉴스 주소 형태 통일)
+# - 유사 중복(전재·배포 기사 제목): 제목 글자 3-gram 집합의 MinHash 서명 → LSH 밴드 버킷에서 후보 → 서명 일치율로 확인
+#   (제목 속 숫자가 다르면 다른 글로 봄: "1분기"·"2분기" 처럼 숫자만 다른 제목은 합치지 않음)
+# - 항목 수에 선형: 쌍 비교 없이 버킷마다 첫 항목과만 비교, 묶음은 연결 요소로 한 번에
+SHINGLE = 3  # 제목 글자 n-gram 길이
+NUM_PERM = 64  # MinHash 서명 길이
+BANDS = 16  # LSH 밴드 수 (밴드당 NUM_PERM // BANDS 행) → 유사도 0.8 쌍은 거의 항상 후보, 0.5 이하는 드묾
+NEAR_DUP_THRESHOLD = 0.8  # 서명 일치율이 이 이상이면 같은 글
+MIN_SHINGLES = 5  # 3-gram 이 이보다 적은 짧은 제목은 정확한 링크 중복만
+BATCH_ITEMS = 4096  # 서명 계산을 나눠 할 항목 수 (3-gram × NUM_PERM 배열의 메모리 제한)
+TRACKING_PARAMS = {"fbclid", "gclid", "ref", "from", "source", "trackingcode", "nclick"}
+
+_BRACKETS = re.compile(r"\[[^\]]*\]|【[^】]*】")  # [단독] [속보] 같은 말머리
+_SOURCE = re.compile(r"\s[-|ㅣ]\s[^-|ㅣ]{1,20}$")  # 끝에 붙은 " - 매체명", " | 매체명"
+_NON_WORD = re.compile(r"[\W_]+")
+_DIGITS = re.compile(r"\d+")
+_NEWS_PATH = re.compile(r"/article/(\d+)/(\d+)")
+
+_rng = np.random.default_rng(20250301)  # 서명 해시 계수 고정 → 실행마다 같은 결과
+_A = _rng.integers(0, np.iinfo(np.uint64).max, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)  # 64비트 홀수
+_B = _rng.integers(0, np.iinfo(np.uint64).max, size=NUM_PERM, dtype=np.uint64)
+_BAND_MIX = _rng.integers(0, np.iinfo(np.uint64).max, size=NUM_PERM // BANDS, dtype=np.uint64) | np.uint64(1)
+
+
+# ✅ 링크 정규화: 같은 글의 여러 주소 형태 → 하나의 키
+def normalize_link(link):
+    parts = urlsplit(str(link).strip())
+    host = parts.netloc.lower()
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    query = dict(params)
+
+    # 네이버 블로그: blog.naver.com/PostView.naver?blogId=a&logNo=1 = blog.naver.com/a/1
+    if host == "blog.naver.com" and "blogId" in query and "logNo" in query:
+        return f"blog.naver.com/{query['blogId']}/{query['logNo']}"
+    # 네이버 뉴스: n.news.naver.com/mnews/article/001/123 = news.naver.com/main/read.naver?oid=001&aid=123
+    if host.endswith("news.naver.com"):
+        match = _NEWS_PATH.search(parts.path)
+        oid, aid = (match.groups() if match else (query.get("oid"), query.get("aid")))
+        if oid and aid:
+            return f"news.naver.com/{oid}/{aid}"
+
+    kept = sorted((k, v) for k, v in params if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS)
+    return f"{host}{parts.path.rstrip('/')}" + (f"?{urlencode(kept)}" if kept else "")
+
+
+# 제목 정규화: HTML 엔티티·말머리·끝 매체명·공백·문장부호 제거, 소문자
+def normalize_title(title):
+    text = _SOURCE.sub("", html.unescape(str(title)).lower().strip())
+    return _NON_WORD.sub("", _BRACKETS.sub(" ", text))
+
+
+# ✅ 제목들 → MinHash 서명 (항목 × NUM_PERM, uint64) 과 항목별 3-gram 수
+# - 모든 제목을 이어 붙인 UTF-32 배열에서 3-gram 해시를 한 번에 계산, 항목별 최솟값은 reduceat
+def minhash_signatures(titles):
+    texts = [normalize_title(title) for title in titles]
+    chars = np.frombuffer(("\0".join(texts) + "\0").encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    owner = np.cumsum(chars == 0)
+    span = len(chars) - SHINGLE + 1
+    valid = np.ones(max(span, 0), dtype=bool)
+    shingles = np.zeros(max(span, 0), dtype=np.uint64)
+    for k in range(SHINGLE):
+        valid &= chars[k:k + span] != 0
+        shingles = shingles * np.uint64(0x100000001B3) + chars[k:k + span]
+    shingles, owner = shingles[valid] & np.uint64(0xFFFFFFFF), owner[:span][valid]
+
+    counts = np.bincount(owner, minlength=len(texts))
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    signatures = np.full((len(texts), NUM_PERM), np.iinfo(np.uint64).max, dtype=np.uint64)
+    for lo in range(0, len(texts), BATCH_ITEMS):
+        items = np.arange(lo, min(lo + BATCH_ITEMS, len(texts)))
+        items = items[counts[items] > 0]
+        if not len(items):
+            continue
+        block = shingles[offsets[items[0]]:offsets[items[-1] + 1]]
+        # 곱셈-시프트 해시 ((a·x + b) mod 2⁶⁴) >> 32 를 NUM_PERM 개 → 항목 구간별 최솟값
+        hashed = (block[:, None] * _A + _B) >> np.uint64(32)
+        signatures[items] = np.minimum.reduceat(hashed, offsets[items] - offsets[items[0]], axis=0)
+    return signatures, counts
+
+
+# LSH: 밴드마다 같은 버킷 항목을 버킷의 첫 항목과 짝지음 → (항목, 대표) 후보 쌍 (항목 수에 선형)
+def _band_pairs(signatures, eligible):
+    rows = NUM_PERM // BANDS
+    items = np.flatnonzero(eligible)
+    if len(items) < 2:  # 짧은·빈 제목뿐이면 비교할 후보 없음
+        return np.zeros((0, 2), dtype=np.int64)
+    pairs = []
+    for band in range(BANDS):
+        keys = signatures[items, band * rows:(band + 1) * rows] @ _BAND_MIX  # uint64 오버플로 = 해시 섞기
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        run_start = np.flatnonzero(np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]]))
+        heads = np.repeat(order[run_start], np.diff(np.append(run_start, len(order))))
+        member = heads != order
+        pairs.append(np.stack([items[order[member]], items[heads[member]]], axis=1))
+    return np.unique(np.concatenate(pairs), axis=0)
+
+
+# ✅ 중복 묶음 번호: 링크가 같거나 제목이 유사한 항목은 같은 번호 (연결 요소)
+def duplicate_groups(items):
+    n = len(items)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    links = {}
+    link_heads = np.array([links.setdefault(normalize_link(item.get("link", "")), i) for i, item in enumerate(items)])
+    exact = np.flatnonzero(link_heads != np.arange(n))
+    edges = [np.stack([exact, link_heads[exact]], axis=1)]
+
+    titles = [item.get("title", "") for item in items]
+    signatures, counts = minhash_signatures(titles)
+    candidates = _band_pairs(signatures, counts >= MIN_SHINGLES)
+    if len(candidates):
+        digits = np.array([zlib.crc32(" ".join(_DIGITS.findall(str(title))).encode()) for title in titles])
+        similarity = (signatures[candidates[:, 0]] == signatures[candidates[:, 1]]).mean(axis=1)
+        near = (similarity >= NEAR_DUP_THRESHOLD) & (digits[candidates[:, 0]] == digits[candidates[:, 1]])
+        edges.append(candidates[near])
+
+    edges = np.concatenate(edges)
+    graph = sparse.coo_matrix((np.ones(len(edges), dtype=np.int8), (edges[:, 0], edges[:, 1])), shape=(n, n))
+    return connected_components(graph, directed=False)[1]
+
+
+# ✅ 중복 제거: 묶음마다 목록에서 가장 먼저 나온 항목만 남기고 순서 유지, copies = 합쳐진 건수 합
+# - 이미 중복 제거된 항목(copies 있음)을 다시 합쳐도 건수가 맞도록 copies 를 더함
+def dedupe_items(items):
+    items = list(items)
+    if not items:
+        return []
+    labels = duplicate_groups(items)
+    copies = np.bincount(labels, weights=[item.get("copies", 1) for item in items]).astype(np.int64)
+    _, first = np.unique(labels, return_index=True)
+    return [{**items[i], "copies": int(copies[labels[i]])} for i in np.sort(first)]
+
+
+def _bench_items(n_items, dup_rate=0.3, seed=0):
+    rng = np.random.default_rng(seed)
+    words = ["KT", "스카이라이프", "요금제", "인터넷", "출시", "가입자", "증가", "할인", "이벤트", "결합", "위성", "채널", "고객", "서비스"]
+    presses = ["연합", "뉴시스", "뉴스원", "이데일리", "머니투데이"]
+    n_unique = int(n_items * (1 - dup_rate))
+    bases = [
+        {"title": " ".join(rng.choice(words, size=6)) + f" {i}호", "link": f"https://news.example.com/article/{i}"}
+        for i in range(n_unique)
+    ]
+    items = list(bases)
+    for j in rng.integers(n_unique, size=n_items - n_unique):
+        base = bases[j]
+        if rng.random() < 0.5:  # 같은 글, 다른 주소 형태
+            items.append({"title": base["title"], "link": base["link"].replace("https://", "http://www.") + "/?utm_source=naver"})
+        else:  # 전재 기사: 말머리·매체명이 붙은 제목, 다른 링크
+            press = presses[j % len(presses)]
+            items.append({"title": f"[종합] {base['title']} - {press}", "link": f"https://{press}.example.com/{j}"})
+    return [items[i] for i in rng.permutation(len(items))]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="뉴스·블로그 항목 중복 제거 시간 측정 (합성 항목)")
+    parser.add_argument("--items", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    for n_items in args.items:
+        items = _bench_items(n_items)
+        t0 = time.perf_counter()
+        kept = dedupe_items(items)
+        print(f"항목 {n_items:,}건 → {len(kept):,}건 (중복 합계 {sum(item['copies'] for item in kept):,}) · {time.perf_counter() - t0:.2f}초")
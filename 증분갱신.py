@@ -0,0 +1,128 @@
+import json
+from datetime import date, timedelta
+
+from 응답캐시 import is_recent
+from 중복제거 import dedupe_items
+
+
+# ✅ 검색 그룹 설정이 바뀌었는지 판단하는 키 (바뀌면 전체 재수집)
+def groups_key(search_groups):
+    return json.dumps(
+        [{"groupName": g["groupName"], "keywords": list(g["keywords"]), "exclude": list(g.get("exclude", []))} for g in search_groups],
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+
+
+def missing_days(date_range, held_days):
+    held = set(held_days)
+    return [d for d in date_range if d not in held]
+
+
+# ✅ 이미 가진 날짜 (수집 실패로 0이 채워진 날짜, 아직 값이 바뀌는 오늘·어제는 제외 → 다시 수집)
+def held_mention_days(mention_data):
+    failed = set(mention_data.get("failed", []))
+    return [d for d in mention_data.get("labels", []) if d not in failed and not is_recent(d)]
+
+
+# ✅ 데이터랩: 이미 가진 구간 중 확정된 날짜만 (오늘·어제 비율은 다시 받음)
+def held_trend_periods(periods):
+    return [p for p in periods if not is_recent(p)]
+
+
+# ✅ 언급량: 기존 값 + 새로 수집한 날짜 병합 후 현재 기간으로 재정렬 (기간 밖 날짜는 버림)
+def merge_mentions(old_data, old_mentions, new_data, new_mentions, date_range):
+    window = set(date_range)
+    values = {}
+    for data in (old_data, new_data):
+        for ds in data.get("datasets", []):
+            by_day = values.setdefault(ds["label"], {})
+            by_day.update(zip(data["labels"], ds["data"]))
+
+    labels = [ds["label"] for ds in new_data.get("datasets", [])] or list(values)
+    refetched = set(new_data.get("labels", []))
+    fallback = (set(old_data.get("fallback", [])) - refetched) | set(new_data.get("fallback", []))  # 기존 날짜의 표시는 유지
+    mention_data = {
+        "labels": list(date_range),
+        "datasets": [{"label": label, "data": [values[label].get(d, 0) for d in date_range]} for label in labels],
+        "failed": [d for d in new_data.get("failed", []) if d in window],
+        "fallback": [d for d in date_range if d in fallback],
+    }
+
+    group_mentions = {}
+    for name in labels:
+        items = [item for item in old_mentions.get(name, []) if item.get("date") in window - refetched]
+        items += new_mentions.get(name, [])
+        items.sort(key=lambda item: item.get("date", ""))  # 안정 정렬 → 같은 날짜 안에서는 수집 순서 유지
+        group_mentions[name] = dedupe_items(items)  # 기존·새 항목 사이 중복도 합침 (copies 는 더함)
+    return mention_data, group_mentions
+
+
+def _ratios(trend_data):
+    return {
+        group["title"]: {d["period"]: d["ratio"] for d in group["data"]}
+        for group in trend_data.get("results", [])
+    }
+
+
+# ✅ 데이터랩: 새로 받을 구간 계산
+# - 데이터랩 비율은 요청 구간의 최댓값=100 기준이라, 기존 구간과 하루 이상 겹치게 요청해야 배율을 맞출 수 있음
+def datalab_span(periods, held_periods):
+    missing = missing_days(periods, held_periods)
+    if not missing:
+        return None
+    held = set(held_periods)
+    start, end = date.fromisoformat(missing[0]), date.fromisoformat(missing[-1])
+    if (start - timedelta(days=1)).isoformat() in held:
+        start -= timedelta(days=1)
+    elif (end + timedelta(days=1)).isoformat() in held:
+        end += timedelta(days=1)
+    return start, end
+
+
+# ✅ 데이터랩: 겹치는 날짜의 합으로 새 응답 배율을 기존 값에 맞춘 뒤 병합, 현재 기간의 최댓값=100 으로 재정규화
+# - 겹치는 날짜가 없거나 합이 0이면 배율을 맞출 수 없으므로 None (→ 전체 구간 재요청)
+def merge_trend(old_trend, new_trend, periods):
+    old, new = _ratios(old_trend), _ratios(new_trend)
+    overlap = [
+        (old[title][p], ratio)
+        for title, by_period in new.items()
+        for p, ratio in by_period.items()
+        if p in old.get(title, {})
+    ]
+    old_sum = sum(o for o, _ in overlap)
+    new_sum = sum(n for _, n in overlap)
+    if not overlap or old_sum <= 0 or new_sum <= 0:
+        return None
+    scale = old_sum / new_sum
+
+    window = set(periods)
+    merged = {}
+    for title in new:
+        by_period = {p: r for p, r in old.get(title, {}).items() if p in window}
+        by_period.update({p: r * scale for p, r in new[title].items() if p in window})
+        merged[title] = by_period
+    return normalize_trend(new_trend, merged, periods)
+
+
+# ✅ 현재 기간 안의 값만 남기고 최댓값=100 으로 재정규화 (기간 축소 시에도 사용)
+def normalize_trend(template, ratios, periods):
+    peak = max((r for by_period in ratios.values() for r in by_period.values()), default=0)
+    factor = 100 / peak if peak > 0 else 0
+    results = []
+    for group in template.get("results", []):
+        by_period = ratios.get(group["title"], {})
+        results.append({
+            **group,
+            "data": [{"period": p, "ratio": round(by_period[p] * factor, 5)} for p in periods if p in by_period],
+        })
+    return {**template, "startDate": periods[0], "endDate": periods[-1], "results": results}
+
+
+def trim_trend(trend_data, periods):
+    window = set(periods)
+    ratios = {
+        title: {p: r for p, r in by_period.items() if p in window}
+        for title, by_period in _ratios(trend_data).items()
+    }
+    return normalize_trend(trend_data, ratios, periods)
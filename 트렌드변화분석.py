@@ -0,0 +1,122 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from 주차데이터 import WEEKS
+from 주차비교 import brand_trend, load_summaries, top_movers, week_deltas
+from 롤업저장소 import HLL_P, get_rollups
+
+
+def show_trend_change_tab():
+    st.title("🔀 트렌드 변화 분석")
+
+    # ✅ 비교할 주차 선택 (주차 순서 유지)
+    labels = list(WEEKS.keys())
+    selected_labels = st.multiselect("📂 비교할 주차", labels, default=labels)
+    selected_labels = [label for label in labels if label in selected_labels]
+    if len(selected_labels) < 2:
+        st.info("주차를 2개 이상 선택하세요.")
+        return
+    weeks = [WEEKS[label] for label in selected_labels]
+
+    # ✅ 주차 요약: 처음 보는 주차만 프로세스 풀에서 병렬 계산, 나머지는 캐시
+    progress = st.empty()
+    try:
+        summaries, computed = load_summaries(
+            weeks, on_progress=lambda done, total, week: progress.progress(done / total, text=f"주차 요약 계산 중... {week}")
+        )
+    except Exception as e:
+        st.error(f"주차 데이터를 불러오지 못했습니다: {e}")
+        return
+    progress.empty()
+    if computed:
+        st.caption(f"🧮 새로 요약한 주차: {', '.join(computed)} (나머지는 캐시 사용)")
+
+    deltas = week_deltas(summaries, weeks)
+    trend = brand_trend(summaries, weeks)
+
+    # ✅ 브랜드별 주차 추이 (긍정 비율 · 언급량)
+    st.markdown("### 📈 주차별 브랜드 추이")
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = px.line(trend, x="주차", y="긍정비율", color="그룹", markers=True)
+        fig.update_layout(yaxis_title="긍정 비율 (%)", height=350)
+        st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        if "언급량" in trend.columns:
+            fig = px.bar(trend, x="주차", y="언급량", color="그룹", barmode="group")
+            fig.update_layout(height=350)
+            st.plotly_chart(fig, use_container_width=True)
+
+    # ✅ 주차 쌍 · 브랜드 선택 → 급상승/급하락 단어, 감정 변화
+    st.divider()
+    st.markdown("### 🔍 주차 간 단어 변화")
+    pair_labels = {f"{prev_label} → {label}": (WEEKS[prev_label], WEEKS[label]) for prev_label, label in zip(selected_labels, selected_labels[1:])}
+    col1, col2, col3 = st.columns([3, 2, 1])
+    with col1:
+        pair = pair_labels[st.selectbox("비교 구간", list(pair_labels), index=len(pair_labels) - 1)]
+    delta = deltas[pair]
+    with col2:
+        brand = st.selectbox("브랜드", sorted(delta["그룹"].unique()))
+    with col3:
+        n = st.number_input("상위", min_value=5, max_value=50, value=10, step=5)
+
+    rising, falling, shifted = top_movers(delta, brand, int(n))
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**🔺 급상승 단어**")
+        st.dataframe(rising[["단어", "빈도_이전", "빈도_이번", "증감", "증감률"]], use_container_width=True, hide_index=True)
+    with col2:
+        st.markdown("**🔻 급하락 단어**")
+        st.dataframe(falling[["단어", "빈도_이전", "빈도_이번", "증감", "증감률"]], use_container_width=True, hide_index=True)
+
+    st.markdown("**🙂↔🙁 감정 변화가 큰 단어** (두 주 모두 빈도 10 이상)")
+    st.dataframe(
+        shifted[["단어", "빈도_이전", "빈도_이번", "긍정비율_이전", "긍정비율_이번", "감정변화"]],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    with st.expander("📋 전체 증감표", expanded=False):
+        st.dataframe(pd.DataFrame(delta[delta["그룹"] == brand]), use_container_width=True, hide_index=True)
+
+    show_long_term_trend()
+
+
+# ✅ 장기 추이: 일·주·월 롤업 표만 읽음 (새 주차만 반영, 원본 행은 다시 읽지 않음)
+def show_long_term_trend():
+    st.divider()
+    st.markdown("### 📆 장기 추이")
+    store = get_rollups()
+    try:
+        folded = store.fold_weeks()
+    except Exception as e:
+        st.error(f"롤업 저장소를 갱신하지 못했습니다: {e}")
+        return
+    if folded:
+        st.caption(f"🧮 롤업에 새로 반영한 주차: {', '.join(folded)}")
+
+    grains = {"일": "day", "주": "week", "월": "month"}
+    sources = {"공개 주차 데이터": "week", "검색트렌드 수집분": "live"}
+    col1, col2 = st.columns(2)
+    with col1:
+        grain = grains[st.radio("단위", list(grains), index=1, horizontal=True, key="rollup_grain")]
+    with col2:
+        source = sources[st.radio("데이터", list(sources), horizontal=True, key="rollup_source")]
+
+    series = store.series(source, grain)
+    if series.empty:
+        st.info("아직 쌓인 데이터가 없습니다. 검색트렌드 탭에서 분석을 실행하면 일별 언급량이 누적됩니다.")
+        return
+    approximate = store.distinct == "hll" and grain != "day" and source == "week"
+    if approximate:
+        st.caption(f"≈ 주·월 언급량은 HyperLogLog 추정치입니다 (고유 링크 수, 표준오차 약 {104 / 2 ** (HLL_P / 2):.1f}%).")
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = px.line(series, x="기간", y="언급량", color="그룹", markers=True)
+        fig.update_layout(yaxis_title="언급량 (추정)" if approximate else "언급량", height=350)
+        st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        if series["긍정비율"].notna().any():
+            fig = px.line(series, x="기간", y="긍정비율", color="그룹", markers=True)
+            fig.update_layout(yaxis_title="긍정 비율 (%)", height=350)
+            st.plotly_chart(fig, use_container_width=True)
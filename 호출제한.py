@@ -0,0 +1,143 @@
+import os
+import time
+import random
+import threading
+from collections import deque
+from datetime import date
+
+import requests
+
+
+# ✅ 인증키(Client ID)별 호출 제한 설정 (환경변수로 덮어쓰기 가능)
+RATE_PER_SEC = float(os.environ.get("NAVER_RATE_PER_SEC", "10"))  # 초당 평균 호출 수
+BURST = int(os.environ.get("NAVER_RATE_BURST", "10"))  # 순간 최대 호출 수
+DAILY_QUOTA = {
+    "search": int(os.environ.get("NAVER_SEARCH_DAILY_QUOTA", "25000")),
+    "datalab": int(os.environ.get("NAVER_DATALAB_DAILY_QUOTA", "1000")),
+}
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5  # 초, 재시도마다 2배 (full jitter)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+# ✅ 토큰 버킷: 초당 rate 개씩 채워지고 최대 capacity 개까지 쌓임
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# ✅ 프로세스 전역 상태 → 같은 Streamlit 서버의 모든 세션이 한 예산을 공유
+_lock = threading.Lock()
+_buckets = {}
+_quota_used = {}
+_metrics = {}
+
+
+def get_bucket(client_id):
+    with _lock:
+        bucket = _buckets.get(client_id)
+        if bucket is None:
+            bucket = _buckets[client_id] = TokenBucket(RATE_PER_SEC, BURST)
+        return bucket
+
+
+def consume_quota(client_id, kind):
+    key = (client_id, kind, date.today().isoformat())
+    with _lock:
+        used = _quota_used.get(key, 0)
+        if used >= DAILY_QUOTA[kind]:
+            raise QuotaExceeded(f"{kind} 일일 호출 한도({DAILY_QUOTA[kind]:,}회)를 모두 사용했습니다.")
+        _quota_used[key] = used + 1
+
+
+def _record(kind, latency=None, status=None, retried=False, failed=False):
+    with _lock:
+        m = _metrics.setdefault(kind, {"calls": 0, "retries": 0, "failures": 0, "status": {}, "latency": deque(maxlen=2000)})
+        if latency is not None:
+            m["calls"] += 1
+            m["latency"].append(latency)
+            m["status"][status] = m["status"].get(status, 0) + 1
+        m["retries"] += int(retried)
+        m["failures"] += int(failed)
+
+
+# ✅ 토큰 버킷 + 일일 한도 + 지터 백오프 재시도로 감싼 요청
+# - 429/5xx/타임아웃/연결 오류만 재시도, Retry-After 헤더가 있으면 그 시간 이상 대기
+# - 재시도 후에도 실패하면 마지막 응답을 돌려주거나 마지막 예외를 다시 발생
+def request_with_retry(session, method, url, credentials, kind, **kwargs):
+    client_id = credentials[0]
+    bucket = get_bucket(client_id)
+    response, error = None, None
+    for attempt in range(MAX_RETRIES + 1):
+        consume_quota(client_id, kind)
+        bucket.acquire()
+        t0 = time.perf_counter()
+        try:
+            response, error = session.request(method, url, **kwargs), None
+            status = response.status_code
+        except (requests.Timeout, requests.ConnectionError) as e:
+            response, error, status = None, e, type(e).__name__
+        _record(kind, latency=time.perf_counter() - t0, status=status)
+
+        if response is not None and response.status_code not in RETRY_STATUS:
+            return response
+        if attempt == MAX_RETRIES:
+            break
+        delay = random.uniform(0, BACKOFF_BASE * 2 ** attempt)
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        _record(kind, retried=True)
+        time.sleep(delay)
+
+    _record(kind, failed=True)
+    if response is not None:
+        return response
+    raise error
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+# ✅ 지표 스냅샷: 종류별 호출/재시도/실패 수, 지연시간 p50·p95, 오늘 한도 사용량
+def metrics_snapshot():
+    today = date.today().isoformat()
+    with _lock:
+        rows = []
+        for kind, m in sorted(_metrics.items()):
+            used = sum(v for (_, k, d), v in _quota_used.items() if k == kind and d == today)
+            rows.append({
+                "종류": kind,
+                "호출": m["calls"],
+                "재시도": m["retries"],
+                "실패": m["failures"],
+                "p50(ms)": round(_percentile(m["latency"], 0.5) * 1000, 1),
+                "p95(ms)": round(_percentile(m["latency"], 0.95) * 1000, 1),
+                "오늘 사용": used,
+                "응답코드": ", ".join(f"{k}:{v}" for k, v in m["status"].items()),
+            })
+        return rows